@@ -0,0 +1,94 @@
+# File: bench_diff_transform.py
+"""
+Satır farkı (row difference) dönüşümü için hız karşılaştırması:
+eski piksel piksel Python döngüsü vs. lzw_common.transform (NumPy).
+
+Kullanım (depo kök dizininden):
+    python benchmarks/bench_diff_transform.py --width 6000 --height 4000
+
+Eski döngü çok yavaş olduğu için yalnızca ilk --loop-rows satırda ölçülür
+ve tüm resme oranlanır; NumPy sürümü resmin tamamında ölçülür.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from lzw_common.transform import row_difference, row_reconstruct
+
+
+def loop_difference(channel, width, height):
+    """
+    Level 3/5'teki eski implementasyon (referans).
+    """
+    diff = np.zeros_like(channel, dtype=np.uint8)
+    for row in range(height):
+        row_start = row * width
+        diff[row_start] = channel[row_start]
+        for col in range(1, width):
+            idx = row_start + col
+            d = (int(channel[idx]) - int(channel[idx - 1])) % 256
+            diff[idx] = np.uint8(d)
+    return diff
+
+
+def loop_reconstruct(diff, width, height):
+    """
+    Level 3/5'teki eski ters dönüşüm (referans).
+    """
+    rec = np.zeros_like(diff, dtype=np.uint8)
+    for row in range(height):
+        row_start = row * width
+        rec[row_start] = diff[row_start]
+        for col in range(1, width):
+            idx = row_start + col
+            rec[idx] = np.uint8((int(rec[idx - 1]) + int(diff[idx])) % 256)
+    return rec
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="row difference: döngü vs NumPy")
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--loop-rows", type=int, default=16,
+                        help="eski döngünün ölçüleceği satır sayısı")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (args.height, args.width, args.channels), dtype=np.uint8)
+    pixels = args.width * args.height * args.channels
+
+    diff, t_diff = timed(row_difference, image)
+    rec, t_rec = timed(row_reconstruct, diff)
+    assert np.array_equal(rec, image)
+
+    # eski döngü: tek kanal, ilk loop_rows satır -> tüm resme oranla
+    rows = min(args.loop_rows, args.height)
+    channel = np.ascontiguousarray(image[:rows, :, 0]).ravel()
+    loop_diff, t_loop_diff = timed(loop_difference, channel, args.width, rows)
+    loop_rec, t_loop_rec = timed(loop_reconstruct, loop_diff, args.width, rows)
+    assert np.array_equal(loop_diff, diff[:rows, :, 0].ravel())
+    assert np.array_equal(loop_rec, channel)
+    scale = pixels / channel.size
+    t_loop_diff *= scale
+    t_loop_rec *= scale
+
+    print(f"Resim: {args.width} x {args.height} x {args.channels} ({pixels / 1e6:.1f} M örnek)")
+    print(f"{'':12} {'döngü (tahmini)':>16} {'numpy':>10} {'hızlanma':>10}")
+    for name, t_loop, t_np in (("fark", t_loop_diff, t_diff), ("geri alma", t_loop_rec, t_rec)):
+        print(f"{name:12} {t_loop:15.2f}s {t_np:9.3f}s {t_loop / t_np:9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# File: bench_levels.py
+"""
+Uçtan uca karşılaştırma: sentetik veri setleri üzerinde Level 1-5 ve
+standart kütüphane sıkıştırıcıları (zlib, lzma, bz2).
+
+Her durum (codec x veri seti x boyut) için:
+  - sıkıştırma / açma hızı (MB/s, girdi byte'ına göre, --repeat içinden en iyisi)
+  - sıkıştırma oranı
+  - tepe RSS (MB) ve ölçüm sırasında eklenen RSS
+  - geri açılan verinin orijinalle aynı olup olmadığı
+Her durum ayrı (spawn) bir süreçte çalışır, böylece tepe RSS o duruma aittir.
+
+Kullanım (depo kök dizininden):
+    python benchmarks/bench_levels.py
+    python benchmarks/bench_levels.py --sizes 512 2048 --codecs level5 zlib --json sonuc.json
+
+Veri setleri:
+  flat     : tek renk
+  gradient : yatay/dikey yumuşak geçiş
+  noise    : düzgün dağılımlı gürültü
+  photo    : fotoğraf benzeri (yumuşak bölgeler + kenarlar + hafif gürültü)
+  text     : Zipf dağılımlı kelimelerden oluşan metin (boyut KB cinsinden)
+"""
+
+import os
+import sys
+import bz2
+import lzma
+import json
+import math
+import time
+import zlib
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from lzw_common.bitio import codes_to_bytes, bytes_to_codes
+from lzw_common.lzw import (
+    encode_fixed,
+    decode_fixed,
+    encode_variable,
+    decode_variable,
+    DEFAULT_MAX_CODE_WIDTH
+)
+from lzw_common.container import encode_image, decode_container
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+IMAGE_CORPORA = ("flat", "gradient", "noise", "photo")
+TEXT_CORPORA = ("text",)
+IMAGE_CODECS = ("level2", "level3", "level4", "level5", "zlib", "lzma", "bz2")
+TEXT_CODECS = ("level1", "zlib", "lzma", "bz2")
+
+
+# ------------------------------------------------------------------------------
+# Sentetik veri setleri
+# ------------------------------------------------------------------------------
+def make_image(kind, side, seed=0):
+    """
+    Return: (side, side, 3) uint8 RGB resim
+    """
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:side, 0:side].astype(np.float64) / max(side - 1, 1)
+    if kind == "flat":
+        image = np.broadcast_to(np.array([90.0, 140.0, 200.0]), (side, side, 3))
+    elif kind == "gradient":
+        image = np.stack([255 * xx, 255 * yy, 255 * (1 - xx) * yy], axis=2)
+    elif kind == "noise":
+        return rng.integers(0, 256, (side, side, 3), dtype=np.uint8)
+    elif kind == "photo":
+        base = 110 + 60 * np.sin(6 * xx + 2 * yy) + 40 * np.cos(9 * yy - 3 * xx)
+        # birkaç keskin kenarlı "nesne"
+        for _ in range(8):
+            cx, cy, r = rng.random(3)
+            base = np.where((xx - cx) ** 2 + (yy - cy) ** 2 < (0.2 * r) ** 2, base + rng.normal(0, 50), base)
+        tint = np.array([1.0, 0.9, 0.75])
+        image = base[:, :, None] * tint + rng.normal(0, 3, (side, side, 3))
+    else:
+        raise ValueError(f"Bilinmeyen resim veri seti: {kind}")
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def make_text(size, seed=0):
+    """
+    Zipf dağılımlı kelimelerden yaklaşık size byte'lık ASCII metin.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("etaoinshrdlucmfwypvbgkjqxz"))
+    vocab = ["".join(rng.choice(letters, rng.integers(2, 10))) for _ in range(5000)]
+    ranks = np.minimum(rng.zipf(1.2, size // 3), len(vocab)) - 1
+    words = []
+    length = 0
+    for i, rank in enumerate(ranks):
+        word = vocab[rank]
+        words.append(word + ("\n" if i % 12 == 11 else " "))
+        length += len(word) + 1
+        if length >= size:
+            break
+    return "".join(words).encode("ascii")[:size]
+
+
+def make_corpus(kind, size, seed=0):
+    return make_text(size * 1024, seed) if kind in TEXT_CORPORA else make_image(kind, size, seed)
+
+
+# ------------------------------------------------------------------------------
+# Codec'ler: (compress, decompress, girdi) üçlüsü
+# ------------------------------------------------------------------------------
+def _to_gray(image):
+    # ITU-R 601 luma (PIL "L" dönüşümüyle aynı ağırlıklar)
+    return (image.astype(np.uint32) @ np.array([299, 587, 114]) // 1000).astype(np.uint8)
+
+
+def get_codec(name, data, max_code_width):
+    """
+    Return: (compress fonksiyonu, decompress fonksiyonu, codec girdisi)
+    """
+    if name in ("zlib", "lzma", "bz2"):
+        module = {"zlib": zlib, "lzma": lzma, "bz2": bz2}[name]
+        raw = data if isinstance(data, bytes) else data.tobytes()
+        return module.compress, module.decompress, raw
+
+    if name == "level1":
+        if max_code_width is None:
+            def compress(raw):
+                codes, dict_size = encode_fixed(raw)
+                return codes_to_bytes(codes, math.ceil(math.log2(dict_size)))
+
+            def decompress(blob):
+                return bytes(decode_fixed(bytes_to_codes(blob)[0].tolist()))
+            return compress, decompress, data
+        return (lambda raw: encode_variable(raw, max_code_width),
+                lambda blob: bytes(decode_variable(blob)), data)
+
+    level = int(name[len("level"):])
+    image = _to_gray(data) if level in (2, 3) else data
+    return (lambda img: encode_image(img, level, max_code_width, workers=1),
+            lambda blob: decode_container(blob, workers=1), image)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _nbytes(data):
+    return len(data) if isinstance(data, (bytes, bytearray)) else data.nbytes
+
+
+def _same(a, b):
+    if isinstance(a, np.ndarray):
+        return isinstance(b, np.ndarray) and a.shape == b.shape and np.array_equal(a, b)
+    return bytes(a) == bytes(b)
+
+
+def run_case(case):
+    """
+    Tek bir durumu ölçer. case: (codec, corpus, size, repeat, max_code_width)
+    Return: sonuç dict'i
+    """
+    codec, corpus, size, repeat, max_code_width = case
+    compress, decompress, data = get_codec(codec, make_corpus(corpus, size), max_code_width)
+    rss_before = _peak_rss_mb()
+
+    t_comp = t_decomp = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        blob = compress(data)
+        t_comp = min(t_comp, time.perf_counter() - start)
+        start = time.perf_counter()
+        restored = decompress(blob)
+        t_decomp = min(t_decomp, time.perf_counter() - start)
+
+    rss_after = _peak_rss_mb()
+    nbytes = _nbytes(data)
+    return {
+        "codec": codec,
+        "corpus": corpus,
+        "size": size,
+        "bytes_in": nbytes,
+        "bytes_out": len(blob),
+        "ratio": nbytes / len(blob) if blob else 0.0,
+        "compress_mb_s": nbytes / 1e6 / t_comp if t_comp > 0 else 0.0,
+        "decompress_mb_s": nbytes / 1e6 / t_decomp if t_decomp > 0 else 0.0,
+        "compress_s": t_comp,
+        "decompress_s": t_decomp,
+        "peak_rss_mb": rss_after,
+        "extra_rss_mb": None if rss_after is None else rss_after - rss_before,
+        "ok": _same(data, restored),
+    }
+
+
+def build_cases(args):
+    cases = []
+    for corpus in args.corpora:
+        text = corpus in TEXT_CORPORA
+        sizes = args.text_sizes if text else args.sizes
+        codecs = [c for c in args.codecs if c in (TEXT_CODECS if text else IMAGE_CODECS)]
+        for size in sizes:
+            for codec in codecs:
+                cases.append((codec, corpus, size, args.repeat, args.max_code_width))
+    return cases
+
+
+def run_cases(cases, isolate=True, callback=None):
+    """
+    Durumları sırayla çalıştırır; isolate ise her biri yeni bir süreçte.
+    """
+    results = []
+    if not isolate:
+        for case in cases:
+            results.append(run_case(case))
+            if callback:
+                callback(results[-1])
+        return results
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(run_case, case).result())
+        if callback:
+            callback(results[-1])
+    return results
+
+
+def format_row(r):
+    rss = "-" if r["peak_rss_mb"] is None else f"{r['peak_rss_mb']:.0f}/{r['extra_rss_mb']:+.0f}"
+    unit = "KB" if r["corpus"] in TEXT_CORPORA else "px"
+    return (f"{r['corpus']:9} {str(r['size']) + unit:>7} {r['codec']:7} {r['bytes_in']:>11,d} "
+            f"{r['bytes_out']:>11,d} {r['ratio']:7.2f} {r['compress_mb_s']:9.2f} "
+            f"{r['decompress_mb_s']:9.2f} {rss:>10} {'ok' if r['ok'] else 'HATA':>4}")
+
+
+HEADER = (f"{'veri':9} {'boyut':>7} {'codec':7} {'girdi':>11} {'çıktı':>11} {'oran':>7} "
+          f"{'sık MB/s':>9} {'aç MB/s':>9} {'RSS MB':>10} {'':>4}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Level 1-5 ve zlib/lzma/bz2 uçtan uca karşılaştırma")
+    parser.add_argument("--corpora", nargs="+", default=list(IMAGE_CORPORA + TEXT_CORPORA),
+                        choices=IMAGE_CORPORA + TEXT_CORPORA)
+    parser.add_argument("--codecs", nargs="+", default=list(dict.fromkeys(TEXT_CODECS + IMAGE_CODECS)),
+                        choices=list(dict.fromkeys(TEXT_CODECS + IMAGE_CODECS)))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[256, 512],
+                        help="resim kenar uzunlukları (piksel)")
+    parser.add_argument("--text-sizes", nargs="+", type=int, default=[64, 1024],
+                        help="metin boyutları (KB)")
+    parser.add_argument("--repeat", type=int, default=1, help="tekrar sayısı (en iyi süre alınır)")
+    parser.add_argument("-w", "--max-code-width", type=int, default=DEFAULT_MAX_CODE_WIDTH,
+                        help="Level 1-5 en büyük kod genişliği (bit)")
+    parser.add_argument("--fixed", action="store_true", help="Level 1-5 sabit codelength (eski format)")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="durumları aynı süreçte çalıştır (RSS değerleri birikimli olur)")
+    parser.add_argument("--json", default=None, help="sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+    if args.fixed:
+        args.max_code_width = None
+
+    print(HEADER)
+    print("-" * len(HEADER))
+    results = run_cases(build_cases(args), not args.no_isolate,
+                        lambda r: print(format_row(r), flush=True))
+
+    if args.json:
+        meta = {"python": sys.version.split()[0], "numpy": np.__version__,
+                "max_code_width": args.max_code_width, "repeat": args.repeat,
+                "cpu_count": os.cpu_count()}
+        with open(args.json, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nJSON: {args.json}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
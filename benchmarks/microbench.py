@@ -0,0 +1,285 @@
+# File: microbench.py
+"""
+Sıcak fonksiyonlar için mikro benchmark'lar ve regresyon kapısı.
+
+Ölçülen fonksiyonlar (seviye sınıflarındaki karşılıkları parantez içinde):
+  lzw_encode / lzw_decode          : lzw.encode_fixed / decode_fixed (lzw_encode / lzw_decode)
+  lzw_encode_var / lzw_decode_var  : lzw.encode_variable / decode_variable
+  lzw_decode_into / _var_into      : lzw.decode_fixed_into / decode_variable_into (blocks.decode_block)
+  lzw_encode_lru / _decode_lru     : "lru" sözlük politikasıyla encode_variable / decode_variable_into
+  huffman_encode / huffman_decode  : entropy.huffman_encode / huffman_decode (LZW kodları üzerinde)
+  codes_to_bytes / bytes_to_codes  : bitio (eski int_list_to_bitstring / bitstring_to_int_list)
+  row_difference / row_reconstruct : transform (compute_diff_array / reconstruct_from_diff)
+  ycocg_forward / ycocg_inverse    : color.forward_color / inverse_color ("ycocg-r")
+  scan_hilbert / unscan_hilbert    : scan.scan_symbols / unscan_symbols ("hilbert", permütasyon önbellekte)
+  residuals_med / residuals_med_inv: predictors.encode_residuals / decode_residuals ("med")
+  separate_rgb / combine_rgb       : basic_image_ops.separate_rgb_channels / combine_rgb_channels
+
+İki kontrol yapılır:
+  1) süre   : her fonksiyonun süresi kayıtlı baseline'dan (microbench_baseline.json)
+              --threshold oranından fazla yavaşsa HATA (makineye bağlı, baseline
+              aynı makinede --update ile üretilmeli)
+  2) ölçekleme: girdi --scale katına çıkınca sürenin büyüme üssü
+              (log(t2/t1) / log(scale)) --max-exponent'i aşarsa HATA. Makineden
+              bağımsızdır; O(n^2)'ye geri dönen bir fonksiyonu yakalar.
+
+Kullanım (depo kök dizininden):
+    python benchmarks/microbench.py                 # baseline ile karşılaştır
+    python benchmarks/microbench.py --update        # baseline'ı yeniden yaz
+    python benchmarks/microbench.py -k lzw --threshold 0.3
+Çıkış kodu: 0 => geçti, 1 => regresyon var
+"""
+
+import os
+import sys
+import json
+import math
+import timeit
+import argparse
+import importlib.util
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(ROOT)
+from lzw_common.bitio import codes_to_bytes, bytes_to_codes
+from lzw_common.lzw import (
+    encode_fixed,
+    decode_fixed,
+    decode_fixed_into,
+    encode_variable,
+    decode_variable,
+    decode_variable_into
+)
+from lzw_common.entropy import huffman_encode, huffman_decode
+from lzw_common.transform import row_difference, row_reconstruct
+from lzw_common.color import forward_color, inverse_color
+from lzw_common.scan import scan_symbols, unscan_symbols
+from lzw_common.predictors import encode_residuals, decode_residuals
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "microbench_baseline.json")
+
+
+def _load_image_ops():
+    # basic_image_ops her seviye klasöründe ayrı bir modül (paket değil)
+    path = os.path.join(ROOT, "level5_color_differences", "basic_image_ops.py")
+    spec = importlib.util.spec_from_file_location("basic_image_ops", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+image_ops = _load_image_ops()
+
+
+# ------------------------------------------------------------------------------
+# Girdiler: fotoğraf benzeri (yumuşak + gürültü), deterministik
+# ------------------------------------------------------------------------------
+def photo(height, width, channels=0, seed=0):
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float64)
+    base = 128 + 60 * np.sin(xx / 23.0 + yy / 41.0) + 40 * np.cos(yy / 17.0)
+    if channels:
+        base = base[:, :, None] * np.array([1.0, 0.9, 0.75])[:channels]
+    return np.clip(base + rng.normal(0, 4, base.shape), 0, 255).astype(np.uint8)
+
+
+def _residual_bytes(n):
+    # LZW girdisi: Level 3/5'teki gibi satır farkı alınmış n byte
+    side = max(1, int(math.sqrt(n)))
+    return row_difference(photo(-(-n // side), side)).ravel()[:n].tobytes()
+
+
+# ------------------------------------------------------------------------------
+# Durumlar: isim -> (setup(n) -> argümanlar, fonksiyon, varsayılan n)
+# n: LZW / bit işlemlerinde byte veya kod sayısı, resim işlemlerinde piksel sayısı
+# ------------------------------------------------------------------------------
+def _square(n, channels=0):
+    side = max(1, int(math.sqrt(n)))
+    return photo(side, side, channels)
+
+
+def _setup_decode(n):
+    return (encode_fixed(_residual_bytes(n))[0],)
+
+
+def _setup_decode_var(n):
+    return (encode_variable(_residual_bytes(n)),)
+
+
+def _setup_decode_into(n):
+    return encode_fixed(_residual_bytes(n))[0], np.empty(n, dtype=np.uint8)
+
+
+def _setup_decode_var_into(n):
+    return encode_variable(_residual_bytes(n)), np.empty(n, dtype=np.uint8)
+
+
+def _setup_encode_lru(n):
+    return _residual_bytes(n), 12, "dict", "lru"
+
+
+def _setup_decode_lru(n):
+    return encode_variable(_residual_bytes(n), 12, policy="lru"), np.empty(n, dtype=np.uint8)
+
+
+def _setup_huffman(n):
+    return (encode_fixed(_residual_bytes(n))[0],)
+
+
+def _setup_huffman_decode(n):
+    codes = encode_fixed(_residual_bytes(n))[0]
+    return huffman_encode(codes), len(codes)
+
+
+def _setup_codes(n):
+    codes, dict_size = encode_fixed(_residual_bytes(n))
+    return codes, max(8, math.ceil(math.log2(dict_size)))
+
+
+def _setup_packed(n):
+    return (codes_to_bytes(*_setup_codes(n)),)
+
+
+def _setup_rgb_split(n):
+    image = _square(n, 3)
+    side = image.shape[0]
+    return image_ops.separate_rgb_channels(image) + (side, side)
+
+
+CASES = {
+    "lzw_encode": (lambda n: (_residual_bytes(n),), encode_fixed, 1 << 16),
+    "lzw_decode": (_setup_decode, decode_fixed, 1 << 16),
+    "lzw_encode_var": (lambda n: (_residual_bytes(n),), encode_variable, 1 << 16),
+    "lzw_decode_var": (_setup_decode_var, decode_variable, 1 << 16),
+    "lzw_decode_into": (_setup_decode_into, decode_fixed_into, 1 << 16),
+    "lzw_decode_var_into": (_setup_decode_var_into, decode_variable_into, 1 << 16),
+    "lzw_encode_lru": (_setup_encode_lru, encode_variable, 1 << 16),
+    "lzw_decode_lru": (_setup_decode_lru, decode_variable_into, 1 << 16),
+    "huffman_encode": (_setup_huffman, huffman_encode, 1 << 16),
+    "huffman_decode": (_setup_huffman_decode, huffman_decode, 1 << 16),
+    "codes_to_bytes": (_setup_codes, codes_to_bytes, 1 << 17),
+    "bytes_to_codes": (_setup_packed, bytes_to_codes, 1 << 17),
+    "row_difference": (lambda n: (_square(n, 3),), row_difference, 1 << 18),
+    "row_reconstruct": (lambda n: (row_difference(_square(n, 3)),), row_reconstruct, 1 << 18),
+    "ycocg_forward": (lambda n: (_square(n, 3), "ycocg-r"), forward_color, 1 << 18),
+    "ycocg_inverse": (lambda n: (forward_color(_square(n, 3), "ycocg-r"), "ycocg-r"), inverse_color, 1 << 18),
+    "scan_hilbert": (lambda n: (_square(n), _square(n).shape, "hilbert"), scan_symbols, 1 << 18),
+    "unscan_hilbert": (lambda n: (_square(n).ravel(), _square(n).shape, "hilbert"), unscan_symbols, 1 << 18),
+    "residuals_med": (lambda n: (_square(n), "med"), encode_residuals, 1 << 16),
+    "residuals_med_inv": (lambda n: (encode_residuals(_square(n), "med")[0], "med"),
+                          decode_residuals, 1 << 16),
+    "separate_rgb": (lambda n: (_square(n, 3),), image_ops.separate_rgb_channels, 1 << 18),
+    "combine_rgb": (_setup_rgb_split, image_ops.combine_rgb_channels, 1 << 18),
+}
+
+
+def measure(func, args, repeat=3):
+    """
+    timeit ile: tek ölçüm en az ~0.2 s sürecek kadar döngü, repeat ölçümün en iyisi.
+    Return: çağrı başına saniye
+    """
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(names, scale=4, repeat=3):
+    """
+    Return: {isim: {"n", "seconds", "seconds_scaled", "exponent"}}
+    """
+    results = {}
+    for name in names:
+        setup, func, n = CASES[name]
+        t1 = measure(func, setup(n), repeat)
+        t2 = measure(func, setup(n * scale), repeat)
+        results[name] = {
+            "n": n,
+            "seconds": t1,
+            "seconds_scaled": t2,
+            "exponent": math.log(t2 / t1) / math.log(scale) if t1 > 0 and t2 > 0 else 0.0,
+        }
+    return results
+
+
+def compare(results, baseline, threshold, max_exponent):
+    """
+    Return: [(isim, durum, değişim oranı, açıklama)], durum "ok" / "HATA" / "yeni"
+    """
+    rows = []
+    for name, r in results.items():
+        problems = []
+        if r["exponent"] > max_exponent:
+            problems.append(f"ölçekleme üssü {r['exponent']:.2f} > {max_exponent}")
+        base = baseline.get(name)
+        if base is None or base["n"] != r["n"]:
+            status, change = "yeni", None
+        else:
+            change = r["seconds"] / base["seconds"] - 1
+            if change > threshold:
+                problems.append(f"%{100 * change:.0f} yavaş (sınır %{100 * threshold:.0f})")
+            status = "ok"
+        rows.append((name, "HATA" if problems else status, change, "; ".join(problems)))
+    return rows
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sıcak fonksiyonlar için mikro benchmark / regresyon kapısı")
+    parser.add_argument("-k", "--filter", default=None, help="yalnızca adında bu metin geçen durumlar")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON dosyası")
+    parser.add_argument("--update", action="store_true", help="ölçümleri baseline olarak yaz")
+    parser.add_argument("--threshold", type=float, default=0.50,
+                        help="izin verilen yavaşlama oranı (0.50 => %%50)")
+    parser.add_argument("--max-exponent", type=float, default=1.35,
+                        help="izin verilen en büyük ölçekleme üssü (1 => doğrusal)")
+    parser.add_argument("--scale", type=int, default=4, help="ölçekleme ölçümünde girdi katı")
+    parser.add_argument("--repeat", type=int, default=3, help="ölçüm tekrarı (en iyisi alınır)")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if args.filter is None or args.filter in name]
+    if not names:
+        print("Eşleşen durum yok!")
+        return 1
+    results = run(names, args.scale, args.repeat)
+
+    if args.update:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        meta = {"python": sys.version.split()[0], "numpy": np.__version__, "scale": args.scale}
+        with open(args.baseline, "w") as f:
+            json.dump({"meta": meta, "results": baseline}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        for name, r in results.items():
+            print(f"{name:20} {1e3 * r['seconds']:10.3f} ms  üs {r['exponent']:.2f}")
+        print(f"\nBaseline yazıldı: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(results, baseline, args.threshold, args.max_exponent)
+    # gürültüye karşı: başarısız olanlar bir kez daha ölçülür, en iyisi alınır
+    retry = [name for name, status, _, _ in rows if status == "HATA"]
+    if retry:
+        for name, r in run(retry, args.scale, args.repeat).items():
+            for key in ("seconds", "seconds_scaled"):
+                results[name][key] = min(results[name][key], r[key])
+            results[name]["exponent"] = min(results[name]["exponent"], r["exponent"])
+        rows = compare(results, baseline, args.threshold, args.max_exponent)
+    print(f"{'fonksiyon':20} {'n':>8} {'süre (ms)':>10} {'değişim':>9} {'üs':>5}  durum")
+    for name, status, change, note in rows:
+        r = results[name]
+        change = "-" if change is None else f"{100 * change:+.0f}%"
+        print(f"{name:20} {r['n']:8d} {1e3 * r['seconds']:10.3f} {change:>9} {r['exponent']:5.2f}  {status} {note}")
+    failed = [row for row in rows if row[1] == "HATA"]
+    print(f"\n{len(rows) - len(failed)}/{len(rows)} geçti")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
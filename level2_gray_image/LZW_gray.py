@@ -1,13 +1,32 @@
 # File: LZW_gray.py
 
 
+import io
 import os
+import sys
 import math
-from basic_image_ops import (
-   read_image_grayscale,
-   write_image_grayscale,
-   image_to_flat_array,
-   flat_array_to_image
+import numpy as np
+
+
+# ortak lzw_common paketi bir üst klasörde
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from lzw_common.bitio import bytes_to_codes
+from lzw_common.lzw import (
+   encode_fixed,
+   decode_fixed,
+   decode_variable,
+   is_variable_stream,
+   dictionary_width,
+   POLICY_RESET
+)
+from lzw_common.entropy import check_entropy, ENTROPY_NONE
+from lzw_common.scan import check_scan_order, SCAN_ROW_MAJOR
+from lzw_common.profiling import NullProfiler
+from lzw_common.imageio import read_image, write_image
+from lzw_common.container import (
+   write_image_container,
+   decode_container,
+   is_container
 )
 
 
@@ -16,17 +35,44 @@ from basic_image_ops import (
 class LZWGrayCoding:
    """
    Gri tonlu (8-bit) bir resmi LZW ile sıkıştırma/açma sınıfı.
+   .bin dosyası lzw_common.container formatındadır (boyutlar başlıkta).
    """
 
 
-   def __init__(self, filename):
+   LEVEL = 2
+
+
+   def __init__(self, filename=None, max_code_width=None, tile_size=None, workers=None, profiler=None,
+                dict_policy=POLICY_RESET, memory_budget=None, seed=None, entropy=ENTROPY_NONE,
+                scan=SCAN_ROW_MAJOR):
        """
        filename: örn. 'sample_gray'
        Bu, 'sample_gray.bmp' dosyasını sıkıştırıp
-       'sample_gray.bin' dosyası üretecek.
+       'sample_gray.bin' dosyası üretecek (yalnızca *_image_file metotları için;
+       compress_array / decompress_to_array dosyaya dokunmaz).
+       max_code_width: None ise tek bir sabit code length kullanılır,
+       aksi halde 9 bitten bu değere kadar büyüyen kodlar (CLEAR/EOI ile).
+       tile_size: verilirse resim tile_size x tile_size karolara bölünür,
+       karolar ayrı süreçlerde kodlanır (lzw_common.tiles); workers süreç sayısı.
+       profiler: aşama ölçümleri için lzw_common.profiling.Profiler
+       (verilmezse ölçüm yapılmaz; verilirse kayıtlar self.profiler.report() ile okunur).
+       dict_policy: sözlük dolunca "reset" / "ratio" / "lru" (lzw_common.lzw, değişken genişlikte)
+       memory_budget: verilirse max_code_width sözlük bu kadar byte'a sığacak şekilde seçilir
+       seed: tohum sözlük (lzw_common.seed; nesne, .lzws yolu veya id), değişken genişlikte
+       entropy: LZW kodlarından sonra entropi kodlayıcı ("none" / "huffman", lzw_common.entropy)
+       scan: piksellerin LZW'ye veriliş sırası ("row-major" / "column-major" / "tile-raster" /
+       "hilbert" / "interleaved", lzw_common.scan), başlıkta saklanır
        """
        self.filename = filename
        self.codelength = None  # sıkıştırma sırasında hesaplanacak
+       self.max_code_width = dictionary_width(max_code_width, dict_policy, memory_budget, seed)
+       self.dict_policy = dict_policy
+       self.seed = seed
+       self.entropy = check_entropy(entropy)
+       self.scan = check_scan_order(scan)
+       self.tile_size = tile_size
+       self.workers = workers
+       self.profiler = profiler if profiler is not None else NullProfiler()
 
 
    def compress_image_file(self):
@@ -47,37 +93,20 @@ class LZWGrayCoding:
        output_path = os.path.join(current_dir, output_file)
 
 
-       # 1) resmi oku -> PIL -> flatten array
-       img, width, height = read_image_grayscale(input_path)
-       flat_array, w, h = image_to_flat_array(img)
-
-
-       # 2) LZW encode
-       encoded_integers = self.lzw_encode(flat_array)
-
-
-       # 3) integer list -> bit string
-       bit_string = self.int_list_to_bitstring(encoded_integers)
-
-
-       # 4) code length'i başa ekle
-       bit_string = self.add_codelength_info(bit_string)
-
-
-       # 5) padding
-       padded_bit_string = self.pad_bitstring(bit_string)
-
-
-       # 6) byte array'e dön, yaz
-       byte_array = self.bitstring_to_bytearray(padded_bit_string)
-       with open(output_path, "wb") as f:
-           f.write(byte_array)
+       prof = self.profiler
+       with prof:
+           # 1) resmi oku (BMP/PGM/PPM: mmap görünümü, diğerleri PIL)
+           with prof.stage("read", os.path.getsize(input_path)) as st:
+               image = read_image(input_path, "L")
+               h, w = image.shape
+               st["bytes_out"] = image.nbytes
+           with open(output_path, "wb") as f:
+               compressed_size = self._compress_array(image, f)
 
 
        # Sıkıştırma oranı vb. hesap
        # Orijinal boyut => width*height piksel, 1 byte/piksel
-       uncompressed_size = width * height
-       compressed_size = len(byte_array)
+       uncompressed_size = w * h
        if compressed_size != 0:
            ratio = uncompressed_size / compressed_size
        else:
@@ -85,103 +114,112 @@ class LZWGrayCoding:
 
 
        print(f"{input_file} -> {output_file} sıkıştırma tamamlandı.")
-       print(f"Resim boyutu     : {width} x {height}")
+       print(f"Resim boyutu     : {w} x {h}")
        print(f"Orijinal boyut   : {uncompressed_size} bytes (piksel sayısı)")
        print(f"Sıkıştırılmış boyut : {compressed_size} bytes")
        print(f"Sıkıştırma Oranı : {ratio:.2f}")
-       print(f"Kod Uzunluğu     : {self.codelength} bit")
+       print(f"Kod Uzunluğu     : {self.codelength} bit" if self.codelength else "Kod Uzunluğu     : sabit (blok başına)")
 
 
        return output_path
 
 
-   def decompress_image_file(self):
+   # --------------------------------------------------------------------------
+   # Bellek içi API: dosya yerine dizi / bytes
+   # --------------------------------------------------------------------------
+   def compress_array(self, image):
        """
-       .bin dosyasını okuyup LZW decode ile gri ton resmi geri elde eder,
-       .bmp olarak yazar.
-       Return: çıktı resminin path'i
+       (H, W) uint8 gri ton dizi -> .bin içeriği (bytes); dosya okunmaz/yazılmaz.
        """
-       current_dir = os.path.dirname(os.path.realpath(__file__))
-
-
-       input_file = self.filename + ".bin"
-       input_path = os.path.join(current_dir, input_file)
+       image = np.asarray(image, dtype=np.uint8)
+       if image.ndim != 2:
+           raise ValueError(f"Resim (H, W) olmalı! Bulduk: {image.shape}")
+       out = io.BytesIO()
+       with self.profiler:
+           self._compress_array(image, out)
+       return out.getvalue()
 
 
-       output_file = self.filename + "_decompressed.bmp"
-       output_path = os.path.join(current_dir, output_file)
-
-
-       # 1) .bin dosyasını byte'lar olarak oku -> bit string
-       with open(input_path, "rb") as f:
-           data = f.read()
-
-
-       bit_str = ""
-       for byte in data:
-           bit_str += bin(byte)[2:].rjust(8, '0')
-
-
-       # 2) padding'i kaldır
-       bit_str = self.remove_padding(bit_str)
+   def decompress_to_array(self, data):
+       """
+       .bin içeriği (bytes, bytearray veya memoryview) -> (H, W) uint8 dizi.
+       """
+       data = memoryview(data).cast("B")
+       if is_container(data):
+           # 2-4) boyutlar ve mod başlıkta: ortak decoder, tahmin gerekmez
+           return decode_container(data, self.workers)
 
 
-       # 3) code length'i baştan al
-       bit_str = self.extract_codelength_info(bit_str)
+       # Eski (başlıksız) .bin dosyaları: boyutlar saklanmamış
+       if is_variable_stream(data):
+           # 2-3) değişken genişlikli akış -> piksel array
+           flat_decoded_array = decode_variable(data)
+       else:
+           # 2) byte'lar -> integer list (padding ve code length burada çözülür)
+           codes, self.codelength = bytes_to_codes(data)
+           encoded_values = codes.tolist()
+           # 3) LZW decode -> piksel array
+           flat_decoded_array = self.lzw_decode(encoded_values)
 
 
-       # 4) bit string -> integer list
-       encoded_values = self.bitstring_to_int_list(bit_str)
+       # Boyutlar eski formatta saklanmadığı için width=256 kabul edilir
+       # (yeni dosyalar konteyner formatında, boyutlar başlıkta).
+       length = len(flat_decoded_array)
+       width = 256
+       height = length // 256
+       print(f"[UYARI]: Geri açarken width={width} kabul edildi!")
 
 
-       # 5) LZW decode -> piksel array
-       flat_decoded_array = self.lzw_decode(encoded_values)
+       # reshape -> 2D array
+       return np.array(flat_decoded_array, dtype=np.uint8).reshape((height, width))
 
 
-       # Burada boyutu bilmiyoruz!
-       # Normalde width, height'ı da saklamak lazım (ya da sabit biliyoruz diyelim).
-       # Basit yaklaşım: orijinal resmi tanıyorsak width/height'ı parametre verebilirsin.
-       # Veya .bin dosyasına width/height eklemen gerekir.
-       # Şimdilik bir method: get the dimension from a side file or pass it as param.
+   def _compress_array(self, image, dst):
+      """
+      compress_image_file'ın 2-4. adımları: api.compress_array ile aynı kodlayıcı
+      (lzw_common.container.write_image_container; aşamalar self.profiler'da ölçülür).
+      dst: seek edilebilir binary dosya (açık dosya veya io.BytesIO)
+      Return: yazılan byte sayısı
+      """
+      compressed_size, self.codelength = write_image_container(
+         dst, image, self.LEVEL, self.max_code_width,
+         tile_size=self.tile_size, workers=self.workers, dict_policy=self.dict_policy, seed=self.seed,
+         entropy=self.entropy, scan=self.scan, profiler=self.profiler)
+      return compressed_size
 
 
-       # Örnek olsun diye,
-       # diyelim ki resmin boyutunu biliyoruz: 640 x 480 (ya da hoca sabit vermiş).
-       # PRATİKTE: Orijinal resmi saklamadan önce boyutu da .bin'e eklemen gerek!
-       # Aşağıda sadece demonstration var:
-       # flat_decoded_array = array of length W*H
-       # We must reshape. Suppose we do it from a side text or so.
-       # -------------------------------------------------------------------
-       # Burada basitçe orijinal .bmp'yi okumadan (imkansız):
-       #  - ya bin dosyasına 2 byte width, 2 byte height ekle (en üste)
-       #  - ya parametre ile ver
-       # Örneği basit tutmak için "dummy" atıyoruz.
-       # Kodu gerçek projede boyutları .bin'e ekleyecek şekilde genişletmelisin!
+   def decompress_image_file(self):
+       """
+       .bin dosyasını okuyup LZW decode ile gri ton resmi geri elde eder,
+       .bmp olarak yazar.
+       Return: çıktı resminin path'i
+       """
+       current_dir = os.path.dirname(os.path.realpath(__file__))
 
 
-       # Fake sabit boyut:
-       # width = 256
-       # height = len(flat_decoded_array) // width
-       # Yine de for correctness, let's do something:
+       input_file = self.filename + ".bin"
+       input_path = os.path.join(current_dir, input_file)
 
 
-       # Aşağıda basit bir check var:
-       length = len(flat_decoded_array)
-       # Tek seferde height veya width'i bilinçli atayabiliriz:
-       # diyelim width=256, height= length//256
-       # or as needed:
-       width = 256
-       height = length // 256
-       print(f"[UYARI]: Geri açarken width=256 kabul edildi!")
+       output_file = self.filename + "_decompressed.bmp"
+       output_path = os.path.join(current_dir, output_file)
 
 
-       # reshape -> 2D array
-       import numpy as np
-       two_d = np.array(flat_decoded_array, dtype=np.uint8).reshape((height, width))
+       # 1) .bin dosyasını byte'lar olarak oku
+       prof = self.profiler
+       with prof.stage("read") as st:
+           with open(input_path, "rb") as f:
+               data = f.read()
+           st["bytes_out"] = len(data)
 
 
-       # 6) resmi kaydet
-       write_image_grayscale(two_d, output_path)
+       # 2-4) çöz (konteyner ya da eski format) ve resmi kaydet
+       with prof:
+           with prof.stage("decode", len(data)) as st:
+               two_d = self.decompress_to_array(data)
+               st["bytes_out"] = two_d.nbytes
+           with prof.stage("write", two_d.nbytes):
+               write_image(output_path, two_d)
 
 
        print(f"{input_file} -> {output_file} decompress tamamlandı.")
@@ -195,31 +233,9 @@ class LZWGrayCoding:
        """
        Gri ton piksel dizisini (0..255) LZW integer kod listesine dönüştür.
        pixel_array: 1D numpy array veya python list, elemanlar [0..255].
+       Sözlük (prefix_code, sembol) tamsayı çiftleriyle tutulur (lzw_common.lzw).
        """
-       dict_size = 256
-       # key: tuple/string => value: int
-       # ama piksel integer'ı string'e çevirip dictionary'de tutabiliriz
-       dictionary = {chr(i): i for i in range(dict_size)}
-
-
-       w = ""
-       encoded_result = []
-
-
-       for val in pixel_array:
-           c = chr(val)  # tek karakter
-           wc = w + c
-           if wc in dictionary:
-               w = wc
-           else:
-               encoded_result.append(dictionary[w])
-               dictionary[wc] = dict_size
-               dict_size += 1
-               w = c
-
-
-       if w != "":
-           encoded_result.append(dictionary[w])
+       encoded_result, dict_size = encode_fixed(pixel_array)
 
 
        self.codelength = math.ceil(math.log2(dict_size))
@@ -232,110 +248,7 @@ class LZWGrayCoding:
 
    def lzw_decode(self, encoded_list):
        """
-       LZW decode -> gri ton piksel array (liste).
+       LZW decode -> gri ton piksel array (bytearray, 0..255).
+       Cümleler prefix/suffix tablolarından çıkarılır, string tutulmaz.
        """
-       dict_size = 256
-       dictionary = {i: chr(i) for i in range(dict_size)}
-
-
-       if not encoded_list:
-           return []
-
-
-       w = chr(encoded_list.pop(0))
-       output_chars = [w]  # list of strings
-
-
-       for code in encoded_list:
-           if code in dictionary:
-               entry = dictionary[code]
-           elif code == dict_size:
-               # special case
-               entry = w + w[0]
-           else:
-               raise ValueError(f"Geçersiz code: {code}")
-
-
-           output_chars.append(entry)
-
-
-           # dictionary'e yeni ek
-           dictionary[dict_size] = w + entry[0]
-           dict_size += 1
-
-
-           w = entry
-
-
-       # output_chars bir karakterler dizisi, bunları integer'a dön
-       result_integers = []
-       for chunk in output_chars:
-           for ch in chunk:
-               result_integers.append(ord(ch))
-
-
-       return result_integers
-
-
-   # --------------------------------------------------------------------------
-   # Bit string <-> integer list  (benzer Level 1 mantığı)
-   # --------------------------------------------------------------------------
-   def int_list_to_bitstring(self, int_list):
-       bits = ""
-       for num in int_list:
-           bits += format(num, f"0{self.codelength}b")
-       return bits
-
-
-   def add_codelength_info(self, bit_string):
-       # 8 bit
-       codelen_str = format(self.codelength, '08b')
-       return codelen_str + bit_string
-
-
-   def pad_bitstring(self, bit_string):
-       extra_bits = (8 - (len(bit_string) % 8)) % 8
-       bit_string += "0" * extra_bits
-       # başa 8 bit ile padding miktarı
-       padding_info = format(extra_bits, '08b')
-       return padding_info + bit_string
-
-
-   def bitstring_to_bytearray(self, padded_bit_string):
-       if len(padded_bit_string) % 8 != 0:
-           raise ValueError("Hatalı padding!")
-       b_array = bytearray()
-       for i in range(0, len(padded_bit_string), 8):
-           chunk = padded_bit_string[i:i + 8]
-           b_array.append(int(chunk, 2))
-       return b_array
-
-
-   def remove_padding(self, total_bits):
-       # ilk 8 bit -> padding
-       padding_info = total_bits[:8]
-       extra_bits = int(padding_info, 2)
-       bit_string = total_bits[8:]
-       if extra_bits > 0:
-           bit_string = bit_string[:-extra_bits]
-       return bit_string
-
-
-   def extract_codelength_info(self, bit_string):
-       codelen_str = bit_string[:8]
-       self.codelength = int(codelen_str, 2)
-       return bit_string[8:]
-
-
-   def bitstring_to_int_list(self, bit_string):
-       result = []
-       for i in range(0, len(bit_string), self.codelength):
-           chunk = bit_string[i:i + self.codelength]
-           if len(chunk) < self.codelength:
-               break
-           val = int(chunk, 2)
-           result.append(val)
-       return result
-
-
-
+       return decode_fixed(encoded_list)
@@ -1,21 +1,79 @@
 # File: LZW_gray_diff.py
 
+import io
 import os
+import sys
 import math
+import numpy as np
 from basic_image_ops import (
-    read_image_grayscale,
-    write_image_grayscale,
-    image_to_flat_array,
     flat_array_to_image
 )
 
+# ortak lzw_common paketi bir üst klasörde
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from lzw_common.bitio import bytes_to_codes
+from lzw_common.lzw import (
+    encode_fixed,
+    decode_fixed,
+    decode_variable,
+    is_variable_stream,
+    dictionary_width,
+    POLICY_RESET
+)
+from lzw_common.transform import row_difference, row_reconstruct
+from lzw_common.entropy import check_entropy, ENTROPY_NONE
+from lzw_common.scan import check_scan_order, SCAN_ROW_MAJOR
+from lzw_common.profiling import NullProfiler
+from lzw_common.imageio import read_image, write_image
+from lzw_common.container import (
+    write_image_container,
+    decode_container,
+    is_container
+)
+
 class LZWGrayDiffCoding:
     """
     Gri tonlu resimde satır bazında fark (difference) alarak LZW ile sıkıştırma/açma.
+    .bin dosyası lzw_common.container formatındadır (boyutlar ve tahmin edici başlıkta).
     """
-    def __init__(self, filename):
+    LEVEL = 3
+
+    def __init__(self, filename=None, max_code_width=None, predictor="left", zigzag=False, tile=(1, 0),
+                 tile_size=None, workers=None, profiler=None, dict_policy=POLICY_RESET, memory_budget=None,
+                 seed=None, entropy=ENTROPY_NONE, scan=SCAN_ROW_MAJOR):
+        """
+        filename: örn. 'sample_gray' (yalnızca *_image_file metotları için;
+        compress_array / decompress_to_array dosyaya dokunmaz)
+        max_code_width: None => sabit codelength,
+        aksi halde 9 bitten max_code_width'e büyüyen kodlar (CLEAR/EOI).
+        predictor: lzw_common.predictors isimlerinden biri ya da "adaptive"
+        (karo başına en iyi tahmin edici); varsayılan "left" satır farkıdır.
+        zigzag: artıkları 0, -1, 1, -2 ... => 0, 1, 2, 3 ... olarak yeniden numarala.
+        tile: adaptive için (satır, sütun) karo boyu, 0 => tüm genişlik/yükseklik.
+        tile_size: verilirse resim bağımsız karolara bölünür ve karolar ayrı
+        süreçlerde kodlanır (lzw_common.tiles); workers süreç sayısı.
+        profiler: aşama ölçümleri için lzw_common.profiling.Profiler
+        (verilmezse ölçüm yapılmaz; verilirse kayıtlar self.profiler.report() ile okunur).
+        dict_policy: sözlük dolunca "reset" / "ratio" / "lru" (lzw_common.lzw, değişken genişlikte)
+        memory_budget: verilirse max_code_width sözlük bu kadar byte'a sığacak şekilde seçilir
+        seed: tohum sözlük (lzw_common.seed; nesne, .lzws yolu veya id), değişken genişlikte
+        entropy: LZW kodlarından sonra entropi kodlayıcı ("none" / "huffman", lzw_common.entropy)
+        scan: artıkların LZW'ye veriliş sırası ("row-major" / "column-major" / "tile-raster" /
+        "hilbert" / "interleaved", lzw_common.scan), başlıkta saklanır
+        """
         self.filename = filename
         self.codelength = None
+        self.max_code_width = dictionary_width(max_code_width, dict_policy, memory_budget, seed)
+        self.dict_policy = dict_policy
+        self.seed = seed
+        self.entropy = check_entropy(entropy)
+        self.scan = check_scan_order(scan)
+        self.predictor = predictor
+        self.zigzag = zigzag
+        self.tile = tile
+        self.tile_size = tile_size
+        self.workers = workers
+        self.profiler = profiler if profiler is not None else NullProfiler()
 
     # --------------------------------------------------------------------------
     # 1) Ana Fonksiyon: compress_image_file
@@ -29,33 +87,18 @@ class LZWGrayDiffCoding:
         output_file = self.filename + "_diff.bin"
         output_path = os.path.join(current_dir, output_file)
 
-        # 1) Resmi oku -> flatten array
-        img, width, height = read_image_grayscale(input_path)
-        flat_array, w, h = image_to_flat_array(img)
-
-        # 2) Fark dizisini oluştur
-        diff_array = self.compute_difference_array(flat_array, w, h)
-
-        # 3) LZW encode
-        encoded_ints = self.lzw_encode(diff_array)
-
-        # 4) integer list -> bit string
-        bit_string = self.int_list_to_bitstring(encoded_ints)
-
-        # 5) code length'i başa ekle
-        bit_string = self.add_codelength_info(bit_string)
-
-        # 6) padding
-        padded_bits = self.pad_bitstring(bit_string)
-
-        # 7) byte array'e çevir, dosyaya yaz
-        byte_array = self.bitstring_to_bytearray(padded_bits)
-        with open(output_path, "wb") as f:
-            f.write(byte_array)
+        prof = self.profiler
+        with prof:
+            # 1) Resmi oku (BMP/PGM/PPM: mmap görünümü, diğerleri PIL)
+            with prof.stage("read", os.path.getsize(input_path)) as st:
+                image = read_image(input_path, "L")
+                h, w = image.shape
+                st["bytes_out"] = image.nbytes
+            with open(output_path, "wb") as f:
+                compressed_size = self._compress_array(image, f)
 
         # Bilgi
         uncompressed_size = w * h  # 1 byte/piksel
-        compressed_size = len(byte_array)
         if compressed_size != 0:
             ratio = uncompressed_size / compressed_size
         else:
@@ -65,43 +108,47 @@ class LZWGrayDiffCoding:
         print(f"Orijinal boyut    : {uncompressed_size} bytes")
         print(f"Sıkıştırılmış boyut : {compressed_size} bytes")
         print(f"Sık. Oranı        : {ratio:.2f}")
-        print(f"Kod uzunluğu (bit): {self.codelength}")
+        print(f"Kod uzunluğu (bit): {self.codelength or 'sabit (blok başına)'}")
 
         return output_path
 
     # --------------------------------------------------------------------------
-    # 2) Decompress: .bin -> fark array -> orijinal piksel array -> .bmp
+    # Bellek içi API: dosya yerine dizi / bytes
     # --------------------------------------------------------------------------
-    def decompress_image_file(self):
-        current_dir = os.path.dirname(os.path.realpath(__file__))
-
-        input_file = self.filename + "_diff.bin"
-        input_path = os.path.join(current_dir, input_file)
-
-        output_file = self.filename + "_diff_decompressed.bmp"
-        output_path = os.path.join(current_dir, output_file)
-
-        # 1) .bin'i oku -> bit string
-        with open(input_path, "rb") as f:
-            data = f.read()
-
-        bit_str = ""
-        for byte in data:
-            bit_str += bin(byte)[2:].rjust(8, '0')
-
-        # 2) padding'i kaldır
-        bit_str = self.remove_padding(bit_str)
-
-        # 3) codelength'i al
-        bit_str = self.extract_codelength_info(bit_str)
-
-        # 4) bit string -> integer list
-        encoded_list = self.bitstring_to_int_list(bit_str)
+    def compress_array(self, image):
+        """
+        (H, W) uint8 gri ton dizi -> .bin içeriği (bytes); dosya okunmaz/yazılmaz.
+        """
+        image = np.asarray(image, dtype=np.uint8)
+        if image.ndim != 2:
+            raise ValueError(f"Resim (H, W) olmalı! Bulduk: {image.shape}")
+        out = io.BytesIO()
+        with self.profiler:
+            self._compress_array(image, out)
+        return out.getvalue()
+
+    def decompress_to_array(self, data):
+        """
+        .bin içeriği (bytes, bytearray veya memoryview) -> (H, W) uint8 dizi.
+        """
+        data = memoryview(data).cast("B")
+        if is_container(data):
+            # 2-4) boyutlar ve tahmin edici başlıkta: ortak decoder
+            return decode_container(data, self.workers)
+
+        # Eski (başlıksız) .bin dosyaları: boyutlar saklanmamış
+        if is_variable_stream(data):
+            # 2-3) değişken genişlikli akış -> fark array
+            diff_array = decode_variable(data)
+        else:
+            # 2) byte'lar -> integer list (padding ve codelength burada çözülür)
+            codes, self.codelength = bytes_to_codes(data)
+            encoded_list = codes.tolist()
 
-        # 5) LZW decode -> fark array
-        diff_array = self.lzw_decode(encoded_list)
+            # 3) LZW decode -> fark array
+            diff_array = self.lzw_decode(encoded_list)
 
-        # 6) Fark array'den orijinal piksel array'i reconstruct
+        # 4) Fark array'den orijinal piksel array'i reconstruct
         #    Boyutları nasıl bileceğiz?
         #    (Aynı Level 2 sorun: width & height saklanmalı veya sabit.)
         # Örnek: sabit bir width=256 diyelim:
@@ -110,67 +157,70 @@ class LZWGrayDiffCoding:
         height = length // width
         print(f"[UYARI] decode sırasında width={width}, height={height} varsayıldı!")
 
-        reconstructed = self.reconstruct_from_difference(diff_array, width, height)
-
-        # 7) resmi kaydet
-        write_image_grayscale(reconstructed, output_path)
+        return self.reconstruct_from_difference(diff_array, width, height)
 
-        print(f"{input_file} -> {output_file} fark + LZW decompress tamam.")
-        return output_path
+    def _compress_array(self, image, dst):
+        """
+        compress_image_file'ın 2-5. adımları: api.compress_array ile aynı kodlayıcı
+        (lzw_common.container.write_image_container; aşamalar self.profiler'da ölçülür).
+        dst: seek edilebilir binary dosya (açık dosya veya io.BytesIO)
+        Return: yazılan byte sayısı
+        """
+        compressed_size, self.codelength = write_image_container(
+            dst, image, self.LEVEL, self.max_code_width,
+            predictor=self.predictor, zigzag=self.zigzag, tile=self.tile, tile_size=self.tile_size,
+            workers=self.workers, dict_policy=self.dict_policy, seed=self.seed, entropy=self.entropy,
+            scan=self.scan, profiler=self.profiler)
+        return compressed_size
 
     # --------------------------------------------------------------------------
-    # 3) Fark Hesaplama / Geri Alma
+    # 2) Decompress: .bin -> fark array -> orijinal piksel array -> .bmp
     # --------------------------------------------------------------------------
-    def compute_difference_array(self, flat_array, width, height):
-        import numpy as np
-
-        # 1) Buraya eklenecek (flat_array'i zorla 0..255 aralığında tut):
-        flat_array = flat_array.astype(np.uint8)
-
-        diff = np.zeros_like(flat_array, dtype=np.uint8)
-        total_pixels = width * height
+    def decompress_image_file(self):
+        current_dir = os.path.dirname(os.path.realpath(__file__))
 
-        for row in range(height):
-            row_start = row * width
-            # satırın ilk pikseli => fark = kendi değeri
-            diff[row_start] = flat_array[row_start]
+        input_file = self.filename + "_diff.bin"
+        input_path = os.path.join(current_dir, input_file)
 
-            for col in range(1, width):
-                idx = row_start + col
-                left = flat_array[idx - 1]
-                cur = flat_array[idx]
+        output_file = self.filename + "_diff_decompressed.bmp"
+        output_path = os.path.join(current_dir, output_file)
 
-                # 2) Farkı alırken int() ile çalış, sonra % 256
-                #    Değer asla 256 olmaz, 0..255 aralığına sabitlenir.
-                d = (int(cur) - int(left)) % 256
+        # 1) .bin'i oku
+        prof = self.profiler
+        with prof.stage("read") as st:
+            with open(input_path, "rb") as f:
+                data = f.read()
+            st["bytes_out"] = len(data)
+
+        # 2-4) çöz (konteyner ya da eski format) ve resmi kaydet
+        with prof:
+            with prof.stage("decode", len(data)) as st:
+                reconstructed = self.decompress_to_array(data)
+                st["bytes_out"] = reconstructed.nbytes
+            with prof.stage("write", reconstructed.nbytes):
+                write_image(output_path, reconstructed)
 
-                # 3) Sonucu da np.uint8 olarak diff dizisine koy
-                diff[idx] = np.uint8(d)
+        print(f"{input_file} -> {output_file} fark + LZW decompress tamam.")
+        return output_path
 
-        return diff
+    # --------------------------------------------------------------------------
+    # 3) Fark Hesaplama / Geri Alma
+    # --------------------------------------------------------------------------
+    def compute_difference_array(self, flat_array, width, height):
+        """
+        Satır bazında fark: ilk piksel kendisi, sonrakiler (cur - left) % 256.
+        Tüm resim tek seferde NumPy ile işlenir (lzw_common.transform).
+        Return: 1D fark dizisi (uint8)
+        """
+        return row_difference(flat_array_to_image(flat_array, width, height)).ravel()
 
     def reconstruct_from_difference(self, diff_array, width, height):
-        import numpy as np
-        rec = np.zeros_like(diff_array, dtype=np.uint8)
-
-        for row in range(height):
-            row_start = row * width
-            # ilk piksel
-            rec[row_start] = diff_array[row_start]
-
-            for col in range(1, width):
-                idx = row_start + col
-                left_original = int(rec[idx - 1])  # int'e çevir
-                diff_val = int(diff_array[idx])  # int'e çevir
-
-                # Burada python integer aritmetiğiyle %256 yap
-                original_val = (left_original + diff_val) % 256
-
-                # Sonuç 0..255 arası => güvenle np.uint8 yapabiliriz
-                rec[idx] = np.uint8(original_val)
-
-        rec_2d = rec.reshape((height, width))
-        return rec_2d
+        """
+        Fark dizisinden orijinal pikseller: satır boyunca kümülatif toplam % 256.
+        Return: (height, width) 2D dizi (uint8)
+        """
+        diff_2d = flat_array_to_image(np.asarray(diff_array, dtype=np.uint8), width, height)
+        return row_reconstruct(diff_2d)
 
     # --------------------------------------------------------------------------
     # 4) LZW Encode / Decode
@@ -178,110 +228,14 @@ class LZWGrayDiffCoding:
     def lzw_encode(self, diff_array):
         """
         Fark array'ini (0..255) -> LZW integer list.
+        Sözlük (prefix_code, sembol) tamsayı çiftleriyle tutulur (lzw_common.lzw).
         """
-        dict_size = 256
-        dictionary = {chr(i): i for i in range(dict_size)}
-
-        w = ""
-        encoded_result = []
-        for val in diff_array:
-            c = chr(val)
-            wc = w + c
-            if wc in dictionary:
-                w = wc
-            else:
-                encoded_result.append(dictionary[w])
-                dictionary[wc] = dict_size
-                dict_size += 1
-                w = c
-
-        if w != "":
-            encoded_result.append(dictionary[w])
-
+        encoded_result, dict_size = encode_fixed(diff_array)
         self.codelength = max(8, math.ceil(math.log2(dict_size)))
         return encoded_result
 
     def lzw_decode(self, encoded_list):
         """
-        LZW decode -> fark array (0..255).
+        LZW decode -> fark array (bytearray, 0..255).
         """
-        dict_size = 256
-        dictionary = {i: chr(i) for i in range(dict_size)}
-
-        if not encoded_list:
-            return []
-
-        w = chr(encoded_list.pop(0))
-        output_chars = [w]
-
-        for code in encoded_list:
-            if code in dictionary:
-                entry = dictionary[code]
-            elif code == dict_size:
-                entry = w + w[0]
-            else:
-                raise ValueError(f"Geçersiz code: {code}")
-            output_chars.append(entry)
-
-            dictionary[dict_size] = w + entry[0]
-            dict_size += 1
-            w = entry
-
-        # char dizisini integer'a çevir
-        result_integers = []
-        for chunk in output_chars:
-            for ch in chunk:
-                result_integers.append(ord(ch))
-
-        return result_integers
-
-    # --------------------------------------------------------------------------
-    # 5) Bit string <-> integer list & padding (Level 2'dekine benzer)
-    # --------------------------------------------------------------------------
-    def int_list_to_bitstring(self, int_list):
-        bits = ""
-        for num in int_list:
-            bits += format(num, f"0{self.codelength}b")
-        return bits
-
-    def add_codelength_info(self, bit_string):
-        codelen_str = format(self.codelength, '08b')
-        return codelen_str + bit_string
-
-    def pad_bitstring(self, bit_string):
-        extra = (8 - len(bit_string) % 8) % 8
-        bit_string += "0" * extra
-        padding_info = format(extra, '08b')
-        return padding_info + bit_string
-
-    def bitstring_to_bytearray(self, padded_bits):
-        if len(padded_bits) % 8 != 0:
-            raise ValueError("Padding hatalı!")
-        b_array = bytearray()
-        for i in range(0, len(padded_bits), 8):
-            chunk = padded_bits[i:i+8]
-            b_array.append(int(chunk, 2))
-        return b_array
-
-    def remove_padding(self, total_bits):
-        padding_info = total_bits[:8]
-        extra = int(padding_info, 2)
-        bit_string = total_bits[8:]
-        if extra > 0:
-            bit_string = bit_string[:-extra]
-        return bit_string
-
-    def extract_codelength_info(self, bit_string):
-        codelen_str = bit_string[:8]
-        self.codelength = int(codelen_str, 2)
-        return bit_string[8:]
-
-    def bitstring_to_int_list(self, bit_string):
-        result = []
-        for i in range(0, len(bit_string), self.codelength):
-            chunk = bit_string[i:i+self.codelength]
-            if len(chunk) < self.codelength:
-                break
-            val = int(chunk, 2)
-            result.append(val)
-        return result
+        return decode_fixed(encoded_list)
@@ -1,36 +1,93 @@
 # File: LZW_color.py
 
+import io
 import os
+import sys
 import math
 import numpy as np
 from basic_image_ops import (
-    read_image_color,
-    write_image_color,
-    image_to_array_rgb,
-    separate_rgb_channels,
     combine_rgb_channels
 )
 
+# ortak lzw_common paketi bir üst klasörde
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from lzw_common.bitio import bytes_to_codes
+from lzw_common.lzw import (
+    encode_fixed,
+    decode_fixed,
+    decode_fixed_into,
+    decode_variable_into,
+    is_variable_stream,
+    dictionary_width,
+    POLICY_RESET
+)
+from lzw_common.entropy import check_entropy, ENTROPY_NONE
+from lzw_common.scan import check_scan_order, SCAN_ROW_MAJOR
+from lzw_common.color import check_color_transform, COLOR_NONE
+from lzw_common.profiling import NullProfiler
+from lzw_common.imageio import read_image, write_image
+from lzw_common.container import (
+    write_image_container,
+    decode_container,
+    is_container
+)
+
 class LZWColorCoding:
     """
     Renkli (RGB) resmi LZW ile sıkıştırma/açma.
     Tek bir akışta R+G+B kanalları ardışık eklenerek encode edilir.
     (Level 4: Fark yok, saf LZW.)
+    .bin dosyası lzw_common.container formatındadır (32 bit boyutlar başlıkta).
     """
+    LEVEL = 4
 
-    def __init__(self, filename):
+    def __init__(self, filename=None, max_code_width=None, tile_size=None, workers=None,
+                 channel_streams=False, profiler=None, dict_policy=POLICY_RESET, memory_budget=None,
+                 seed=None, entropy=ENTROPY_NONE, color_transform=COLOR_NONE, scan=SCAN_ROW_MAJOR):
+        """
+        filename: örn. 'sample_color' (yalnızca *_image_file metotları için;
+        compress_array / decompress_to_array dosyaya dokunmaz)
+        max_code_width: None => sabit codelength,
+        aksi halde 9 bitten max_code_width'e büyüyen kodlar (CLEAR/EOI).
+        tile_size: verilirse resim tile_size x tile_size karolara bölünür,
+        karolar ayrı süreçlerde kodlanır (lzw_common.tiles); workers süreç sayısı.
+        channel_streams: True ise R, G, B ayrı sözlüklerle ayrı akışlara
+        kodlanır ve paralel işlenir (lzw_common.channels).
+        profiler: aşama ölçümleri için lzw_common.profiling.Profiler
+        (verilmezse ölçüm yapılmaz; verilirse kayıtlar self.profiler.report() ile okunur).
+        dict_policy: sözlük dolunca "reset" / "ratio" / "lru" (lzw_common.lzw, değişken genişlikte)
+        memory_budget: verilirse max_code_width sözlük bu kadar byte'a sığacak şekilde seçilir
+        seed: tohum sözlük (lzw_common.seed; nesne, .lzws yolu veya id), değişken genişlikte
+        entropy: LZW kodlarından sonra entropi kodlayıcı ("none" / "huffman", lzw_common.entropy)
+        scan: piksellerin LZW'ye veriliş sırası ("row-major" / "column-major" / "tile-raster" /
+        "hilbert" / "interleaved", lzw_common.scan), başlıkta saklanır
+        color_transform: LZW'den önce RGB'ye uygulanan kayıpsız renk dönüşümü
+        ("none" / "ycocg-r" / "rct", lzw_common.color), başlıkta saklanır
+        """
+        if tile_size is not None and channel_streams:
+            raise ValueError("tile_size ve channel_streams birlikte kullanılamaz!")
         self.filename = filename
         self.codelength = None
+        self.max_code_width = dictionary_width(max_code_width, dict_policy, memory_budget, seed)
+        self.dict_policy = dict_policy
+        self.seed = seed
+        self.entropy = check_entropy(entropy)
+        self.scan = check_scan_order(scan)
+        self.color_transform = check_color_transform(color_transform)
+        self.tile_size = tile_size
+        self.workers = workers
+        self.channel_streams = channel_streams
+        self.profiler = profiler if profiler is not None else NullProfiler()
 
     def compress_image_file(self):
         """
         filename.bmp -> filename_color.bin
         Aşağıdaki adımları yapar:
-         1) read_image_color -> (width, height)
+         1) read_image (BMP/PGM/PPM: mmap görünümü) -> (width, height)
          2) R,G,B flatten
-         3) (width,height) 4 byte olarak .bin'e yaz
-         4) R+G+B tek bir array haline getir => LZW encode => bit string
-         5) padding + byte array => .bin
+         3) R+G+B sırayla => LZW encode
+         4) kodlar paketlenmiş byte'lara (padding dahil)
+         5) konteyner başlığı (width, height, mod, checksum) + veri => .bin
         Return: output path
         """
         current_dir = os.path.dirname(os.path.realpath(__file__))
@@ -40,133 +97,127 @@ class LZWColorCoding:
         output_file = self.filename + "_color.bin"
         output_path = os.path.join(current_dir, output_file)
 
-        # 1) Resmi oku
-        img, width, height = read_image_color(input_path)
-        np_img, w, h = image_to_array_rgb(img)
-
-        # 2) Kanalları ayır
-        R, G, B = separate_rgb_channels(np_img)  # 1D flatten
-        # Tek birleştir => [R..., G..., B...]
-        merged_channels = np.concatenate([R, G, B])  # boyut = 3*w*h
-
-        # 3) LZW encode
-        encoded = self.lzw_encode(merged_channels)
-
-        # 4) integer list -> bit string
-        bit_str = self.int_list_to_bitstring(encoded)
-
-        # 5) codelength'i başa koy
-        bit_str = self.add_codelength_info(bit_str)
-
-        # 6) padding
-        padded_bits = self.pad_bitstring(bit_str)
-
-        # 7) Byte array'e dönüştürmeden önce,
-        #    .bin'in en başına 4 byte (width, height) ekleyeceğiz.
-        #    Bunu yapmak için "ek bir bytearray" oluşturup
-        #    width,height'i 16'şar bit olarak yazabiliriz.
-        #    Sonra asıl bit verisini ekleyebiliriz.
-        #    Fakat bit verimiz string formatta, bu karmaşık.
-        #
-        # Kolay bir yöntem:
-        #    - önce 4 byte'ı normal binary formda dosyaya yazarız
-        #    - sonra padded_bits'i yazarız.
-        #    => Yani final .bin:
-        #         [2 byte width][2 byte height][bitstring]
-        # decode aşamasında ilk 4 byte'ı okur, bitstring'i geri kalanını okur.
-        #
-        # Aşağıda bunu tek seferde yapabilmek için,
-        #   "header_array" + "bit_data_array" birleştireceğiz.
-        # (Ama python formatlar farklı: bit string -> byte array,
-        #  4 byte -> normal int.)
-        #
-        # Step-by-step:
-        # A) 4 byte => bytearray
-        header_bytes = bytearray()
-        # width ve height'i 2'şer byte (16 bit) little-endian yazalım:
-        header_bytes.append(width & 0xFF)
-        header_bytes.append((width >> 8) & 0xFF)
-        header_bytes.append(height & 0xFF)
-        header_bytes.append((height >> 8) & 0xFF)
-
-        # B) bit data -> bytearray
-        bit_data_array = self.bitstring_to_bytearray(padded_bits)
-
-        # C) final array = header_bytes + bit_data_array
-        final_array = header_bytes + bit_data_array
-
-        # Dosyaya yaz
-        with open(output_path, "wb") as f:
-            f.write(final_array)
+        prof = self.profiler
+        with prof:
+            # 1) Resmi oku
+            with prof.stage("read", os.path.getsize(input_path)) as st:
+                np_img = read_image(input_path, "RGB")
+                h, w = np_img.shape[:2]
+                st["bytes_out"] = np_img.nbytes
+            with open(output_path, "wb") as f:
+                compressed_size = self._compress_array(np_img, f)
 
         # Bilgi
         uncompressed_size = w * h * 3  # 3 kanal => 1 byte per channel
-        compressed_size = len(final_array)
         ratio = uncompressed_size / compressed_size if compressed_size>0 else 1.0
         print(f"{input_file} -> {output_file} sıkıştırma OK.")
         print(f"Resim boyutu : {w} x {h}")
         print(f"Orijinal boyut : {uncompressed_size} bytes (RGB piksel sayısı)")
         print(f"Sıkıştırılmış boyut: {compressed_size} bytes")
         print(f"Sıkıştırma Oranı: {ratio:.2f}")
-        print(f"Codelength: {self.codelength} bit")
+        print(f"Codelength: {self.codelength} bit" if self.codelength else "Codelength: sabit (blok başına)")
         return output_path
 
-    def decompress_image_file(self):
+    # --------------------------------------------------------------------------
+    # Bellek içi API: dosya yerine dizi / bytes
+    # --------------------------------------------------------------------------
+    def compress_array(self, image):
         """
-        filename_color.bin -> filename_color_decompressed.bmp
+        (H, W, 3) uint8 RGB dizi -> .bin içeriği (bytes); dosya okunmaz/yazılmaz.
         """
-        current_dir = os.path.dirname(os.path.realpath(__file__))
-        input_file = self.filename + "_color.bin"
-        input_path = os.path.join(current_dir, input_file)
-
-        output_file = self.filename + "_color_decompressed.bmp"
-        output_path = os.path.join(current_dir, output_file)
-
-        # 1) .bin dosyasını oku
-        with open(input_path, "rb") as f:
-            all_data = f.read()
+        np_img = np.asarray(image, dtype=np.uint8)
+        if np_img.ndim != 3 or np_img.shape[2] != 3:
+            raise ValueError(f"Resim (H, W, 3) olmalı! Bulduk: {np_img.shape}")
+        out = io.BytesIO()
+        with self.profiler:
+            self._compress_array(np_img, out)
+        return out.getvalue()
+
+    def decompress_to_array(self, data):
+        """
+        .bin içeriği (bytes, bytearray veya memoryview) -> (H, W, 3) uint8 dizi.
+        """
+        data = memoryview(data).cast("B")
+        if is_container(data):
+            # 2-5) boyutlar ve mod başlıkta: ortak decoder
+            return decode_container(data, self.workers)
 
-        # all_data => ilk 4 byte: width, height
+        # Eski .bin dosyaları:
+        # data => ilk 4 byte: width, height
         # geri kalanı bit verisi
-        if len(all_data) < 4:
+        if len(data) < 4:
             raise ValueError("Dosya formatı hatalı. En az 4 byte lazım (width, height).")
 
-        width = (all_data[0] | (all_data[1]<<8)) & 0xFFFF
-        height = (all_data[2] | (all_data[3]<<8)) & 0xFFFF
-
-        # print(f"Okunan width={width}, height={height}")
+        width = (data[0] | (data[1]<<8)) & 0xFFFF
+        height = (data[2] | (data[3]<<8)) & 0xFFFF
 
         # bit verisini 4. byte'tan itibaren okuyoruz
-        bit_bytes = all_data[4:]  # geriye kalan
-        # Byte -> bit string
-        bit_str = ""
-        for b in bit_bytes:
-            bit_str += bin(b)[2:].rjust(8, '0')
-
-        # 2) padding'i kaldır
-        bit_str = self.remove_padding(bit_str)
+        bit_bytes = data[4:]  # geriye kalan
 
-        # 3) codelength'i çek
-        bit_str = self.extract_codelength_info(bit_str)
-
-        # 4) integer list
-        encoded_list = self.bitstring_to_int_list(bit_str)
+        # boyutlar başlıkta: merged array (R+G+B) için tampon önceden ayrılır,
+        # LZW cümleleri doğrudan bu tampona kopyalanır
+        size = width*height
+        merged_array = np.empty(size*3, dtype=np.uint8)
+        if is_variable_stream(bit_bytes):
+            # 2-3) değişken genişlikli akış -> merged array
+            count = decode_variable_into(bit_bytes, merged_array)
+        else:
+            # 2) byte'lar -> kod dizisi (padding ve codelength burada çözülür)
+            codes, self.codelength = bytes_to_codes(bit_bytes)
 
-        # 5) decode -> merged array (R+G+B)
-        merged_array = self.lzw_decode(encoded_list)  # length = width*height*3
+            # 3) decode -> merged array
+            count = decode_fixed_into(codes, merged_array)
 
-        if len(merged_array) != width*height*3:
-            raise ValueError(f"Kanal verisi boyutu uymuyor! Beklenen: {width*height*3}, bulduk: {len(merged_array)}")
+        if count != size*3:
+            raise ValueError(f"Kanal verisi boyutu uymuyor! Beklenen: {size*3}, bulduk: {count}")
 
-        # 6) Ayrı R, G, B
-        size = width*height
+        # 4) Ayrı R, G, B (kopyasız görünümler)
         R = merged_array[:size]
         G = merged_array[size:2*size]
         B = merged_array[2*size:3*size]
 
-        # 7) Birleştir -> RGB array -> bmp yaz
-        rgb = combine_rgb_channels(np.array(R), np.array(G), np.array(B), width, height)
-        write_image_color(rgb, output_path)
+        # 5) Birleştir -> RGB array
+        return combine_rgb_channels(R, G, B, width, height)
+
+    def _compress_array(self, image, dst):
+        """
+        compress_image_file'ın 2-5. adımları: api.compress_array ile aynı kodlayıcı
+        (lzw_common.container.write_image_container; aşamalar self.profiler'da ölçülür).
+        dst: seek edilebilir binary dosya (açık dosya veya io.BytesIO)
+        Return: yazılan byte sayısı
+        """
+        compressed_size, self.codelength = write_image_container(
+            dst, image, self.LEVEL, self.max_code_width,
+            tile_size=self.tile_size, channel_streams=self.channel_streams, workers=self.workers,
+            dict_policy=self.dict_policy, seed=self.seed, entropy=self.entropy,
+            color_transform=self.color_transform, scan=self.scan, profiler=self.profiler)
+        return compressed_size
+
+    def decompress_image_file(self):
+        """
+        filename_color.bin -> filename_color_decompressed.bmp
+        """
+        current_dir = os.path.dirname(os.path.realpath(__file__))
+        input_file = self.filename + "_color.bin"
+        input_path = os.path.join(current_dir, input_file)
+
+        output_file = self.filename + "_color_decompressed.bmp"
+        output_path = os.path.join(current_dir, output_file)
+
+        # 1) .bin dosyasını oku
+        prof = self.profiler
+        with prof.stage("read") as st:
+            with open(input_path, "rb") as f:
+                all_data = f.read()
+            st["bytes_out"] = len(all_data)
+
+        # 2-5) çöz (konteyner ya da eski format) -> RGB array -> bmp yaz
+        with prof:
+            with prof.stage("decode", len(all_data)) as st:
+                rgb = self.decompress_to_array(all_data)
+                st["bytes_out"] = rgb.nbytes
+            with prof.stage("write", rgb.nbytes):
+                write_image(output_path, rgb)
 
         print(f"{input_file} -> {output_file} açma (decompress) OK.")
         return output_path
@@ -178,108 +229,11 @@ class LZWColorCoding:
         """
         array_1d: [0..255] integer (R, G veya B,
         veya R+G+B hepsi concatenated).
+        Sözlük (prefix_code, sembol) tamsayı çiftleriyle tutulur (lzw_common.lzw).
         """
-        dict_size = 256
-        dictionary = {chr(i): i for i in range(dict_size)}
-
-        w = ""
-        result = []
-
-        for val in array_1d:
-            c = chr(val)
-            wc = w + c
-            if wc in dictionary:
-                w = wc
-            else:
-                result.append(dictionary[w])
-                dictionary[wc] = dict_size
-                dict_size += 1
-                w = c
-
-        if w:
-            result.append(dictionary[w])
-
+        encoded_result, dict_size = encode_fixed(array_1d)
         self.codelength = max(8, math.ceil(math.log2(dict_size)))
-        return result
+        return encoded_result
 
     def lzw_decode(self, encoded_list):
-        dict_size = 256
-        dictionary = {i: chr(i) for i in range(dict_size)}
-
-        if not encoded_list:
-            return []
-
-        w = chr(encoded_list.pop(0))
-        output_chars = [w]
-
-        for code in encoded_list:
-            if code in dictionary:
-                entry = dictionary[code]
-            elif code == dict_size:
-                entry = w + w[0]
-            else:
-                raise ValueError(f"Geçersiz code: {code}")
-            output_chars.append(entry)
-            dictionary[dict_size] = w + entry[0]
-            dict_size += 1
-            w = entry
-
-        # karakter dizisini integer dizisine çevir
-        result_integers = []
-        for chunk in output_chars:
-            for ch in chunk:
-                result_integers.append(ord(ch))
-
-        return result_integers
-
-    # --------------------------------------------------------------------------
-    # Bit string <-> int list, codelength/padding
-    # --------------------------------------------------------------------------
-    def int_list_to_bitstring(self, int_list):
-        bits = ""
-        for num in int_list:
-            bits += format(num, f"0{self.codelength}b")
-        return bits
-
-    def add_codelength_info(self, bitstr):
-        # 8 bit codelength
-        codelen_bits = format(self.codelength, '08b')
-        return codelen_bits + bitstr
-
-    def pad_bitstring(self, bitstr):
-        extra = (8 - len(bitstr) % 8) % 8
-        bitstr += "0" * extra
-        padding_info = format(extra, '08b')
-        return padding_info + bitstr
-
-    def bitstring_to_bytearray(self, padded_bits):
-        if len(padded_bits) % 8 != 0:
-            raise ValueError("bitstring 8'e bölünemiyor")
-        ba = bytearray()
-        for i in range(0, len(padded_bits), 8):
-            chunk = padded_bits[i:i+8]
-            ba.append(int(chunk, 2))
-        return ba
-
-    def remove_padding(self, total_bits):
-        padding_info = total_bits[:8]
-        extra = int(padding_info, 2)
-        bit_string = total_bits[8:]
-        if extra > 0:
-            bit_string = bit_string[:-extra]
-        return bit_string
-
-    def extract_codelength_info(self, bitstr):
-        codelen_bits = bitstr[:8]
-        self.codelength = int(codelen_bits, 2)
-        return bitstr[8:]
-
-    def bitstring_to_int_list(self, bitstr):
-        int_list = []
-        for i in range(0, len(bitstr), self.codelength):
-            chunk = bitstr[i:i+self.codelength]
-            if len(chunk) < self.codelength:
-                break
-            val = int(chunk, 2)
-            int_list.append(val)
-        return int_list
+        return decode_fixed(encoded_list)
@@ -1,24 +1,103 @@
 # File: LZW_color_diff.py
 
+import io
 import os
+import sys
 import math
+import mmap
 import numpy as np
 from basic_image_ops import (
-    read_image_color,
-    write_image_color,
-    image_to_array_rgb,
-    separate_rgb_channels,
     combine_rgb_channels
 )
 
+# ortak lzw_common paketi bir üst klasörde
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from lzw_common.bitio import bytes_to_codes
+from lzw_common.lzw import (
+    encode_fixed,
+    decode_fixed,
+    decode_fixed_into,
+    decode_variable_into,
+    is_variable_stream,
+    dictionary_width,
+    POLICY_RESET
+)
+from lzw_common.transform import row_difference, row_reconstruct
+from lzw_common.entropy import check_entropy, ENTROPY_NONE
+from lzw_common.scan import check_scan_order, SCAN_ROW_MAJOR
+from lzw_common.color import check_color_transform, COLOR_NONE
+from lzw_common.profiling import NullProfiler
+from lzw_common.imageio import read_image, write_image
+from lzw_common.container import (
+    write_image_container,
+    decode_container,
+    decode_to_file,
+    decode_region,
+    is_container,
+    read_container_header,
+    HEADER_SIZE,
+    LAYOUT_TILED
+)
+
 class LZWColorDiffCoding:
     """
     Level 5: Renkli (RGB) resimde satır bazlı fark -> LZW sıkıştırma.
+    .bin dosyası lzw_common.container formatındadır (32 bit boyutlar ve tahmin edici başlıkta).
     """
+    LEVEL = 5
 
-    def __init__(self, filename):
+    def __init__(self, filename=None, max_code_width=None, predictor="left", zigzag=False, tile=(1, 0),
+                 tile_size=None, workers=None, channel_streams=False, profiler=None, strip_rows=None,
+                 dict_policy=POLICY_RESET, memory_budget=None, seed=None, entropy=ENTROPY_NONE,
+                 color_transform=COLOR_NONE, scan=SCAN_ROW_MAJOR):
+        """
+        filename: örn. 'sample_color' (yalnızca *_image_file metotları için;
+        compress_array / decompress_to_array dosyaya dokunmaz)
+        max_code_width: None => sabit codelength,
+        aksi halde 9 bitten max_code_width'e büyüyen kodlar (CLEAR/EOI).
+        predictor: lzw_common.predictors isimlerinden biri ya da "adaptive"
+        (karo başına en iyi tahmin edici, üç kanal için ortak seçim);
+        varsayılan "left" satır farkıdır.
+        zigzag: artıkları 0, -1, 1, -2 ... => 0, 1, 2, 3 ... olarak yeniden numarala.
+        tile: adaptive için (satır, sütun) karo boyu, 0 => tüm genişlik/yükseklik.
+        tile_size: verilirse resim bağımsız karolara bölünür ve karolar ayrı
+        süreçlerde kodlanır (lzw_common.tiles); workers süreç sayısı.
+        channel_streams: True ise her kanalın farkı kendi sözlüğüyle ayrı bir
+        akışa kodlanır ve kanallar paralel işlenir (lzw_common.channels).
+        profiler: aşama ölçümleri için lzw_common.profiling.Profiler
+        (verilmezse ölçüm yapılmaz; verilirse kayıtlar self.profiler.report() ile okunur).
+        strip_rows: out-of-core mod; resim bu kadar satırlık yatay şeritler halinde
+        okunur (BMP/PGM/PPM mmap'ten), her şerit ayrı kodlanıp kodlandıkça yazılır,
+        açarken de şerit şerit çözülüp yazılır. RAM'den büyük resimler içindir;
+        "left" fark satır içinde kaldığı için artıklar şeritsiz kodlamayla aynıdır.
+        dict_policy: sözlük dolunca "reset" / "ratio" / "lru" (lzw_common.lzw, değişken genişlikte)
+        memory_budget: verilirse max_code_width sözlük bu kadar byte'a sığacak şekilde seçilir
+        (karo / şerit / kanal başına, her süreçte ayrı)
+        seed: tohum sözlük (lzw_common.seed; nesne, .lzws yolu veya id), değişken genişlikte
+        entropy: LZW kodlarından sonra entropi kodlayıcı ("none" / "huffman", lzw_common.entropy)
+        scan: artıkların LZW'ye veriliş sırası ("row-major" / "column-major" / "tile-raster" /
+        "hilbert" / "interleaved", lzw_common.scan), başlıkta saklanır
+        color_transform: tahminden önce RGB'ye uygulanan kayıpsız renk dönüşümü
+        ("none" / "ycocg-r" / "rct", lzw_common.color), başlıkta saklanır
+        """
+        if sum((tile_size is not None, bool(channel_streams), strip_rows is not None)) > 1:
+            raise ValueError("tile_size, channel_streams ve strip_rows birlikte kullanılamaz!")
         self.filename = filename
         self.codelength = None
+        self.max_code_width = dictionary_width(max_code_width, dict_policy, memory_budget, seed)
+        self.dict_policy = dict_policy
+        self.seed = seed
+        self.entropy = check_entropy(entropy)
+        self.scan = check_scan_order(scan)
+        self.color_transform = check_color_transform(color_transform)
+        self.predictor = predictor
+        self.zigzag = zigzag
+        self.tile = tile
+        self.tile_size = tile_size
+        self.workers = workers
+        self.channel_streams = channel_streams
+        self.strip_rows = strip_rows
+        self.profiler = profiler if profiler is not None else NullProfiler()
 
     # --------------------------------------------------------------------------
     # compress_image_file
@@ -31,118 +110,157 @@ class LZWColorDiffCoding:
         output_file = self.filename + "_color_diff.bin"
         output_path = os.path.join(current_dir, output_file)
 
-        # 1) resmi oku, R/G/B kanalları al
-        img, width, height = read_image_color(input_path)
-        np_img, w, h = image_to_array_rgb(img)
-        R, G, B = separate_rgb_channels(np_img)
-
-        # 2) fark dizileri
-        R_diff = self.compute_diff_array(R, w, h)
-        G_diff = self.compute_diff_array(G, w, h)
-        B_diff = self.compute_diff_array(B, w, h)
-
-        # 3) merge => R_diff+G_diff+B_diff
-        merged_diff = np.concatenate([R_diff, G_diff, B_diff])  # 3*w*h uzunluğunda
-
-        # 4) LZW encode
-        encoded_vals = self.lzw_encode(merged_diff)
-
-        # 5) integer -> bit string
-        bit_str = self.int_list_to_bitstring(encoded_vals)
-
-        # 6) code length'i başa ekle
-        bit_str = self.add_codelength_info(bit_str)
-
-        # 7) padding
-        padded_bits = self.pad_bitstring(bit_str)
-
-        # 8) .bin dosyasına width/height ve bit data
-        header = bytearray()
-        header.append(width & 0xFF)
-        header.append((width >> 8) & 0xFF)
-        header.append(height & 0xFF)
-        header.append((height >> 8) & 0xFF)
-
-        bit_data = self.bitstring_to_bytearray(padded_bits)
-
-        final_data = header + bit_data
-
-        with open(output_path, "wb") as f:
-            f.write(final_data)
+        prof = self.profiler
+        with prof:
+            # 1) resmi oku (BMP/PGM/PPM: mmap görünümü, diğerleri PIL)
+            with prof.stage("read", os.path.getsize(input_path)) as st:
+                np_img = read_image(input_path, "RGB")
+                h, w = np_img.shape[:2]
+                st["bytes_out"] = np_img.nbytes
+            with open(output_path, "wb") as f:
+                compressed_size = self._compress_array(np_img, f)
 
         # Bilgi
         uncompressed_size = w*h*3
-        compressed_size = len(final_data)
         ratio = uncompressed_size / compressed_size if compressed_size>0 else 1.0
         print(f"{input_file} -> {output_file} (Color + Diff + LZW) sıkıştırma ok.")
         print(f"Orijinal boyut (byte): {uncompressed_size}")
         print(f"Sıkıştırılmış boyut: {compressed_size}")
         print(f"Sıkıştırma Oranı: {ratio:.2f}")
-        print(f"Codelength: {self.codelength} bit")
+        print(f"Codelength: {self.codelength} bit" if self.codelength else "Codelength: sabit (blok başına)")
 
         return output_path
 
     # --------------------------------------------------------------------------
-    # decompress_image_file
+    # Bellek içi API: dosya yerine dizi / bytes
     # --------------------------------------------------------------------------
-    def decompress_image_file(self):
-        current_dir = os.path.dirname(os.path.realpath(__file__))
-        input_file = self.filename + "_color_diff.bin"
-        input_path = os.path.join(current_dir, input_file)
-
-        output_file = self.filename + "_color_diff_decompressed.bmp"
-        output_path = os.path.join(current_dir, output_file)
-
-        # 1) .bin'i oku
-        with open(input_path, "rb") as f:
-            raw = f.read()
+    def compress_array(self, image):
+        """
+        (H, W, 3) uint8 RGB dizi -> .bin içeriği (bytes); dosya okunmaz/yazılmaz.
+        """
+        np_img = np.asarray(image, dtype=np.uint8)
+        if np_img.ndim != 3 or np_img.shape[2] != 3:
+            raise ValueError(f"Resim (H, W, 3) olmalı! Bulduk: {np_img.shape}")
+        out = io.BytesIO()
+        with self.profiler:
+            self._compress_array(np_img, out)
+        return out.getvalue()
+
+    def decompress_to_array(self, data):
+        """
+        .bin içeriği (bytes, bytearray veya memoryview) -> (H, W, 3) uint8 dizi.
+        """
+        data = memoryview(data).cast("B")
+        if is_container(data):
+            # 2-5) boyutlar ve tahmin edici başlıkta: ortak decoder
+            return decode_container(data, self.workers)
 
-        if len(raw) < 4:
+        # Eski .bin dosyaları: [2 byte width][2 byte height][kod verisi]
+        if len(data) < 4:
             raise ValueError("Geçersiz dosya! width/height byte yok.")
 
-        width = raw[0] | (raw[1]<<8)
-        height = raw[2] | (raw[3]<<8)
+        width = data[0] | (data[1]<<8)
+        height = data[2] | (data[3]<<8)
 
-        bit_data = raw[4:]  # geri kalan bit verisi
+        bit_data = data[4:]  # geri kalan bit verisi
 
-        # byte -> bit string
-        bit_str = ""
-        for b in bit_data:
-            bit_str += bin(b)[2:].rjust(8, '0')
-
-        # 2) remove padding
-        bit_str = self.remove_padding(bit_str)
-
-        # 3) code length'i al
-        bit_str = self.extract_codelength_info(bit_str)
-
-        # 4) bit string -> integer list
-        encoded_vals = self.bitstring_to_int_list(bit_str)
+        # boyutlar başlıkta: merged_diff için tampon önceden ayrılır,
+        # LZW cümleleri doğrudan bu tampona kopyalanır
+        size = width * height
+        merged_diff = np.empty(size*3, dtype=np.uint8)
+        if is_variable_stream(bit_data):
+            # 2-3) değişken genişlikli akış -> merged_diff
+            count = decode_variable_into(bit_data, merged_diff)
+        else:
+            # 2) byte -> kod dizisi (padding ve code length burada çözülür)
+            codes, self.codelength = bytes_to_codes(bit_data)
 
-        # 5) decode -> merged_diff (R_diff + G_diff + B_diff)
-        merged_diff = self.lzw_decode(encoded_vals)
+            # 3) decode -> merged_diff (R_diff + G_diff + B_diff)
+            count = decode_fixed_into(codes, merged_diff)
 
-        # 6) Ayır => R_diff, G_diff, B_diff
-        size = width * height
-        if len(merged_diff) != size*3:
-            raise ValueError(f"Fark verisi boyutu uymuyor! Beklenen: {size*3}, bulduk: {len(merged_diff)}")
+        # 4) Ayır => R_diff, G_diff, B_diff (kopyasız görünümler)
+        if count != size*3:
+            raise ValueError(f"Fark verisi boyutu uymuyor! Beklenen: {size*3}, bulduk: {count}")
 
         R_diff = merged_diff[:size]
         G_diff = merged_diff[size:2*size]
         B_diff = merged_diff[2*size:3*size]
 
-        # 7) farklardan orijinal R, G, B'yi reconstruct
-        R_orig = self.reconstruct_from_diff(R_diff, width, height)
-        G_orig = self.reconstruct_from_diff(G_diff, width, height)
-        B_orig = self.reconstruct_from_diff(B_diff, width, height)
+        # 5) fark kanallarını (H, W, 3) olarak birleştir,
+        #    orijinal R, G, B'yi üç kanal birden reconstruct et
+        diff_rgb = combine_rgb_channels(R_diff, G_diff, B_diff, width, height)
+        return row_reconstruct(diff_rgb)
+
+    def _compress_array(self, image, dst):
+        """
+        compress_image_file'ın 2-5. adımları: api.compress_array ile aynı kodlayıcı
+        (lzw_common.container.write_image_container; aşamalar self.profiler'da ölçülür).
+        dst: seek edilebilir binary dosya (açık dosya veya io.BytesIO)
+        Return: yazılan byte sayısı
+        """
+        compressed_size, self.codelength = write_image_container(
+            dst, image, self.LEVEL, self.max_code_width,
+            predictor=self.predictor, zigzag=self.zigzag, tile=self.tile, tile_size=self.tile_size,
+            channel_streams=self.channel_streams, workers=self.workers, strip_rows=self.strip_rows,
+            dict_policy=self.dict_policy, seed=self.seed, entropy=self.entropy,
+            color_transform=self.color_transform, scan=self.scan, profiler=self.profiler)
+        return compressed_size
+
+    # --------------------------------------------------------------------------
+    # decompress_image_file
+    # --------------------------------------------------------------------------
+    def decompress_image_file(self):
+        current_dir = os.path.dirname(os.path.realpath(__file__))
+        input_file = self.filename + "_color_diff.bin"
+        input_path = os.path.join(current_dir, input_file)
 
-        # 8) birleştir => renkli resim => bmp yaz
-        rgb = combine_rgb_channels(np.array(R_orig), np.array(G_orig), np.array(B_orig), width, height)
-        write_image_color(rgb, output_path)
+        output_file = self.filename + "_color_diff_decompressed.bmp"
+        output_path = os.path.join(current_dir, output_file)
+
+        prof = self.profiler
+        with open(input_path, "rb") as f:
+            head = f.read(HEADER_SIZE)
+            if (len(head) == HEADER_SIZE and is_container(head)
+                    and read_container_header(head)["layout"] == LAYOUT_TILED):
+                # şeritli / karolu dosya: mmap'ten şerit şerit çöz ve yaz
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw, prof:
+                    with prof.stage("decode+write", len(raw)) as st:
+                        w, h = decode_to_file(raw, output_path, self.workers)
+                        st["bytes_out"] = w * h * 3
+                print(f"{input_file} -> {output_file} (Color+Diff) decompress tamam.")
+                return output_path
+
+            # 1) .bin'i oku
+            with prof.stage("read") as st:
+                f.seek(0)
+                raw = f.read()
+                st["bytes_out"] = len(raw)
+
+        # 2-5) çöz (konteyner ya da eski format) ve renkli resmi bmp olarak yaz
+        with prof:
+            with prof.stage("decode", len(raw)) as st:
+                rgb = self.decompress_to_array(raw)
+                st["bytes_out"] = rgb.nbytes
+            with prof.stage("write", rgb.nbytes):
+                write_image(output_path, rgb)
 
         print(f"{input_file} -> {output_file} (Color+Diff) decompress tamam.")
         return output_path
 
+    # --------------------------------------------------------------------------
+    # decode_region: sadece bir dikdörtgeni çöz (karolu dosyalar)
+    # --------------------------------------------------------------------------
+    def decode_region(self, x, y, w, h):
+        """
+        filename_color_diff.bin içinden yalnızca (x, y, w, h) bölgesini çözer.
+        Dosya tile_size ile (karolu) sıkıştırılmış olmalı; sadece bölgeyle
+        kesişen karolar okunup çözülür.
+        Return: (h, w, 3) uint8 dizi
+        """
+        current_dir = os.path.dirname(os.path.realpath(__file__))
+        input_path = os.path.join(current_dir, self.filename + "_color_diff.bin")
+        return decode_region(input_path, x, y, w, h, self.workers or 1)
+
     # --------------------------------------------------------------------------
     # FARK (DIFFERENCE) FONKSİYONLARI
     # --------------------------------------------------------------------------
@@ -152,23 +270,10 @@ class LZWColorDiffCoding:
         Satır bazında fark:
           - her satırın ilk pikseli => diff=orijinal
           - sonrakiler => (cur - left) % 256
+        (NumPy ile tek seferde, lzw_common.transform.row_difference)
         """
-        channel_array = channel_array.astype(np.uint8)
-
-        diff = np.zeros_like(channel_array, dtype=np.uint8)
-        for row in range(height):
-            row_start = row * width
-            # ilk piksel
-            diff[row_start] = channel_array[row_start]
-            # geri kalanlar
-            for col in range(1, width):
-                idx = row_start + col
-                left = int(channel_array[idx - 1])
-                cur = int(channel_array[idx])
-                d = (cur - left) % 256
-                diff[idx] = np.uint8(d)
-
-        return diff
+        channel_2d = np.asarray(channel_array, dtype=np.uint8).reshape((height, width))
+        return row_difference(channel_2d).ravel()
 
     def reconstruct_from_diff(self, diff_array, width, height):
         """
@@ -177,120 +282,19 @@ class LZWColorDiffCoding:
          - sonrakiler => (left_original + diff) % 256
         Return: 1D array (uint8)
         """
-        rec = np.zeros_like(diff_array, dtype=np.uint8)
-        for row in range(height):
-            row_start = row * width
-            rec[row_start] = diff_array[row_start]
-            for col in range(1, width):
-                idx = row_start + col
-                left_original = int(rec[idx - 1])
-                diff_val = int(diff_array[idx])
-                val = (left_original + diff_val) % 256
-                rec[idx] = np.uint8(val)
-
-        return rec
+        diff_2d = np.asarray(diff_array, dtype=np.uint8).reshape((height, width))
+        return row_reconstruct(diff_2d).ravel()
 
     # --------------------------------------------------------------------------
     # LZW encode/decode
     # --------------------------------------------------------------------------
     def lzw_encode(self, arr_1d):
-        dict_size = 256
-        dictionary = {chr(i): i for i in range(dict_size)}
-
-        w = ""
-        result = []
-        for val in arr_1d:
-            c = chr(val)
-            wc = w + c
-            if wc in dictionary:
-                w = wc
-            else:
-                result.append(dictionary[w])
-                dictionary[wc] = dict_size
-                dict_size += 1
-                w = c
-
-        if w != "":
-            result.append(dictionary[w])
-
+        """
+        Sözlük (prefix_code, sembol) tamsayı çiftleriyle tutulur (lzw_common.lzw).
+        """
+        encoded_result, dict_size = encode_fixed(arr_1d)
         self.codelength = max(8, math.ceil(math.log2(dict_size)))
-        return result
+        return encoded_result
 
     def lzw_decode(self, encoded):
-        dict_size = 256
-        dictionary = {i: chr(i) for i in range(dict_size)}
-
-        if not encoded:
-            return []
-
-        w = chr(encoded.pop(0))
-        out_chars = [w]
-
-        for code in encoded:
-            if code in dictionary:
-                entry = dictionary[code]
-            elif code == dict_size:
-                entry = w + w[0]
-            else:
-                raise ValueError(f"Geçersiz LZW code: {code}")
-            out_chars.append(entry)
-            dictionary[dict_size] = w + entry[0]
-            dict_size += 1
-            w = entry
-
-        result_integers = []
-        for chunk in out_chars:
-            for ch in chunk:
-                result_integers.append(ord(ch))
-        return result_integers
-
-    # --------------------------------------------------------------------------
-    # Bit string <-> int list, codelength & padding
-    # --------------------------------------------------------------------------
-    def int_list_to_bitstring(self, int_list):
-        bits = ""
-        for num in int_list:
-            bits += format(num, f"0{self.codelength}b")
-        return bits
-
-    def add_codelength_info(self, bitstr):
-        codelen_str = format(self.codelength, '08b')
-        return codelen_str + bitstr
-
-    def pad_bitstring(self, bitstr):
-        extra = (8 - len(bitstr) % 8) % 8
-        bitstr += "0" * extra
-        pad_info = format(extra, '08b')
-        return pad_info + bitstr
-
-    def bitstring_to_bytearray(self, padded_bits):
-        if len(padded_bits) % 8 != 0:
-            raise ValueError("bitstring 8'e bölünemiyor.")
-        ba = bytearray()
-        for i in range(0, len(padded_bits), 8):
-            chunk = padded_bits[i:i+8]
-            ba.append(int(chunk, 2))
-        return ba
-
-    def remove_padding(self, total_bits):
-        padding_info = total_bits[:8]
-        extra = int(padding_info, 2)
-        bit_string = total_bits[8:]
-        if extra>0:
-            bit_string = bit_string[:-extra]
-        return bit_string
-
-    def extract_codelength_info(self, bitstr):
-        codelen_str = bitstr[:8]
-        self.codelength = int(codelen_str, 2)
-        return bitstr[8:]
-
-    def bitstring_to_int_list(self, bitstr):
-        ints = []
-        for i in range(0, len(bitstr), self.codelength):
-            chunk = bitstr[i:i+self.codelength]
-            if len(chunk)<self.codelength:
-                break
-            val = int(chunk, 2)
-            ints.append(val)
-        return ints
+        return decode_fixed(encoded)
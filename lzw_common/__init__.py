@@ -0,0 +1,97 @@
+# File: __init__.py
+"""
+Tüm seviyelerin (Level 1-5) ortak kullandığı yardımcı modüller.
+
+Seviye klasörleri bu paketi, kendi klasörlerinin bir üst dizinini
+sys.path'e ekleyerek import eder.
+
+Alt modüller tembel (lazy) yüklenir: `from lzw_common import X` yalnızca
+X'in tanımlı olduğu modülü import eder. Böylece `python -m lzw_common.stream`
+(.batch, .container, .seed) komut satırları, paket import edilirken
+kendi modüllerini önceden yüklemiş olmaz (runpy uyarısı çıkmaz) ve
+küçük bir yardımcı için tüm paket yüklenmez.
+"""
+
+import importlib
+
+# dışa açılan isim -> tanımlandığı alt modül
+_EXPORTS = {
+    "BitWriter": "bitio",
+    "BitReader": "bitio",
+    "codes_to_bytes": "bitio",
+    "bytes_to_codes": "bitio",
+    "LZWCompressor": "lzw",
+    "LZWDecompressor": "lzw",
+    "encode_fixed": "lzw",
+    "decode_fixed": "lzw",
+    "encode_variable": "lzw",
+    "decode_variable": "lzw",
+    "decode_fixed_into": "lzw",
+    "decode_variable_into": "lzw",
+    "decode_codes_into": "lzw",
+    "width_for_budget": "lzw",
+    "dictionary_width": "lzw",
+    "POLICIES": "lzw",
+    "iter_compress": "stream",
+    "iter_decompress": "stream",
+    "compress_stream": "stream",
+    "decompress_stream": "stream",
+    "entropy_encode": "entropy",
+    "decode_stream_into": "entropy",
+    "huffman_encode": "entropy",
+    "huffman_decode": "entropy",
+    "ENTROPY_CODERS": "entropy",
+    "forward_color": "color",
+    "inverse_color": "color",
+    "COLOR_TRANSFORMS": "color",
+    "scan_permutation": "scan",
+    "clear_scan_cache": "scan",
+    "scan_symbols": "scan",
+    "unscan_symbols": "scan",
+    "SCAN_ORDERS": "scan",
+    "PREDICTORS": "predictors",
+    "encode_residuals": "predictors",
+    "decode_residuals": "predictors",
+    "compress_tiled": "tiles",
+    "decompress_tiled": "tiles",
+    "read_tile_index": "tiles",
+    "compress_channels": "channels",
+    "decompress_channels": "channels",
+    "write_container": "container",
+    "write_image_container": "container",
+    "write_strips": "container",
+    "read_container": "container",
+    "decode_container": "container",
+    "decode_file": "container",
+    "decode_to_file": "container",
+    "decode_region": "container",
+    "Profiler": "profiling",
+    "NullProfiler": "profiling",
+    "aggregate": "profiling",
+    "compress_array": "api",
+    "decompress_to_array": "api",
+    "compress_bytes": "api",
+    "decompress_bytes": "api",
+    "read_image": "imageio",
+    "write_image": "imageio",
+    "ImageWriter": "imageio",
+    "SeedDictionary": "seed",
+    "load_seed": "seed",
+    "train_seed": "seed",
+    "train_images": "seed",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # sonraki erişimler doğrudan
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,76 @@
+# File: api.py
+"""
+Dosya sistemine dokunmayan bellek içi API (tüm seviyeler).
+
+    compress_array(image, level, ...)  -> .bin içeriği (bytes)     Level 2-5
+    decompress_to_array(data)          -> (H, W) / (H, W, 3) dizi  Level 2-5
+    compress_bytes(data, ...)          -> .bin içeriği (bytes)     Level 1
+    decompress_bytes(data)             -> orijinal byte'lar        Level 1
+
+Çıktılar seviye sınıflarının yazdığı .bin dosyalarıyla byte byte aynıdır;
+girdi olarak bytes, bytearray, memoryview (veya buffer destekleyen herhangi
+bir nesne) verilebilir, veri kopyalanmadan okunur.
+"""
+
+import math
+
+from .bitio import codes_to_bytes, bytes_to_codes
+from .lzw import (
+    encode_fixed,
+    decode_fixed,
+    encode_variable,
+    decode_variable,
+    is_variable_stream,
+    dictionary_width,
+    DEFAULT_MAX_CODE_WIDTH,
+    POLICY_RESET
+)
+from .container import encode_image, decode_container
+
+
+def compress_array(image, level, max_code_width=None, **options):
+    """
+    image: Level 2/3 için (H, W), Level 4/5 için (H, W, 3) uint8 dizi
+    options: encode_image'e geçirilir (predictor, zigzag, tile, tile_size,
+    channel_streams, workers, strip_rows, dict_policy, memory_budget, seed, entropy,
+    color_transform, scan)
+    Return: konteynerin tamamı (bytes)
+    """
+    return encode_image(image, level, max_code_width, **options)
+
+
+def decompress_to_array(data, workers=None):
+    """
+    Level 2-5 konteynerini çözer (seviye, boyutlar ve mod başlıktan okunur).
+    Return: (H, W) veya (H, W, 3) uint8 dizi
+    """
+    return decode_container(memoryview(data).cast("B"), workers)
+
+
+def compress_bytes(data, max_code_width=DEFAULT_MAX_CODE_WIDTH, dict_policy=POLICY_RESET,
+                   memory_budget=None):
+    """
+    Level 1 formatında sıkıştırır. str verilirse UTF-8 ile kodlanır.
+    max_code_width: None => sabit codelength, aksi halde değişken genişlik
+    dict_policy / memory_budget: container.encode_image'deki gibi
+    Return: .bin içeriği (bytes)
+    """
+    max_code_width = dictionary_width(max_code_width, dict_policy, memory_budget)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    data = memoryview(data).cast("B")
+    if max_code_width is None:
+        codes, dict_size = encode_fixed(data)
+        return codes_to_bytes(codes, math.ceil(math.log2(dict_size)))
+    return encode_variable(data, max_code_width, policy=dict_policy)
+
+
+def decompress_bytes(data):
+    """
+    compress_bytes (veya Level 1 .bin dosyası) içeriğini çözer.
+    Return: bytes
+    """
+    data = memoryview(data).cast("B")
+    if is_variable_stream(data):
+        return bytes(decode_variable(data))
+    return bytes(decode_fixed(bytes_to_codes(data)[0].tolist()))
@@ -0,0 +1,344 @@
+# File: batch.py
+"""
+Toplu (batch) sıkıştırma: klasörler / glob desenleri içindeki tüm dosyaları
+seçilen seviyeyle sıkıştırır, dosyaları süreç havuzuna dağıtır, güncel
+çıktıları atlar ve dosya başına + toplam MB/s, oran ve hata raporu verir.
+
+Kullanım (depo kök dizininden):
+    python -m lzw_common.batch -l 5 -o out/ resimler/ "taramalar/**/*.bmp"
+    python -m lzw_common.batch -l 1 -o out/ loglar/ --pattern "*.log"
+    python -m lzw_common.batch -l 3 -o out/ resimler/ --dict-policy lru --memory-budget 1M
+
+Çıktı isimleri seviye sınıflarıyla aynıdır (ör. Level 5: ad_color_diff.bin).
+Klasör olarak verilen girdilerin alt klasör yapısı çıktı klasöründe korunur;
+glob desenlerinde yol, desenin joker içermeyen baş kısmına göre korunur
+("taramalar/**/*.bmp" => taramalar/ altındaki yapı). İki girdi aynı çıktıya
+düşerse hiçbir iş başlatılmadan hata verilir.
+
+Çıktısı girdisinden yeni olan dosyalar atlanır. Karar yalnızca değiştirilme
+tarihlerine bakar: seçenekler (seviye dışında -w, --predictor, --tile-size ...)
+değiştirildikten sonra eski çıktıları yeniden üretmek için --force gerekir.
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .lzw import dictionary_width, DEFAULT_MAX_CODE_WIDTH, POLICY_RESET, POLICIES
+from .entropy import ENTROPY_CODERS, ENTROPY_NONE
+from .color import COLOR_TRANSFORMS, COLOR_NONE
+from .scan import SCAN_ORDERS, SCAN_ROW_MAJOR
+from .container import encode_image, write_strips, LEVELS
+from .api import compress_bytes
+from .imageio import read_image
+from .profiling import Profiler, aggregate, format_stages
+
+# seviye -> çıktı dosyası eki (seviye sınıflarıyla aynı)
+OUTPUT_SUFFIXES = {
+    1: ".bin",
+    2: ".bin",
+    3: "_diff.bin",
+    4: "_color.bin",
+    5: "_color_diff.bin",
+}
+DEFAULT_PATTERNS = {1: "*.txt"}
+DEFAULT_PATTERN = "*.bmp"
+
+
+def glob_root(pattern):
+    """
+    Glob deseninin joker içermeyen baş klasörü ("a/b/**/*.bmp" => "a/b", "*.bmp" => ".").
+    """
+    root = os.path.dirname(pattern)
+    while glob.has_magic(root):
+        root = os.path.dirname(root)
+    return root or "."
+
+
+def collect_jobs(inputs, output_dir, level, pattern=None, unique_outputs=True):
+    """
+    Girdi klasörlerini / glob desenlerini / dosyaları (girdi, çıktı) çiftlerine açar.
+    output_dir None ise çıktı girdinin yanına yazılır.
+    unique_outputs: iki girdi aynı çıktı dosyasına düşerse ValueError (paralel
+    işler aynı dosyanın üzerine yazmasın diye, hiçbir iş başlamadan)
+    """
+    pattern = pattern or DEFAULT_PATTERNS.get(level, DEFAULT_PATTERN)
+    suffix = OUTPUT_SUFFIXES[level]
+    pairs = []
+    seen = set()
+    outputs = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            root = item
+            paths = glob.glob(os.path.join(item, "**", pattern), recursive=True)
+        elif glob.has_magic(item):
+            root = glob_root(item)
+            paths = glob.glob(item, recursive=True)
+        else:
+            root = None
+            paths = [item]
+        for src in sorted(paths):
+            key = os.path.realpath(src)
+            if key in seen or not os.path.isfile(src):
+                continue
+            seen.add(key)
+            stem = os.path.splitext(os.path.relpath(src, root) if root else os.path.basename(src))[0]
+            if output_dir is None:
+                dst = os.path.splitext(src)[0] + suffix
+            else:
+                dst = os.path.join(output_dir, stem + suffix)
+            other = outputs.setdefault(os.path.normcase(os.path.realpath(dst)), src)
+            if unique_outputs and other != src:
+                raise ValueError(f"{other} ve {src} aynı çıktıya yazılacaktı: {dst}")
+            pairs.append((src, dst))
+    return pairs
+
+
+def is_up_to_date(src, dst):
+    """
+    Çıktı var ve girdiden yeni mi (yalnızca tarihler; sıkıştırma seçenekleri karşılaştırılmaz).
+    """
+    return os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src)
+
+
+def compress_file(src, dst, level, max_code_width=DEFAULT_MAX_CODE_WIDTH, profiler=None, **options):
+    """
+    Tek bir dosyayı sıkıştırıp dst'ye yazar (önce geçici dosya, sonra os.replace).
+    profiler: verilirse read / encode / write aşamaları ölçülür (lzw_common.profiling)
+    options: encode_image'e geçirilir (predictor, zigzag, tile_size, channel_streams,
+    strip_rows, dict_policy, memory_budget, seed, entropy, color_transform, scan; Level 1 için yalnızca
+    dict_policy ve memory_budget);
+    strip_rows verilirse resim şerit şerit kodlanıp doğrudan dosyaya yazılır
+    Return: (okunan byte, yazılan byte)
+    """
+    prof = profiler if profiler is not None else Profiler()
+    if level != 1 and options.get("strip_rows") is not None:
+        return _compress_strips(src, dst, level, max_code_width, prof, **options)
+    with prof:
+        if level == 1:
+            with prof.stage("read", os.path.getsize(src)) as st:
+                with open(src, "rb") as f:
+                    data = f.read()
+                st["bytes_out"] = size_in = len(data)
+            with prof.stage("encode", size_in) as st:
+                payload = compress_bytes(data, max_code_width, **options)
+                st["bytes_out"] = len(payload)
+        else:
+            channels = LEVELS[level][0]
+            with prof.stage("read", os.path.getsize(src)) as st:
+                image = read_image(src, "L" if channels == 1 else "RGB")
+                st["bytes_out"] = size_in = image.size
+            with prof.stage("encode", size_in) as st:
+                payload = encode_image(image, level, max_code_width, workers=1, **options)
+                st["bytes_out"] = len(payload)
+
+        with prof.stage("write", len(payload)) as st:
+            os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+            tmp = dst + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, dst)
+            st["bytes_out"] = len(payload)
+    return size_in, len(payload)
+
+
+def _compress_strips(src, dst, level, max_code_width, prof, strip_rows, predictor=None,
+                     zigzag=False, tile_size=None, channel_streams=False, dict_policy=POLICY_RESET,
+                     memory_budget=None, seed=None, entropy=ENTROPY_NONE, color_transform=COLOR_NONE,
+                     scan=SCAN_ROW_MAJOR):
+    """
+    compress_file'ın out-of-core hali: kodlanan şeritler bellekte biriktirilmeden
+    geçici dosyaya yazılır (aşamalar: read / encode+write).
+    """
+    if channel_streams or tile_size is not None:
+        raise ValueError("channel_streams, tile_size ve strip_rows birlikte kullanılamaz!")
+    channels = LEVELS[level][0]
+    max_code_width = dictionary_width(max_code_width, dict_policy, memory_budget, seed)
+    with prof:
+        with prof.stage("read", os.path.getsize(src)) as st:
+            image = read_image(src, "L" if channels == 1 else "RGB")
+            st["bytes_out"] = size_in = image.size
+        with prof.stage("encode+write", size_in) as st:
+            os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+            tmp = dst + ".tmp"
+            with open(tmp, "wb") as f:
+                size_out = write_strips(f, image, level, strip_rows, max_code_width,
+                                        predictor, zigzag, workers=1, dict_policy=dict_policy, seed=seed,
+                                        entropy=entropy, color_transform=color_transform, scan=scan)
+            os.replace(tmp, dst)
+            st["bytes_out"] = size_out
+    return size_in, size_out
+
+
+def _run_job(job):
+    """
+    Süreç havuzu için: hataları yakalayıp sonuç dict'i döndürür.
+    """
+    src, dst, level, trace_memory, options = job
+    result = {"input": src, "output": dst, "status": "ok",
+              "bytes_in": 0, "bytes_out": 0, "seconds": 0.0, "error": None, "stages": []}
+    prof = Profiler(trace_memory=trace_memory)
+    start = time.perf_counter()
+    try:
+        result["bytes_in"], result["bytes_out"] = compress_file(src, dst, level, profiler=prof, **options)
+    except Exception as exc:  # bir dosyanın hatası tüm işi durdurmasın
+        result["status"] = "failed"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["seconds"] = time.perf_counter() - start
+    result["stages"] = prof.report()["stages"]
+    return result
+
+
+def run_batch(pairs, level, jobs=None, force=False, callback=None, trace_memory=False, **options):
+    """
+    (girdi, çıktı) çiftlerini süreç havuzunda sıkıştırır.
+    callback: her dosya bittiğinde sonuç dict'i ile çağrılır
+    (sonuçtaki "stages": dosyanın aşama ölçümleri, trace_memory ise tepe bellek dahil)
+    Return: sonuç dict'lerinin listesi (tamamlanma sırasıyla)
+    """
+    results = []
+
+    def done(result):
+        results.append(result)
+        if callback is not None:
+            callback(result)
+
+    todo = []
+    for src, dst in pairs:
+        if not force and is_up_to_date(src, dst):
+            done({"input": src, "output": dst, "status": "skipped",
+                  "bytes_in": 0, "bytes_out": 0, "seconds": 0.0, "error": None, "stages": []})
+        else:
+            todo.append((src, dst, level, trace_memory, options))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(todo) <= 1:
+        for job in todo:
+            done(_run_job(job))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as executor:
+            for future in as_completed([executor.submit(_run_job, job) for job in todo]):
+                done(future.result())
+    return results
+
+
+def summarize(results, wall_seconds):
+    """
+    Return: toplam istatistikler (dict); "stages": aşama bazında toplamlar
+    """
+    ok = [r for r in results if r["status"] == "ok"]
+    bytes_in = sum(r["bytes_in"] for r in ok)
+    bytes_out = sum(r["bytes_out"] for r in ok)
+    return {
+        "files": len(results),
+        "ok": len(ok),
+        "skipped": sum(r["status"] == "skipped" for r in results),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "ratio": bytes_in / bytes_out if bytes_out else 0.0,
+        "wall_seconds": wall_seconds,
+        "mb_per_s": bytes_in / 1e6 / wall_seconds if wall_seconds > 0 else 0.0,
+        "stages": aggregate(r["stages"] for r in ok),
+    }
+
+
+def print_result(result):
+    if result["status"] == "ok":
+        ratio = result["bytes_in"] / result["bytes_out"] if result["bytes_out"] else 0.0
+        speed = result["bytes_in"] / 1e6 / result["seconds"] if result["seconds"] > 0 else 0.0
+        print(f"OK      {result['input']} -> {result['output']}  "
+              f"{result['bytes_in']:,d} -> {result['bytes_out']:,d} bytes  "
+              f"oran {ratio:.2f}  {speed:.2f} MB/s")
+    elif result["status"] == "skipped":
+        print(f"ATLANDI {result['input']} (çıktı güncel)")
+    else:
+        print(f"HATA    {result['input']}: {result['error']}")
+    sys.stdout.flush()
+
+
+def parse_size(text):
+    """
+    "4096", "512K", "4M", "1G" -> byte sayısı
+    """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Klasör / glob bazında toplu LZW sıkıştırma")
+    parser.add_argument("inputs", nargs="+", help="klasörler, glob desenleri veya dosyalar")
+    parser.add_argument("-l", "--level", type=int, required=True, choices=sorted(OUTPUT_SUFFIXES),
+                        help="seviye (1: metin, 2-5: resim)")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="çıktı klasörü (verilmezse girdinin yanına)")
+    parser.add_argument("-p", "--pattern", default=None,
+                        help="klasörlerde aranacak desen (varsayılan: Level 1 *.txt, diğerleri *.bmp)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("-w", "--max-code-width", type=int, default=DEFAULT_MAX_CODE_WIDTH,
+                        help="en büyük kod genişliği (bit)")
+    parser.add_argument("--fixed", action="store_true", help="sabit codelength (eski format)")
+    parser.add_argument("--dict-policy", choices=POLICIES, default=POLICY_RESET,
+                        help="sözlük dolunca: reset (CLEAR), ratio (oran düşünce CLEAR), lru (en eskiyi çıkar)")
+    parser.add_argument("--memory-budget", type=parse_size, default=None,
+                        help="sözlük bellek bütçesi (ör. 512K, 4M); -w yerine sözlük boyutunu belirler")
+    parser.add_argument("--predictor", default=None, help="Level 2-5 tahmin edicisi (ör. med, adaptive)")
+    parser.add_argument("--zigzag", action="store_true", help="artıkları zigzag ile numarala")
+    parser.add_argument("--tile-size", type=int, default=None, help="karolu konteyner, karo kenarı")
+    parser.add_argument("--channel-streams", action="store_true", help="Level 4/5: kanal başına akış")
+    parser.add_argument("--strip-rows", type=int, default=None,
+                        help="out-of-core: bu kadar satırlık şeritlerle oku / kodla / yaz")
+    parser.add_argument("--seed", default=None,
+                        help="Level 2-5: tohum sözlük dosyası (python -m lzw_common.seed train)")
+    parser.add_argument("--entropy", choices=ENTROPY_CODERS, default=ENTROPY_NONE,
+                        help="Level 2-5: LZW kodlarından sonra entropi kodlama (huffman)")
+    parser.add_argument("--color-transform", choices=COLOR_TRANSFORMS, default=COLOR_NONE,
+                        help="Level 4/5: tahminden önce kayıpsız renk dönüşümü (ycocg-r, rct)")
+    parser.add_argument("--scan", choices=SCAN_ORDERS, default=SCAN_ROW_MAJOR,
+                        help="Level 2-5: artıkların LZW'ye veriliş sırası (ör. hilbert, interleaved)")
+    parser.add_argument("-f", "--force", action="store_true", help="güncel çıktıları da yeniden üret (atlama yalnızca tarihlere bakar; "
+                             "seçenekler değiştiyse gerekir)")
+    parser.add_argument("--profile", action="store_true", help="aşama bazında süre / byte tablosu yazdır")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="aşama başına tepe bellek (tracemalloc, yavaşlatır)")
+    args = parser.parse_args(argv)
+
+    options = {"max_code_width": None if args.fixed else args.max_code_width,
+               "dict_policy": args.dict_policy, "memory_budget": args.memory_budget}
+    if args.level != 1:
+        options.update(predictor=args.predictor, zigzag=args.zigzag,
+                       tile_size=args.tile_size, channel_streams=args.channel_streams,
+                       strip_rows=args.strip_rows, seed=args.seed, entropy=args.entropy,
+                       color_transform=args.color_transform, scan=args.scan)
+
+    try:
+        pairs = collect_jobs(args.inputs, args.output_dir, args.level, args.pattern)
+    except ValueError as e:
+        print(f"HATA: {e}")
+        return 1
+    if not pairs:
+        print("Girdi dosyası bulunamadı!")
+        return 1
+
+    start = time.perf_counter()
+    results = run_batch(pairs, args.level, args.jobs, args.force, print_result,
+                        args.trace_memory, **options)
+    total = summarize(results, time.perf_counter() - start)
+
+    print(f"\nToplam: {total['files']} dosya, {total['ok']} sıkıştırıldı, "
+          f"{total['skipped']} atlandı, {total['failed']} hata")
+    print(f"Boyut : {total['bytes_in']:,d} -> {total['bytes_out']:,d} bytes (oran {total['ratio']:.2f})")
+    print(f"Süre  : {total['wall_seconds']:.2f} s, {total['mb_per_s']:.2f} MB/s")
+    if args.profile or args.trace_memory:
+        print("\n" + format_stages(total["stages"]))
+    return 1 if total["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
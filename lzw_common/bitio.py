@@ -0,0 +1,220 @@
+# File: bitio.py
+"""
+LZW kodlarını paketlenmiş (binary) bit akışı olarak yazma/okuma.
+
+Eski sürümlerde kodlar önce '0'/'1' karakterlerinden oluşan bir str'ye
+çevriliyordu (bit başına 8+ byte RAM). Buradaki sınıflar bitleri doğrudan
+bytearray / uint8 buffer içine paketler. Bit sırası MSB-first'tür, yani
+üretilen byte'lar eski bitstring formatıyla birebir aynıdır.
+"""
+
+import numpy as np
+
+# vektörel paketleme/açma sırasında tek seferde işlenecek kod sayısı
+# (geçici bit dizilerinin belleğini sınırlı tutmak için)
+CHUNK_CODES = 1 << 16
+
+
+def _code_bits(codes, widths):
+    """
+    Kodları, her biri kendi genişliğinde (MSB-first) bit dizisine açar.
+    codes : 1D tamsayı dizisi
+    widths: tek bir int ya da codes ile aynı boyda genişlik dizisi
+    Return: uint8 bit dizisi (her eleman 0 veya 1)
+    """
+    codes = np.asarray(codes, dtype=np.uint64)
+    if np.isscalar(widths):
+        shifts = np.arange(widths - 1, -1, -1, dtype=np.uint64)
+        return ((codes[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+
+    widths = np.asarray(widths, dtype=np.int64)
+    # her bitin hangi koda ait olduğu ve kod içindeki kaydırma miktarı
+    code_index = np.repeat(np.arange(len(codes)), widths)
+    ends = np.cumsum(widths)
+    shifts = ends[code_index] - 1 - np.arange(int(ends[-1]) if len(ends) else 0)
+    return ((codes[code_index] >> shifts.astype(np.uint64)) & 1).astype(np.uint8)
+
+
+class BitWriter:
+    """
+    Kodları bit bit bytearray'e yazan yazıcı.
+    Tam dolan byte'lar buffer'a eklenir, 8'den az kalan bitler
+    akümülatörde bekler (flush ile sıfırlarla tamamlanır).
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._acc = 0      # henüz byte'a dönüşmemiş bitler
+        self._nbits = 0    # akümülatördeki bit sayısı (0..7)
+
+    def write(self, code, width):
+        """
+        Tek bir kodu `width` bit olarak yazar.
+        """
+        self._acc = (self._acc << width) | code
+        self._nbits += width
+        if self._nbits >= 8:
+            nbytes = self._nbits >> 3
+            self._nbits &= 7
+            self.buffer += (self._acc >> self._nbits).to_bytes(nbytes, 'big')
+            self._acc &= (1 << self._nbits) - 1
+
+    def write_codes(self, codes, widths):
+        """
+        Bir kod dizisini NumPy ile vektörel olarak paketler.
+        widths: sabit genişlik (int) ya da kod başına genişlik dizisi.
+        """
+        codes = np.asarray(codes)
+        scalar = np.isscalar(widths)
+        for start in range(0, len(codes), CHUNK_CODES):
+            chunk = codes[start:start + CHUNK_CODES]
+            w = widths if scalar else widths[start:start + CHUNK_CODES]
+            bits = _code_bits(chunk, w)
+            if self._nbits:
+                # akümülatörde bekleyen bitleri başa ekle
+                pending = _code_bits([self._acc], self._nbits)
+                bits = np.concatenate([pending, bits])
+            usable = len(bits) - (len(bits) & 7)
+            self.buffer += np.packbits(bits[:usable]).tobytes()
+            rest = bits[usable:]
+            self._nbits = len(rest)
+            self._acc = 0
+            for bit in rest:
+                self._acc = (self._acc << 1) | int(bit)
+
+    def bit_count(self):
+        """
+        Şu ana kadar yazılan toplam bit sayısı.
+        """
+        return len(self.buffer) * 8 + self._nbits
+
+    def take_bytes(self):
+        """
+        Tamamlanmış byte'ları döndürür ve buffer'dan siler
+        (akış halinde çıktı üretmek için).
+        """
+        out = bytes(self.buffer)
+        self.buffer = bytearray()
+        return out
+
+    def flush(self):
+        """
+        Bekleyen bitleri sıfırlarla 8'e tamamlar.
+        Return: eklenen padding bit sayısı
+        """
+        extra = (8 - self._nbits) % 8
+        if self._nbits:
+            self.write(0, extra)
+        return extra
+
+    def getvalue(self):
+        return bytes(self.buffer)
+
+
+class BitReader:
+    """
+    bytes / bytearray / memoryview üzerinden MSB-first kod okuyucu.
+    bit_length verilirse sondaki padding bitleri okunmaz.
+    Akış halinde okumak için boş veriyle oluşturulup feed() ile beslenebilir.
+    """
+
+    def __init__(self, data=b"", bit_length=None):
+        self.data = memoryview(data).cast('B')
+        self.bit_length = len(self.data) * 8 if bit_length is None else bit_length
+        self._pos = 0      # okunacak sıradaki byte
+        self._acc = 0
+        self._nbits = 0
+
+    def bits_left(self):
+        return self.bit_length - (self._pos * 8 - self._nbits)
+
+    def feed(self, data):
+        """
+        Okunacak verinin sonuna yeni byte'lar ekler.
+        Okunmuş byte'lar atılır; padding kırpma (bit_length) kullanılmaz.
+        """
+        self.data = memoryview(bytes(self.data[self._pos:]) + bytes(data))
+        self.bit_length = len(self.data) * 8
+        self._pos = 0
+
+    def unread_bytes(self):
+        """
+        Hiç dokunulmamış byte'lar (yarım okunan byte'ın kalan bitleri hariç).
+        """
+        return bytes(self.data[self._pos:])
+
+    def read(self, width):
+        """
+        Tek bir `width` bitlik kod okur. Veri biterse None döner.
+        """
+        if self.bits_left() < width:
+            return None
+        while self._nbits < width:
+            self._acc = (self._acc << 8) | self.data[self._pos]
+            self._pos += 1
+            self._nbits += 8
+        self._nbits -= width
+        code = self._acc >> self._nbits
+        self._acc &= (1 << self._nbits) - 1
+        return code
+
+    def read_codes(self, width, count=None):
+        """
+        Sabit genişlikli kodları vektörel olarak okur.
+        count None ise kalan tüm (tam) kodlar okunur.
+        Return: int64 numpy dizisi
+        """
+        available = self.bits_left() // width
+        count = available if count is None else min(count, available)
+        weights = np.left_shift(1, np.arange(width - 1, -1, -1, dtype=np.int64))
+        parts = []
+        remaining = count
+        while remaining > 0:
+            n = min(remaining, CHUNK_CODES)
+            need = n * width - self._nbits
+            nbytes = (need + 7) >> 3
+            raw = np.frombuffer(self.data[self._pos:self._pos + nbytes], dtype=np.uint8)
+            bits = np.unpackbits(raw)
+            if self._nbits:
+                bits = np.concatenate([_code_bits([self._acc], self._nbits), bits])
+            self._pos += nbytes
+            used = n * width
+            parts.append(bits[:used].reshape(n, width).astype(np.int64) @ weights)
+            # kullanılmayan bitleri akümülatöre geri koy
+            self._nbits = len(bits) - used
+            self._acc = 0
+            for bit in bits[used:]:
+                self._acc = (self._acc << 1) | int(bit)
+            remaining -= n
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+
+# ------------------------------------------------------------------------------
+# Level 1-5 .bin formatı: [padding byte][codelength byte][kodlar][0 padding]
+# ------------------------------------------------------------------------------
+def codes_to_bytes(codes, codelength):
+    """
+    Sabit `codelength` bitlik kod listesini, padding ve code length bilgisiyle
+    birlikte .bin içeriğine (bytes) çevirir.
+    """
+    writer = BitWriter()
+    writer.write(codelength, 8)
+    writer.write_codes(codes, codelength)
+    extra = writer.flush()
+    return bytes([extra]) + writer.getvalue()
+
+
+def bytes_to_codes(data):
+    """
+    codes_to_bytes ile üretilmiş içeriği çözer.
+    Return: (int64 kod dizisi, codelength)
+    """
+    if len(data) < 2:
+        raise ValueError("Sıkıştırılmış veri çok kısa!")
+    extra = data[0]
+    codelength = data[1]
+    payload = memoryview(data)[2:]
+    reader = BitReader(payload, len(payload) * 8 - extra)
+    return reader.read_codes(codelength), codelength
@@ -0,0 +1,169 @@
+# File: blocks.py
+"""
+Bağımsız kodlanan bloklar (karo, kanal ...) ve bunların süreç havuzunda
+paralel işlenmesi.
+
+Bir blok verisi: [predictor başlığı (lzw_common.predictors)][LZW akışı]
+(LZW akışı isteğe bağlı olarak entropi kodlu olabilir, lzw_common.entropy).
+Her blok kendi sözlüğünü kullanır ve tek başına çözülebilir. Çok kanallı
+bloklarda kanallar ardışık (planar) kodlanır; artıklar LZW'ye bloğun tarama
+sırasıyla verilir (lzw_common.scan, predictor başlığında saklanır).
+"""
+
+import os
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .bitio import codes_to_bytes
+from .lzw import (
+    encode_fixed,
+    encode_variable,
+    dictionary_width,
+    DEFAULT_MAX_CODE_WIDTH,
+    POLICY_RESET
+)
+from .stream import iter_compress, iter_array_chunks
+from .entropy import entropy_encode, decode_stream_into, check_entropy, ENTROPY_NONE
+from .predictors import encode_residuals, decode_residuals, pack_header, unpack_header
+from .scan import scan_symbols, unscan_symbols, SCAN_ROW_MAJOR
+
+
+def run_jobs(func, jobs, workers=None):
+    """
+    jobs'u func ile işler; workers 1'den büyükse ProcessPoolExecutor ile.
+    workers None => os.cpu_count(). func modül seviyesinde tanımlı olmalı (pickle).
+    Return: sonuç listesi (jobs ile aynı sırada)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        return [func(job) for job in jobs]
+    workers = min(workers, len(jobs))
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, jobs, chunksize=chunksize))
+
+
+def iter_jobs(func, jobs, workers=None, window=None):
+    """
+    run_jobs'un tembel hali: jobs bir üreteç olabilir, sonuçlar aynı sırayla
+    yield edilir. Aynı anda en fazla window iş (varsayılan 2 x workers)
+    bekler; tüm işler / sonuçlar bellekte tutulmaz.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for job in jobs:
+            yield func(job)
+        return
+    window = window or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(func, job))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def block_symbols(block, predictor="none", zigzag=False, tile=(1, 0), scan=SCAN_ROW_MAJOR):
+    """
+    Bloğun LZW'ye verilen sembolleri: tahmin artıkları, çok kanallıysa
+    kanallar ardışık (planar), scan sırasında.
+    Return: (semboller 1D uint8 dizi, adaptive seçimi)
+    """
+    residual, selection = encode_residuals(block, predictor, zigzag, tile)
+    if residual.ndim == 3:
+        residual = np.moveaxis(residual, -1, 0)
+    residual = np.ascontiguousarray(residual)
+    return scan_symbols(residual, residual.shape, scan), selection
+
+
+def fixed_code_width(dict_size):
+    """
+    Sabit genişlikli akışın codelength'i: sözlüğü kapsayan bit sayısı, en az 8.
+    """
+    return max(8, math.ceil(math.log2(dict_size)))
+
+
+def encode_fixed_symbols(symbols, entropy=ENTROPY_NONE):
+    """
+    block_symbols çıktısını sabit genişlikli LZW (ve entropi) akışına kodlar.
+    Return: (akış bytes, codelength)
+    """
+    codes, dict_size = encode_fixed(symbols)
+    codelength = fixed_code_width(dict_size)
+    return entropy_encode(codes_to_bytes(codes, codelength), entropy), codelength
+
+
+def iter_encode_symbols(symbols, max_code_width=DEFAULT_MAX_CODE_WIDTH, dict_policy=POLICY_RESET, seed=None,
+                        entropy=ENTROPY_NONE):
+    """
+    block_symbols çıktısını LZW (ve isteğe bağlı entropi) akışına kodlar.
+    Değişken genişlikte ve entropi yokken çıktı parçaları üretildikçe verilir;
+    sabit genişlik ve entropi tüm kodları gerektirdiği için tek parça döner.
+    """
+    if max_code_width is None:
+        yield encode_fixed_symbols(symbols, entropy)[0]
+    elif entropy != ENTROPY_NONE:
+        yield entropy_encode(encode_variable(symbols, max_code_width, policy=dict_policy, seed=seed), entropy)
+    else:
+        yield from iter_compress(iter_array_chunks(symbols), max_code_width, policy=dict_policy, seed=seed)
+
+
+def encode_block(block, predictor="none", zigzag=False,
+                 max_code_width=DEFAULT_MAX_CODE_WIDTH, tile=(1, 0), dict_policy=POLICY_RESET, seed=None,
+                 entropy=ENTROPY_NONE, scan=SCAN_ROW_MAJOR):
+    """
+    block: (h, w) veya (h, w, C) uint8
+    max_code_width: None => sabit codelength, aksi halde değişken genişlik
+    dict_policy: sözlük politikası (lzw.POLICIES), yalnızca değişken genişlikte
+    seed: tohum sözlük (lzw_common.seed), yalnızca değişken genişlikte
+    entropy: LZW kodlarından sonra entropi kodlayıcı (lzw_common.entropy)
+    scan: artıkların LZW'ye veriliş sırası (lzw_common.scan)
+    Return: blok verisi (bytes)
+    """
+    dictionary_width(max_code_width, dict_policy, seed=seed)
+    check_entropy(entropy)
+    symbols, selection = block_symbols(block, predictor, zigzag, tile, scan)
+    header = pack_header(block.shape[1], block.shape[0], predictor, zigzag, tile, selection, scan)
+    return header + b"".join(iter_encode_symbols(symbols, max_code_width, dict_policy, seed, entropy))
+
+
+def decode_block(payload, channels=1):
+    """
+    encode_block çıktısını çözer.
+    Return: (h, w) veya (h, w, C) uint8 dizi
+    """
+    fields, offset = unpack_header(payload)
+    data = memoryview(payload).cast("B")[offset:]
+    height, width = fields["height"], fields["width"]
+    # çıktı boyu başlıktan belli: cümleler doğrudan bu tampona kopyalanır
+    residual = np.empty(width * height * channels, dtype=np.uint8)
+    count = decode_stream_into(data, residual)
+
+    if count != residual.size:
+        raise ValueError(f"Blok boyutu uymuyor! Beklenen: {residual.size}, bulduk: {count}")
+    residual = unscan_symbols(residual, (channels, height, width), fields["scan"])
+    if channels > 1:
+        residual = residual.reshape(channels, height, width).transpose(1, 2, 0)
+    else:
+        residual = residual.reshape(height, width)
+    return decode_residuals(residual, fields["predictor"], fields["zigzag"],
+                            fields["tile"], fields["selection"])
+
+
+def encode_block_job(job):
+    """
+    run_jobs için: job = encode_block argümanları (tuple)
+    """
+    return encode_block(*job)
+
+
+def decode_block_job(job):
+    """
+    run_jobs için: job = (blok verisi, kanal sayısı)
+    """
+    return decode_block(*job)
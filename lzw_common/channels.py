@@ -0,0 +1,99 @@
+# File: channels.py
+"""
+Kanal başına bağımsız akışlar: her renk kanalı kendi sözlüğüyle ayrı bir
+blok (lzw_common.blocks) olarak kodlanır. Kanallar birbirinden bağımsız
+olduğu için paralel kodlanır/çözülür ve her kanal tek başına açılabilir.
+Ortak sözlükte R, G ve B'nin birbirine karışması da önlenir.
+
+Dosya düzeni (little-endian):
+    [b"LZWC"][version u8][channels u8][width u32][height u32]
+    channels x [length u64]                     <- kanal bölümlerinin boyları
+    kanal bölümleri (R, G, B ...)
+"""
+
+import struct
+
+import numpy as np
+
+from .lzw import DEFAULT_MAX_CODE_WIDTH, POLICY_RESET
+from .entropy import ENTROPY_NONE
+from .scan import SCAN_ROW_MAJOR
+from .blocks import run_jobs, encode_block_job, decode_block_job
+
+CHANNEL_MAGIC = b"LZWC"
+CHANNEL_VERSION = 1
+
+_HEADER = struct.Struct("<4sBBII")
+_LENGTH = struct.Struct("<Q")
+
+
+def is_channel_container(data):
+    return bytes(data[:len(CHANNEL_MAGIC)]) == CHANNEL_MAGIC
+
+
+def compress_channels(image, max_code_width=DEFAULT_MAX_CODE_WIDTH, predictor="none",
+                      zigzag=False, tile=(1, 0), workers=None, dict_policy=POLICY_RESET, seed=None,
+                      entropy=ENTROPY_NONE, scan=SCAN_ROW_MAJOR):
+    """
+    image: (H, W, C) uint8
+    Her kanal ayrı süreçte kodlanır (workers None => os.cpu_count()).
+    Return: konteynerin tamamı (bytes)
+    """
+    image = np.asarray(image, dtype=np.uint8)
+    if image.ndim != 3:
+        raise ValueError("Resim (H, W, C) olmalı!")
+    height, width, channels = image.shape
+    jobs = [(np.ascontiguousarray(image[:, :, c]), predictor, zigzag, max_code_width, tile, dict_policy,
+             seed, entropy, scan)
+            for c in range(channels)]
+    sections = run_jobs(encode_block_job, jobs, workers)
+
+    header = _HEADER.pack(CHANNEL_MAGIC, CHANNEL_VERSION, channels, width, height)
+    lengths = b"".join(_LENGTH.pack(len(section)) for section in sections)
+    return b"".join([header, lengths] + sections)
+
+
+def read_channel_index(data):
+    """
+    Return: (bilgi dict'i, [(offset, length), ...] kanal bölümleri)
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Kanal konteyneri çok kısa!")
+    magic, version, channels, width, height = _HEADER.unpack_from(data)
+    if magic != CHANNEL_MAGIC:
+        raise ValueError("Kanal konteyneri değil!")
+    if version != CHANNEL_VERSION:
+        raise ValueError(f"Desteklenmeyen konteyner sürümü: {version}")
+    info = {"channels": channels, "width": width, "height": height}
+
+    offset = _HEADER.size + _LENGTH.size * channels
+    sections = []
+    for c in range(channels):
+        (length,) = _LENGTH.unpack_from(data, _HEADER.size + c * _LENGTH.size)
+        sections.append((offset, length))
+        offset += length
+    if offset > len(data):
+        raise ValueError("Kanal verisi eksik!")
+    return info, sections
+
+
+def decompress_channels(data, workers=None, channels=None):
+    """
+    compress_channels çıktısını çözer; kanallar paralel.
+    channels: yalnızca çözülecek kanal indeksleri (None => hepsi)
+    Return: (H, W, k) uint8 dizi (k = çözülen kanal sayısı)
+    """
+    data = memoryview(data).cast("B")
+    info, sections = read_channel_index(data)
+    wanted = range(info["channels"]) if channels is None else channels
+    jobs = []
+    for c in wanted:
+        if not 0 <= c < info["channels"]:
+            raise ValueError(f"Geçersiz kanal: {c}")
+        offset, length = sections[c]
+        jobs.append((bytes(data[offset:offset + length]), 1))
+    planes = run_jobs(decode_block_job, jobs, workers)
+    for plane in planes:
+        if plane.shape != (info["height"], info["width"]):
+            raise ValueError("Kanal boyutu başlıkla uyuşmuyor!")
+    return np.stack(planes, axis=2)
@@ -0,0 +1,128 @@
+# File: color.py
+"""
+Renkli seviyeler (Level 4/5) için kayıpsız (tersinir) tam sayı renk dönüşümleri.
+
+R, G ve B doğal resimlerde birbirine çok benzer; ayrı ayrı tahmin edilip
+kodlandıklarında aynı yapı üç kez sözlüğe girer. Dönüşüm, tahminden önce
+(H, W, 3) dizide uygulanır ve bir parlaklık ile iki renk farkı düzlemi
+üretir; renk farkı düzlemleri çoğunlukla 0 civarında olduğu için LZW
+daha uzun eşleşmeler bulur. Açarken tahmin geri alındıktan sonra tersi
+uygulanır.
+
+    "none"    : dönüşüm yok
+    "ycocg-r" : YCoCg-R (lifting)        Co = R - B, t = B + (Co >> 1),
+                                         Cg = G - t, Y = t + (Cg >> 1)
+    "rct"     : JPEG 2000 RCT            Cb = B - G, Cr = R - G,
+                                         Y = G + ((Cb + Cr) >> 2)
+
+Çıktı düzlemleri (Y, Co, Cg) / (Y, Cb, Cr) sırasıyla kanal 0, 1, 2'dedir.
+Fark düzlemleri 9 bit yerine mod 256 (işaretli int8 olarak yorumlanıp)
+saklanır: her lifting adımı mod 256'da da birebir olduğu için dönüşüm
+uint8 -> uint8 kayıpsızdır ve geri kalan boru hattı değişmez
+(|R - B| > 127 gibi nadir piksellerde değer sarmalanır, yalnızca oran etkilenir).
+
+Dönüşüm piksel bazlı olduğu için şeritlere, karolara ve bölgelere ayrı
+ayrı uygulanabilir. Seçim konteyner başlığının flags byte'ında saklanır
+(lzw_common.container).
+"""
+
+import numpy as np
+
+COLOR_NONE = "none"
+COLOR_YCOCG_R = "ycocg-r"
+COLOR_RCT = "rct"
+
+# id = sıra (konteyner başlığına yazılır)
+COLOR_TRANSFORMS = (COLOR_NONE, COLOR_YCOCG_R, COLOR_RCT)
+
+# geçici int16 dizileri sınırlı kalsın diye tek seferde işlenen piksel sayısı
+CHUNK_PIXELS = 1 << 20
+
+
+def check_color_transform(transform):
+    """
+    Return: transform (geçerliyse)
+    """
+    if transform not in COLOR_TRANSFORMS:
+        raise ValueError(f"Bilinmeyen renk dönüşümü: {transform!r} "
+                         f"(seçenekler: {', '.join(COLOR_TRANSFORMS)})")
+    return transform
+
+
+def color_transform_name(transform_id):
+    """
+    Başlıktaki id -> isim.
+    """
+    if transform_id >= len(COLOR_TRANSFORMS):
+        raise ValueError(f"Bilinmeyen renk dönüşümü id'si: {transform_id}")
+    return COLOR_TRANSFORMS[transform_id]
+
+
+def _signed(x):
+    """
+    int16 dizi -> mod 256 işaretli temsilci [-128, 127]
+    """
+    return ((x + 128) & 0xFF) - 128
+
+
+def _forward(rgb, transform):
+    r, g, b = (rgb[..., i].astype(np.int16) for i in range(3))
+    if transform == COLOR_YCOCG_R:
+        co = _signed(r - b)
+        t = b + (co >> 1)
+        cg = _signed(g - t)
+        return t + (cg >> 1), co, cg
+    cb = _signed(b - g)
+    cr = _signed(r - g)
+    return g + ((cb + cr) >> 2), cb, cr
+
+
+def _inverse(planes, transform):
+    y = planes[..., 0].astype(np.int16)
+    c1, c2 = (_signed(planes[..., i].astype(np.int16)) for i in (1, 2))
+    if transform == COLOR_YCOCG_R:
+        # c1 = Co, c2 = Cg
+        t = y - (c2 >> 1)
+        g = c2 + t
+        b = t - (c1 >> 1)
+        return b + c1, g, b
+    # c1 = Cb, c2 = Cr
+    g = y - ((c1 + c2) >> 2)
+    return c2 + g, g, c1 + g
+
+
+def _apply(image, transform, out, func):
+    image = np.asarray(image)
+    if image.ndim != 3 or image.shape[2] != 3:
+        raise ValueError(f"Renk dönüşümü (H, W, 3) dizi ister, bulduk: {image.shape}")
+    if out is None:
+        out = np.empty(image.shape, dtype=np.uint8)
+    height, width = image.shape[:2]
+    band = max(1, CHUNK_PIXELS // max(width, 1))
+    for start in range(0, height, band):
+        planes = func(image[start:start + band], transform)
+        # tüm düzlemler okunduktan sonra yazılır: out is image de güvenli
+        for i, plane in enumerate(planes):
+            out[start:start + band, :, i] = plane & 0xFF
+    return out
+
+
+def forward_color(image, transform, out=None):
+    """
+    image: (H, W, 3) uint8 RGB (salt okunur mmap görünümü olabilir)
+    out: verilirse sonuç buraya yazılır (image'in kendisi de olabilir)
+    Return: (H, W, 3) uint8 dönüştürülmüş düzlemler ("none" => image)
+    """
+    if check_color_transform(transform) == COLOR_NONE:
+        return image
+    return _apply(image, transform, out, _forward)
+
+
+def inverse_color(image, transform, out=None):
+    """
+    forward_color'ın tersi.
+    Return: (H, W, 3) uint8 RGB ("none" => image)
+    """
+    if check_color_transform(transform) == COLOR_NONE:
+        return image
+    return _apply(image, transform, out, _inverse)
@@ -0,0 +1,437 @@
+# File: container.py
+"""
+Tüm resim seviyeleri (Level 2-5) için ortak, sürümlü ve kendini tanımlayan
+.bin formatı. Boyutlar, kanal sayısı, tahmin edici ve kod genişliği
+başlıkta saklandığı için açarken hiçbir şey tahmin edilmez; tek bir
+decoder (decode_container) başlığa bakarak doğru yolu seçer.
+
+Başlık (little-endian, 31 byte):
+    [b"LZWI"][version u8][level u8][layout u8][predictor id u8][flags u8]
+    [channels u8][width u32][height u32][code width u8][payload length u64]
+    [payload crc32 u32]
+code width: 0 => sabit codelength, aksi halde değişken genişlik (en büyük bit)
+flags: bit 0 zigzag, bit 1-2 entropi kodlayıcı id'si (lzw_common.entropy;
+0 => yok; blok akışları kendilerini ayrıca tanımlar, küçük bloklar ham kalabilir),
+bit 3-4 renk dönüşümü id'si (lzw_common.color; 0 => yok, yalnızca 3 kanalda),
+bit 5-7 tarama sırası id'si (lzw_common.scan; 0 => row-major; her blok kendi
+sırasını predictor başlığında da taşır).
+Renk dönüşümü piksel bazlı olduğu için tahminden önce tüm resme (şerit modunda
+şerit şerit) uygulanır, tersi de çözülen resme / şeride / bölgeye uygulanır.
+
+layout:
+    LAYOUT_SINGLE   : veri tek blok (lzw_common.blocks: predictor başlığı + LZW akışı),
+                      çok kanallıysa kanallar ardışık (planar)
+    LAYOUT_TILED    : veri bir karolu konteyner (lzw_common.tiles; kare karolar ya da
+                      strip_rows ile out-of-core yatay şeritler)
+    LAYOUT_CHANNELS : veri kanal başına akış konteyneri (lzw_common.channels)
+
+Komut satırı (herhangi bir seviyenin .bin dosyasını resme çevirir):
+    python -m lzw_common.container girdi.bin cikti.bmp
+"""
+
+import io
+import sys
+import mmap
+import itertools
+import zlib
+import struct
+import argparse
+
+import numpy as np
+
+from .lzw import dictionary_width, load_seed, POLICY_RESET
+from .predictors import predictor_id, pack_header, PREDICTOR_NAMES, ADAPTIVE, ADAPTIVE_ID
+from .entropy import check_entropy, entropy_name, ENTROPY_CODERS, ENTROPY_NONE
+from .color import (
+    forward_color,
+    inverse_color,
+    check_color_transform,
+    color_transform_name,
+    COLOR_TRANSFORMS,
+    COLOR_NONE
+)
+from .scan import check_scan_order, scan_order_name, SCAN_ORDERS, SCAN_ROW_MAJOR
+from .blocks import block_symbols, encode_fixed_symbols, iter_encode_symbols, decode_block
+from .tiles import (
+    compress_tiled,
+    iter_compress_strips,
+    decompress_tiled,
+    decode_tiled_region,
+    iter_tiled_strips,
+    is_tiled
+)
+from .channels import compress_channels, decompress_channels
+from .imageio import ImageWriter, write_image
+from .profiling import NullProfiler
+
+CONTAINER_MAGIC = b"LZWI"
+CONTAINER_VERSION = 1
+
+LAYOUT_SINGLE = 0
+LAYOUT_TILED = 1
+LAYOUT_CHANNELS = 2
+
+FLAG_ZIGZAG = 0x01
+FLAG_ENTROPY_SHIFT = 1
+FLAG_ENTROPY_MASK = 0x06
+FLAG_COLOR_SHIFT = 3
+FLAG_COLOR_MASK = 0x18
+FLAG_SCAN_SHIFT = 5
+FLAG_SCAN_MASK = 0xE0
+
+# seviye -> (kanal sayısı, varsayılan tahmin edici)
+LEVELS = {
+    2: (1, "none"),
+    3: (1, "left"),
+    4: (3, "none"),
+    5: (3, "left"),
+}
+
+_HEADER = struct.Struct("<4sBBBBBBIIBQI")
+HEADER_SIZE = _HEADER.size
+
+
+def is_container(data):
+    return bytes(data[:len(CONTAINER_MAGIC)]) == CONTAINER_MAGIC
+
+
+def pack_container_header(level, layout, width, height, channels, predictor="none",
+                          zigzag=False, max_code_width=None, payload_length=0, checksum=0,
+                          entropy=ENTROPY_NONE, color_transform=COLOR_NONE, scan=SCAN_ROW_MAJOR):
+    """
+    Return: başlık byte'ları
+    """
+    if not (0 <= width < 1 << 32 and 0 <= height < 1 << 32):
+        raise ValueError("width/height 32 bite sığmıyor!")
+    if check_color_transform(color_transform) != COLOR_NONE and channels != 3:
+        raise ValueError("Renk dönüşümü yalnızca renkli seviyelerde (4/5) kullanılır!")
+    flags = FLAG_ZIGZAG if zigzag else 0
+    flags |= ENTROPY_CODERS.index(check_entropy(entropy)) << FLAG_ENTROPY_SHIFT
+    flags |= COLOR_TRANSFORMS.index(color_transform) << FLAG_COLOR_SHIFT
+    flags |= SCAN_ORDERS.index(check_scan_order(scan)) << FLAG_SCAN_SHIFT
+    return _HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, level, layout,
+                        predictor_id(predictor), flags, channels, width, height,
+                        max_code_width or 0, payload_length, checksum)
+
+
+def read_container_header(data):
+    """
+    Yalnızca başlığı okur (veriye / checksum'a dokunmaz).
+    Return: alanlar dict'i
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Konteyner başlığı eksik!")
+    (magic, version, level, layout, pid, flags, channels, width, height,
+     code_width, length, checksum) = _HEADER.unpack_from(data)
+    if magic != CONTAINER_MAGIC:
+        raise ValueError("LZW konteyneri değil!")
+    if version != CONTAINER_VERSION:
+        raise ValueError(f"Desteklenmeyen konteyner sürümü: {version}")
+    if layout not in (LAYOUT_SINGLE, LAYOUT_TILED, LAYOUT_CHANNELS):
+        raise ValueError(f"Bilinmeyen layout: {layout}")
+    return {
+        "level": level,
+        "layout": layout,
+        "predictor": ADAPTIVE if pid == ADAPTIVE_ID else PREDICTOR_NAMES[pid],
+        "zigzag": bool(flags & FLAG_ZIGZAG),
+        "entropy": entropy_name((flags & FLAG_ENTROPY_MASK) >> FLAG_ENTROPY_SHIFT),
+        "color_transform": color_transform_name((flags & FLAG_COLOR_MASK) >> FLAG_COLOR_SHIFT),
+        "scan": scan_order_name((flags & FLAG_SCAN_MASK) >> FLAG_SCAN_SHIFT),
+        "channels": channels,
+        "width": width,
+        "height": height,
+        "max_code_width": code_width or None,
+        "payload_length": length,
+        "checksum": checksum,
+    }
+
+
+def read_container(data):
+    """
+    Başlığı okur, veri uzunluğunu ve crc32'yi doğrular.
+    Return: (alanlar dict'i, veri memoryview'u)
+    """
+    data = memoryview(data).cast("B")
+    fields = read_container_header(data)
+    payload = data[HEADER_SIZE:HEADER_SIZE + fields["payload_length"]]
+    if len(payload) != fields["payload_length"]:
+        raise ValueError("Konteyner verisi eksik!")
+    if zlib.crc32(payload) != fields["checksum"]:
+        raise ValueError("Checksum uyuşmuyor, dosya bozuk!")
+    return fields, payload
+
+
+def write_container(dst, chunks, level, layout, width, height, channels, predictor="none",
+                    zigzag=False, max_code_width=None, entropy=ENTROPY_NONE, color_transform=COLOR_NONE,
+                    scan=SCAN_ROW_MAJOR):
+    """
+    Başlığı ve chunks'tan gelen veriyi dst'ye (seek edilebilir binary dosya)
+    yazar. Veri akış halinde yazılır; uzunluk ve crc32 yazım sırasında
+    hesaplanıp sonunda başlığa işlenir.
+    Return: yazılan toplam byte sayısı
+    """
+    start = dst.tell()
+    args = (level, layout, width, height, channels, predictor, zigzag, max_code_width)
+    options = {"entropy": entropy, "color_transform": color_transform, "scan": scan}
+    dst.write(pack_container_header(*args, **options))
+    length = 0
+    checksum = 0
+    for chunk in chunks:
+        dst.write(chunk)
+        length += len(chunk)
+        checksum = zlib.crc32(chunk, checksum)
+    end = dst.tell()
+    dst.seek(start)
+    dst.write(pack_container_header(*args, length, checksum, **options))
+    dst.seek(end)
+    return HEADER_SIZE + length
+
+
+def encode_image(image, level, max_code_width=None, predictor=None, zigzag=False, tile=(1, 0),
+                 tile_size=None, channel_streams=False, workers=None, strip_rows=None,
+                 dict_policy=POLICY_RESET, memory_budget=None, seed=None, entropy=ENTROPY_NONE,
+                 color_transform=COLOR_NONE, scan=SCAN_ROW_MAJOR):
+    """
+    Level 2-5 sınıflarının yazdığı .bin içeriğini bellekte üretir.
+    image: Level 2/3 için (H, W), Level 4/5 için (H, W, 3) uint8
+    predictor: None => seviyenin varsayılanı (2/4: none, 3/5: left)
+    strip_rows: verilirse resim bu kadar satırlık şeritler halinde kodlanır
+    (lzw_common.tiles.iter_compress_strips; dosyaya akış için write_strips)
+    dict_policy: sözlük politikası (lzw.POLICIES, akışın ilk byte'ında saklanır)
+    memory_budget: verilirse max_code_width, sözlük bu kadar byte'a sığacak
+    şekilde seçilir (lzw.width_for_budget; her blok / süreç için ayrı)
+    seed: tohum sözlük (lzw_common.seed; SeedDictionary, artefakt yolu veya id),
+    id'si her LZW akışının başlığında saklanır
+    entropy: LZW kodlarından sonra entropi kodlayıcı (lzw_common.entropy),
+    konteyner başlığının flags byte'ında saklanır
+    color_transform: tahminden önce uygulanan renk dönüşümü (lzw_common.color,
+    yalnızca Level 4/5), konteyner başlığının flags byte'ında saklanır
+    scan: artıkların LZW'ye veriliş sırası (lzw_common.scan), blok ve
+    konteyner başlıklarında saklanır
+    Return: konteynerin tamamı (bytes)
+    """
+    out = io.BytesIO()
+    write_image_container(out, image, level, max_code_width, predictor, zigzag, tile, tile_size,
+                          channel_streams, workers, strip_rows, dict_policy, memory_budget, seed,
+                          entropy, color_transform, scan)
+    return out.getvalue()
+
+
+def write_image_container(dst, image, level, max_code_width=None, predictor=None, zigzag=False,
+                          tile=(1, 0), tile_size=None, channel_streams=False, workers=None,
+                          strip_rows=None, dict_policy=POLICY_RESET, memory_budget=None, seed=None,
+                          entropy=ENTROPY_NONE, color_transform=COLOR_NONE, scan=SCAN_ROW_MAJOR,
+                          profiler=None):
+    """
+    encode_image'in dosyaya yazan hali; seviye sınıfları da bunu kullanır.
+    dst: seek edilebilir binary dosya (açık dosya veya io.BytesIO)
+    Parametreler encode_image'deki gibi. Tek blokta (LAYOUT_SINGLE) değişken
+    genişlikli LZW çıktısı üretildikçe dst'ye yazılır.
+    profiler: verilirse aşamalar (color / predict / lzw / encode / lzw+write / write,
+    şeritlerde encode+write) lzw_common.profiling.Profiler'a kaydedilir
+    Return: (yazılan toplam byte sayısı, kod genişliği)
+    kod genişliği: değişken genişlikte max_code_width, sabit genişlikte tek
+    blokta akışın codelength'i; karo / şerit / kanal bloklarında sabit genişlik
+    blok başına ayrı seçildiği için None
+    """
+    max_code_width = dictionary_width(max_code_width, dict_policy, memory_budget, seed)
+    check_entropy(entropy)
+    check_color_transform(color_transform)
+    check_scan_order(scan)
+    if level not in LEVELS:
+        raise ValueError(f"Geçersiz seviye: {level} (2-5 olmalı)")
+    channels, default_predictor = LEVELS[level]
+    image = np.asarray(image, dtype=np.uint8)
+    if (image.ndim == 2) != (channels == 1) or (image.ndim == 3 and image.shape[2] != channels):
+        raise ValueError(f"Level {level} için resim şekli uygun değil: {image.shape}")
+    predictor = default_predictor if predictor is None else predictor
+    height, width = image.shape[:2]
+    prof = profiler if profiler is not None else NullProfiler()
+
+    if sum((bool(channel_streams), tile_size is not None, strip_rows is not None)) > 1:
+        raise ValueError("channel_streams, tile_size ve strip_rows birlikte kullanılamaz!")
+    if color_transform != COLOR_NONE and channels == 1:
+        raise ValueError("Renk dönüşümü yalnızca renkli seviyelerde (4/5) kullanılır!")
+    if channel_streams and channels == 1:
+        raise ValueError("channel_streams yalnızca renkli seviyelerde (4/5) kullanılır!")
+
+    if strip_rows is not None:
+        # şerit oku -> (renk) -> tahmin -> LZW -> yaz, şerit şerit
+        with prof.stage("encode+write", image.nbytes) as st:
+            st["bytes_out"] = write_strips(dst, image, level, strip_rows, max_code_width, predictor,
+                                           zigzag, workers, dict_policy, seed, entropy, color_transform,
+                                           scan)
+        return st["bytes_out"], max_code_width
+    if color_transform != COLOR_NONE:
+        with prof.stage("color", image.nbytes) as st:
+            image = forward_color(image, color_transform)
+            st["bytes_out"] = image.nbytes
+    if channel_streams or tile_size is not None:
+        # bağımsız bloklar, süreç havuzunda paralel kodlanır
+        with prof.stage("encode", image.nbytes) as st:
+            if channel_streams:
+                layout = LAYOUT_CHANNELS
+                payload = compress_channels(image, max_code_width, predictor, zigzag, tile, workers,
+                                            dict_policy, seed, entropy, scan)
+            else:
+                layout = LAYOUT_TILED
+                payload = compress_tiled(image, tile_size, max_code_width, predictor, zigzag, workers,
+                                         dict_policy, seed, entropy, scan)
+            st["bytes_out"] = len(payload)
+        chunks, stage = [payload], "write"
+        code_width = max_code_width
+    else:
+        layout = LAYOUT_SINGLE
+        with prof.stage("predict", image.nbytes) as st:
+            symbols, selection = block_symbols(image, predictor, zigzag, tile, scan)
+            st["bytes_out"] = symbols.nbytes
+        header = pack_header(width, height, predictor, zigzag, tile, selection, scan)
+        if max_code_width is None:
+            # sabit genişlik: codelength tüm kodlar çıkınca belli olur
+            with prof.stage("lzw", symbols.nbytes) as st:
+                stream, code_width = encode_fixed_symbols(symbols, entropy)
+                st["bytes_out"] = len(stream)
+            chunks, stage = [header + stream], "write"
+        else:
+            # LZW (ve entropi) akış halinde: yazımla aynı aşamada ölçülür
+            chunks = itertools.chain([header], iter_encode_symbols(symbols, max_code_width, dict_policy,
+                                                                   seed, entropy))
+            stage, code_width = "lzw+write", max_code_width
+
+    with prof.stage(stage, image.nbytes if stage == "lzw+write" else len(chunks[0])) as st:
+        st["bytes_out"] = write_container(dst, chunks, level, layout, width, height, channels,
+                                          predictor, zigzag, max_code_width, entropy, color_transform,
+                                          scan)
+    return st["bytes_out"], code_width
+
+
+def write_strips(dst, image, level, strip_rows, max_code_width=None, predictor=None,
+                 zigzag=False, workers=None, dict_policy=POLICY_RESET, seed=None, entropy=ENTROPY_NONE,
+                 color_transform=COLOR_NONE, scan=SCAN_ROW_MAJOR):
+    """
+    Out-of-core sıkıştırma: image (ör. imageio.read_image'in mmap görünümü)
+    strip_rows satırlık şeritler halinde okunur, kodlanır ve kodlandıkça dst'ye
+    (seek edilebilir binary dosya) yazılır; resmin tamamı belleğe alınmaz.
+    color_transform her şeride ayrı uygulanır.
+    Açarken iter_decode_strips / decode_to_file şerit şerit çözer.
+    Return: yazılan toplam byte sayısı
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Geçersiz seviye: {level} (2-5 olmalı)")
+    channels, default_predictor = LEVELS[level]
+    if (image.ndim == 2) != (channels == 1) or (image.ndim == 3 and image.shape[2] != channels):
+        raise ValueError(f"Level {level} için resim şekli uygun değil: {image.shape}")
+    predictor = default_predictor if predictor is None else predictor
+    height, width = image.shape[:2]
+    chunks = iter_compress_strips(image, strip_rows, max_code_width, predictor, zigzag, workers,
+                                  dict_policy, seed, entropy, color_transform, scan)
+    return write_container(dst, chunks, level, LAYOUT_TILED, width, height, channels,
+                           predictor, zigzag, max_code_width, entropy, color_transform, scan)
+
+
+def decode_container(data, workers=None):
+    """
+    Her seviyenin konteynerini, başlıktaki layout'a göre çözer.
+    Return: (H, W) veya (H, W, C) uint8 dizi
+    """
+    fields, payload = read_container(data)
+    layout = fields["layout"]
+    if layout == LAYOUT_TILED:
+        image = decompress_tiled(payload, workers)
+    elif layout == LAYOUT_CHANNELS:
+        image = decompress_channels(payload, workers)
+    else:
+        image = decode_block(payload, fields["channels"])
+
+    expected = (fields["height"], fields["width"])
+    if fields["channels"] > 1:
+        expected += (fields["channels"],)
+    if image.shape != expected:
+        raise ValueError(f"Çözülen resim başlıkla uyuşmuyor! Beklenen: {expected}, bulduk: {image.shape}")
+    return inverse_color(image, fields["color_transform"], out=image)
+
+
+def decode_file(path, workers=None):
+    """
+    .bin dosyasını okuyup decode_container ile çözer.
+    """
+    with open(path, "rb") as f:
+        return decode_container(f.read(), workers)
+
+
+def iter_decode_strips(data, workers=None):
+    """
+    Konteyneri satır blokları halinde çözer. Karolu (LAYOUT_TILED) dosyada
+    bloklar karo satırlarıdır ve bellekte aynı anda yalnızca biri bulunur;
+    diğer layout'larda resmin tamamı tek blok olarak döner.
+    Return: (alanlar dict'i, (y, strip) üreteci)
+    """
+    fields, payload = read_container(data)
+    if fields["layout"] == LAYOUT_TILED:
+        transform = fields["color_transform"]
+        strips = ((y, inverse_color(strip, transform, out=strip))
+                  for y, strip in iter_tiled_strips(payload, workers))
+        return fields, strips
+    return fields, iter([(0, decode_container(data, workers))])
+
+
+def decode_to_file(data, path, workers=None):
+    """
+    Konteyneri çözüp path'e yazar. BMP / PGM / PPM çıktıda bloklar çözüldükçe
+    ImageWriter ile diske yazılır (tam resmin ikinci bir kopyası tutulmaz).
+    Return: (width, height)
+    """
+    fields, strips = iter_decode_strips(data, workers)
+    width, height, channels = fields["width"], fields["height"], fields["channels"]
+    try:
+        writer = ImageWriter(path, width, height, channels)
+    except ValueError:
+        # başka bir biçim (ör. .png): PIL ile, tüm resim bellekte
+        write_image(path, decode_container(data, workers))
+        return width, height
+    with writer:
+        for _, strip in strips:
+            writer.write_rows(strip)
+    return width, height
+
+
+def decode_region(path, x, y, width, height, workers=1):
+    """
+    Karolu (LAYOUT_TILED) bir dosyadan yalnızca (x, y, width, height)
+    dikdörtgenini çözer. Dosya mmap ile açılır, sadece bölgeyle kesişen
+    karolar okunur. (Bölge okumasında tüm dosyanın checksum'ı doğrulanmaz.)
+    Return: (height, width) veya (height, width, C) uint8 dizi
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        base = 0
+        transform = COLOR_NONE
+        if is_container(data):
+            fields = read_container_header(data)
+            if fields["layout"] != LAYOUT_TILED:
+                raise ValueError("Bölge çözme yalnızca karolu (tile_size ile sıkıştırılmış) dosyalarda mümkün!")
+            base = HEADER_SIZE
+            transform = fields["color_transform"]
+        elif not is_tiled(data):
+            raise ValueError("Bölge çözme yalnızca karolu (tile_size ile sıkıştırılmış) dosyalarda mümkün!")
+        region = decode_tiled_region(data, x, y, width, height, workers, base)
+        return inverse_color(region, transform, out=region)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LZW konteynerini (Level 2-5) resme çevir")
+    parser.add_argument("input", help="sıkıştırılmış .bin dosyası")
+    parser.add_argument("output", help="çıktı resmi (ör. .bmp)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="süreç sayısı")
+    parser.add_argument("--seed", default=None,
+                        help="tohum sözlük dosyası (LZW_SEED_PATH'te değilse)")
+    args = parser.parse_args(argv)
+    if args.seed is not None:
+        load_seed(args.seed)
+
+    with open(args.input, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        width, height = decode_to_file(data, args.output, args.workers)
+    print(f"{args.input} -> {args.output} ({width} x {height})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+# File: entropy.py
+"""
+LZW kodlarından sonra isteğe bağlı entropi kodlama aşaması (Level 2-5).
+
+LZW kodları sabit (ya da sözlükle büyüyen) genişlikte yazılır, oysa kod
+değerlerinin dağılımı çok çarpıktır: tek byte'lık kodlar (fark resimlerinde
+özellikle 0 / 255 civarı) ve küçük sözlük kodları çok daha sıktır.
+"huffman" kodlayıcı kodları statik, kanonik bir Huffman koduyla yeniden yazar:
+  - sembol: kod < 256 ise kodun kendisi, aksi halde kodun bit uzunluğu ve
+    en üstteki MANTISSA_BITS biti (kova); kova içindeki sıra ham "ek bit"
+    olarak yazılır (DEFLATE'in uzaklık kodları gibi). Sembol kümesi küçük
+    ve politikadan / tohum sözlükten bağımsızdır.
+  - tablo: yalnızca sembol başına kod uzunlukları (4 bit, sıfır koşuları
+    kısaltılmış; tipik olarak 100-200 byte)
+  - decoder tablo tabanlıdır: sembol başlangıcındaki MAX_CODE_LENGTH
+    bitlik pencere, (uzunluk + ek bit) tablosunda aranır; Python döngüsü
+    yalnızca sembol başlangıçlarını zincirler, semboller ve ek bitler
+    sonra vektörel okunur.
+
+Akış formatı (blok verisinde LZW akışının yerine geçer):
+    [ENTROPY_MARKER | kodlayıcı id][iç başlık boyu u8][iç başlık]
+    [kod sayısı u64][tablo][bitler][0 padding]
+iç başlık: sabit modda boş, değişken modda LZW akış başlığı (politika,
+max_width, tohum sözlük id). İlk byte, sabit (padding 0..7) ve değişken
+(politika | 0x80) akışların ilk byte'ıyla karışmaz. Kodlanmış akış ham
+akıştan küçük değilse (ör. çok küçük karolarda) ham akış bırakılır;
+decode_stream_into üç biçimi de çözer.
+"""
+
+import heapq
+import struct
+
+import numpy as np
+
+from .bitio import BitWriter, bytes_to_codes
+from .lzw import (
+    variable_codes,
+    stream_header,
+    is_variable_stream,
+    decode_variable_into,
+    decode_codes_into
+)
+
+ENTROPY_NONE = "none"
+ENTROPY_HUFFMAN = "huffman"
+ENTROPY_CODERS = (ENTROPY_NONE, ENTROPY_HUFFMAN)  # konteyner başlığındaki id = sıra
+
+ENTROPY_MARKER = 0x40
+MANTISSA_BITS = 2
+MAX_CODE_LENGTH = 15
+MAX_SYMBOLS = 256 + ((32 - 8) << MANTISSA_BITS)  # 32 bite kadar kodlar
+# çözerken tek seferde pencereleri hazırlanan byte sayısı (geçici listeleri sınırlar)
+DECODE_WINDOW = 1 << 16
+
+_STREAM = struct.Struct("<BB")
+_COUNT = struct.Struct("<Q")
+_ALPHABET = struct.Struct("<H")
+
+
+def check_entropy(entropy):
+    """
+    Entropi kodlayıcı adını doğrular.
+    """
+    if entropy not in ENTROPY_CODERS:
+        raise ValueError(f"Bilinmeyen entropi kodlayıcı: {entropy} ({', '.join(ENTROPY_CODERS)})")
+    return entropy
+
+
+def entropy_name(entropy_id):
+    """
+    Başlıktaki kodlayıcı id'si -> kodlayıcı adı.
+    """
+    if entropy_id >= len(ENTROPY_CODERS):
+        raise ValueError(f"Bilinmeyen entropi kodlayıcı id'si: {entropy_id}")
+    return ENTROPY_CODERS[entropy_id]
+
+
+def is_entropy_stream(data):
+    return len(data) >= _STREAM.size and data[0] & 0xF0 == ENTROPY_MARKER
+
+
+# ------------------------------------------------------------------------------
+# Kod değeri <-> (sembol, ek bitler)
+# ------------------------------------------------------------------------------
+def _extra_bits():
+    """
+    Return: sembol başına ek bit sayısı (MAX_SYMBOLS uzunluğunda)
+    """
+    extra = np.zeros(MAX_SYMBOLS, dtype=np.int64)
+    bucket = np.arange(MAX_SYMBOLS - 256)
+    extra[256:] = 8 + (bucket >> MANTISSA_BITS) - MANTISSA_BITS
+    return extra
+
+
+_EXTRA = _extra_bits()
+
+
+def code_symbols(codes):
+    """
+    LZW kodlarını Huffman sembollerine ve ek bitlere ayırır (vektörel).
+    Return: (semboller, ek bit sayıları, ek bit değerleri) int64 dizileri
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    big = codes >= 256
+    nbits = np.frexp(codes)[1].astype(np.int64)  # bit uzunluğu
+    extra = np.where(big, nbits - 1 - MANTISSA_BITS, 0)
+    mantissa = (codes >> extra) & ((1 << MANTISSA_BITS) - 1)
+    symbols = np.where(big, 256 + ((nbits - 9) << MANTISSA_BITS) + mantissa, codes)
+    return symbols, extra, codes & ((1 << extra) - 1)
+
+
+def symbol_codes(symbols, values):
+    """
+    code_symbols'un tersi.
+    Return: int64 kod dizisi
+    """
+    bucket = np.maximum(symbols - 256, 0)
+    extra = _EXTRA[symbols]
+    top = (1 << (9 + (bucket >> MANTISSA_BITS) - 1)) | ((bucket & ((1 << MANTISSA_BITS) - 1)) << extra)
+    return np.where(symbols < 256, symbols, top | values)
+
+
+# ------------------------------------------------------------------------------
+# Kanonik Huffman
+# ------------------------------------------------------------------------------
+def _huffman_lengths(freqs):
+    used = np.flatnonzero(freqs)
+    lengths = np.zeros(len(freqs), dtype=np.int64)
+    if len(used) == 1:
+        lengths[used] = 1
+        return lengths
+    heap = [(int(freqs[s]), int(s), [int(s)]) for s in used]
+    heapq.heapify(heap)
+    while len(heap) > 1:
+        f1, t1, s1 = heapq.heappop(heap)
+        f2, t2, s2 = heapq.heappop(heap)
+        lengths[s1 + s2] += 1
+        heapq.heappush(heap, (f1 + f2, min(t1, t2), s1 + s2))
+    return lengths
+
+
+def code_lengths(freqs, max_length=MAX_CODE_LENGTH):
+    """
+    Sembol frekanslarından Huffman kod uzunlukları (en fazla max_length bit).
+    Sınır aşılırsa frekanslar yarıya indirilip (kullanılanlar en az 1)
+    ağaç yeniden kurulur.
+    """
+    freqs = np.asarray(freqs, dtype=np.int64)
+    while True:
+        lengths = _huffman_lengths(freqs)
+        if lengths.max(initial=0) <= max_length:
+            return lengths
+        freqs = np.where(freqs > 0, np.maximum(freqs >> 1, 1), 0)
+
+
+def _canonical_order(lengths):
+    """
+    Kanonik sırada (uzunluk, sonra sembol) kullanılan semboller.
+    """
+    used = np.flatnonzero(lengths)
+    return used[np.lexsort((used, lengths[used]))]
+
+
+def canonical_codes(lengths):
+    """
+    Return: sembol başına kanonik Huffman kodu (int64 dizi)
+    """
+    codes = np.zeros(len(lengths), dtype=np.int64)
+    code = prev = 0
+    for symbol in _canonical_order(lengths).tolist():
+        length = int(lengths[symbol])
+        code <<= length - prev
+        codes[symbol] = code
+        code += 1
+        prev = length
+    return codes
+
+
+def pack_lengths(lengths):
+    """
+    Kod uzunlukları tablosu: [sembol sayısı u16][4 bitlik uzunluklar];
+    0 uzunluğu bir sonraki 4 bitte (koşu - 1) ile, 16'ya kadar sıfırı kapsar.
+    """
+    used = np.flatnonzero(lengths)
+    count = int(used[-1]) + 1 if len(used) else 0
+    nibbles = []
+    i = 0
+    while i < count:
+        if lengths[i]:
+            nibbles.append(int(lengths[i]))
+            i += 1
+            continue
+        run = 1
+        while run < 16 and i + run < count and not lengths[i + run]:
+            run += 1
+        nibbles += [0, run - 1]
+        i += run
+    if len(nibbles) & 1:
+        nibbles.append(0)
+    packed = bytes((hi << 4) | lo for hi, lo in zip(nibbles[::2], nibbles[1::2]))
+    return _ALPHABET.pack(count) + packed
+
+
+def unpack_lengths(data, offset=0):
+    """
+    Return: (MAX_SYMBOLS uzunluğunda kod uzunlukları, tablodan sonraki offset)
+    """
+    (count,) = _ALPHABET.unpack_from(data, offset)
+    if count > MAX_SYMBOLS:
+        raise ValueError(f"Huffman tablosu bozuk! ({count} sembol)")
+    offset += _ALPHABET.size
+    lengths = np.zeros(MAX_SYMBOLS, dtype=np.int64)
+    i = nibble = 0
+    while i < count:
+        if offset + (nibble >> 1) >= len(data):
+            raise ValueError("Huffman tablosu eksik!")
+        byte = data[offset + (nibble >> 1)]
+        value = byte >> 4 if nibble & 1 == 0 else byte & 0x0F
+        nibble += 1
+        if value:
+            lengths[i] = value
+            i += 1
+            continue
+        if offset + (nibble >> 1) >= len(data):
+            raise ValueError("Huffman tablosu eksik!")
+        byte = data[offset + (nibble >> 1)]
+        i += 1 + (byte >> 4 if nibble & 1 == 0 else byte & 0x0F)
+        nibble += 1
+    if i != count or (lengths > 0).sum() and (np.ldexp(1.0, -lengths[lengths > 0])).sum() > 1:
+        raise ValueError("Huffman tablosu bozuk!")
+    return lengths, offset + ((nibble + 1) >> 1)
+
+
+def _decode_table(lengths):
+    """
+    MAX_CODE_LENGTH bitlik pencere -> sembol tablosu. Kanonik kodlar soldan
+    hizalanınca artan sırada olduğu için tablo tek bir np.repeat'tir.
+    Kullanılmayan pencereler (tam olmayan kod kümesi) -1'dir.
+    """
+    order = _canonical_order(lengths)
+    symbols = np.full(1 << MAX_CODE_LENGTH, -1, dtype=np.int64)
+    spans = np.left_shift(1, MAX_CODE_LENGTH - lengths[order])
+    symbols[:int(spans.sum())] = np.repeat(order, spans)
+    return symbols
+
+
+def huffman_encode(codes):
+    """
+    LZW kodlarını kanonik Huffman ile yazar.
+    Return: [tablo][bitler][0 padding]
+    """
+    symbols, extra, values = code_symbols(codes)
+    lengths = code_lengths(np.bincount(symbols, minlength=MAX_SYMBOLS))
+    words = (canonical_codes(lengths)[symbols] << extra) | values
+    writer = BitWriter()
+    writer.write_codes(words, lengths[symbols] + extra)
+    writer.flush()
+    return pack_lengths(lengths) + writer.getvalue()
+
+
+def _words_at(buf, offsets):
+    """
+    buf'ta verilen byte offset'lerinden başlayan 64 bitlik (MSB-first) sözcükler.
+    """
+    raw = np.lib.stride_tricks.sliding_window_view(buf, 8)[offsets]
+    return np.ascontiguousarray(raw).view(">u8").ravel().astype(np.uint64)
+
+
+def huffman_decode(data, count):
+    """
+    huffman_encode çıktısından count kodu okur.
+    Return: int64 kod dizisi
+    """
+    data = memoryview(data).cast("B")
+    lengths, offset = unpack_lengths(data)
+    table = _decode_table(lengths)
+    # pencere -> bu konumdan başlayan kodun toplam boyu (Huffman + ek bitler);
+    # geçersiz pencerede çok büyük bir adım döngüden çıkarır
+    steps = np.where(table >= 0, lengths[table] + _EXTRA[table], 1 << 62).tolist()
+    buf = np.frombuffer(bytes(data[offset:]) + bytes(8), dtype=np.uint8)
+    nbytes = len(data) - offset
+    shift = 24 - MAX_CODE_LENGTH
+    mask = (1 << MAX_CODE_LENGTH) - 1
+
+    codes = np.empty(count, dtype=np.int64)
+    p = n = 0
+    while n < count:
+        # DECODE_WINDOW byte'lık parça: her byte'tan başlayan 24 bit (küçük Python int)
+        first = p >> 3
+        if first >= nbytes:
+            raise ValueError("Entropi kodlu akış eksik ya da bozuk!")
+        last = min(first + DECODE_WINDOW, nbytes)
+        part = buf[first:last + 2].astype(np.int64)
+        words = ((part[:-2] << 16) | (part[1:-1] << 8) | part[2:]).tolist()
+        base = first << 3
+        limit = (last - first) << 3
+        starts = []
+        append = starts.append
+        q = p - base
+        for _ in range(count - n):
+            if q >= limit:
+                break
+            append(q)
+            q += steps[(words[q >> 3] >> (shift - (q & 7))) & mask]
+        p = base + q
+        # sembol başlangıçları belli: semboller ve ek bitler vektörel
+        starts = base + np.array(starts, dtype=np.int64)
+        aligned = _words_at(buf, starts >> 3) << (starts & 7).astype(np.uint64)
+        symbols = table[(aligned >> np.uint64(64 - MAX_CODE_LENGTH)).astype(np.int64)]
+        extra = _EXTRA[symbols]
+        values = (aligned << lengths[symbols].astype(np.uint64)) >> (64 - extra).astype(np.uint64)
+        codes[n:n + len(starts)] = symbol_codes(symbols, np.where(extra > 0, values.astype(np.int64), 0))
+        n += len(starts)
+    if p > nbytes * 8:
+        raise ValueError("Entropi kodlu akış eksik ya da bozuk!")
+    return codes
+
+
+# ------------------------------------------------------------------------------
+# LZW akışı <-> entropi kodlu akış
+# ------------------------------------------------------------------------------
+def entropy_encode(stream, entropy=ENTROPY_HUFFMAN):
+    """
+    Sabit veya değişken genişlikli LZW akışını entropi kodlu akışa çevirir.
+    Sonuç küçük değilse (ya da entropy "none" ise) stream olduğu gibi döner.
+    Return: bytes
+    """
+    if check_entropy(entropy) == ENTROPY_NONE:
+        return stream
+    data = memoryview(stream).cast("B")
+    if is_variable_stream(data):
+        header = bytes(data[:stream_header(data)[3]])
+        codes, _ = variable_codes(data)
+    else:
+        header = b""
+        codes, _ = bytes_to_codes(data)
+    encoded = (_STREAM.pack(ENTROPY_MARKER | ENTROPY_CODERS.index(entropy), len(header)) + header
+               + _COUNT.pack(len(codes)) + huffman_encode(codes))
+    return encoded if len(encoded) < len(data) else stream
+
+
+def decode_stream_into(data, out):
+    """
+    LZW akışını (sabit, değişken genişlikli ya da entropi kodlu) önceden
+    ayrılmış out tamponuna çözer.
+    Return: yazılan byte sayısı
+    """
+    data = memoryview(data).cast("B")
+    if not is_entropy_stream(data):
+        if is_variable_stream(data):
+            return decode_variable_into(data, out)
+        codes, _ = bytes_to_codes(data)
+        return decode_codes_into(codes, out)
+    coder_id, header_size = _STREAM.unpack_from(data)
+    entropy_name(coder_id & 0x0F)
+    offset = _STREAM.size + header_size
+    if len(data) < offset + _COUNT.size:
+        raise ValueError("Entropi kodlu akışın başlığı eksik!")
+    (count,) = _COUNT.unpack_from(data, offset)
+    codes = huffman_decode(data[offset + _COUNT.size:], count)
+    if not header_size:
+        return decode_codes_into(codes, out)
+    policy, max_width, seed, _ = stream_header(data[_STREAM.size:offset])
+    return decode_codes_into(codes, out, policy, max_width, seed)
@@ -0,0 +1,340 @@
+# File: imageio.py
+"""
+Sıkıştırılmamış BMP, PGM (P5) ve PPM (P6) dosyaları için kopyasız okuyucu
+ve satır blokları halinde yazan (ImageWriter) yazıcı.
+
+Dosya mmap ile açılır ve piksel alanı doğrudan NumPy görünümü (view) olarak
+döndürülür; PIL -> np.array -> flatten zincirindeki kopyalar yapılmaz:
+  - BMP satır padding'i (4 byte hizalama) stride ile atlanır
+  - aşağıdan yukarı (bottom-up) BMP satırları negatif stride ile çevrilir
+  - BGR(X) sırası kanal ekseninde negatif stride ile RGB'ye çevrilir
+Görünümler salt okunurdur ve mmap'i canlı tutar (dizi yaşadıkça dosya eşlenmiş kalır).
+
+Desteklenmeyen biçimler (sıkıştırılmış BMP, 1/4/16 bit, 16 bit PNM, PNG, JPEG ...)
+için PIL'e geri dönülür. Gri <-> renkli dönüşüm PIL'in convert("L") / convert("RGB")
+sonucuyla birebir aynıdır (ITU-R 601, L = (19595 R + 38470 G + 7471 B + 0x8000) >> 16).
+"""
+
+import mmap
+import struct
+
+import numpy as np
+
+_BMP_FILE_HEADER = struct.Struct("<2sIHHI")
+_BMP_INFO_HEADER = struct.Struct("<IiiHHIIiiII")
+_BI_RGB = 0
+_PNM_MAGICS = {b"P5": 1, b"P6": 3}
+_PNM_WHITESPACE = b" \t\r\n\v\f"
+
+# gri dönüşümünde bellek sınırlı kalsın diye bu kadar piksellik satır blokları
+_CONVERT_BLOCK = 1 << 20
+
+
+def map_file(path):
+    """
+    Dosyayı salt okunur olarak mmap'ler (boş dosyada None).
+    """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # boş dosya
+            return None
+
+
+# ------------------------------------------------------------------------------
+# BMP
+# ------------------------------------------------------------------------------
+def read_bmp(data):
+    """
+    data: BMP dosyasının içeriği (mmap / bytes)
+    Return: (H, W, 3) RGB veya (H, W) palet indeksi görünümü ve palet
+            ((256, 3) RGB dizi, 8 bit için; aksi halde None).
+            Desteklenmeyen BMP'de None.
+    """
+    if len(data) < _BMP_FILE_HEADER.size + _BMP_INFO_HEADER.size:
+        return None
+    magic, _, _, _, pixel_offset = _BMP_FILE_HEADER.unpack_from(data)
+    (header_size, width, height, planes, bits, compression, _, _, _,
+     colors_used, _) = _BMP_INFO_HEADER.unpack_from(data, _BMP_FILE_HEADER.size)
+    if magic != b"BM" or header_size < 40 or planes != 1 or compression != _BI_RGB:
+        return None
+    if bits not in (8, 24, 32) or width <= 0 or height == 0:
+        return None
+
+    bottom_up = height > 0
+    height = abs(height)
+    channels = bits // 8
+    stride = (width * bits + 31) // 32 * 4
+    if pixel_offset + stride * height > len(data):
+        return None
+
+    rows = np.frombuffer(data, dtype=np.uint8, count=stride * height, offset=pixel_offset)
+    rows = rows.reshape(height, stride)
+    if bottom_up:
+        rows = rows[::-1]
+
+    if bits == 8:
+        count = colors_used or 256
+        table = _BMP_FILE_HEADER.size + header_size
+        if table + 4 * count > pixel_offset:
+            return None
+        palette = np.zeros((256, 3), dtype=np.uint8)
+        entries = np.frombuffer(data, dtype=np.uint8, count=4 * count, offset=table)
+        palette[:count] = entries.reshape(count, 4)[:, 2::-1]  # BGRX -> RGB
+        return rows[:, :width], palette
+
+    pixels = rows[:, :width * channels].reshape(height, width, channels)
+    return pixels[:, :, 2::-1], None  # BGR(X) -> RGB
+
+
+# ------------------------------------------------------------------------------
+# PGM / PPM (ikili, 8 bit)
+# ------------------------------------------------------------------------------
+def _pnm_fields(data, count, offset):
+    """
+    Başlıktaki count tamsayıyı (yorumları atlayarak) okur.
+    Return: (değerler, piksel verisinin başladığı offset)
+    """
+    values = []
+    pos = offset
+    limit = min(len(data), offset + 4096)
+    while len(values) < count:
+        if pos >= limit:
+            raise ValueError("PNM başlığı hatalı!")
+        if data[pos] in _PNM_WHITESPACE:
+            pos += 1
+        elif data[pos] == ord("#"):
+            # yorum: satır sonuna kadar
+            while pos < limit and data[pos] not in b"\r\n":
+                pos += 1
+        else:
+            start = pos
+            while pos < limit and data[pos] in b"0123456789":
+                pos += 1
+            if pos == start:
+                raise ValueError("PNM başlığı hatalı!")
+            values.append(int(bytes(data[start:pos])))
+    if pos >= limit or data[pos] not in _PNM_WHITESPACE:
+        raise ValueError("PNM başlığı hatalı!")
+    return values, pos + 1  # veriden önce tek bir boşluk karakteri
+
+
+def read_pnm(data):
+    """
+    data: P5 (PGM) veya P6 (PPM) dosyasının içeriği
+    Return: (H, W) veya (H, W, 3) uint8 görünüm; desteklenmeyen dosyada None
+    """
+    channels = _PNM_MAGICS.get(bytes(data[:2]))
+    if channels is None:
+        return None
+    (width, height, maxval), offset = _pnm_fields(data, 3, 2)
+    if maxval != 255:
+        return None  # 16 bit veya ölçeklenmesi gereken değerler: PIL
+    size = width * height * channels
+    if offset + size > len(data):
+        raise ValueError("PNM verisi eksik!")
+    pixels = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset)
+    return pixels.reshape((height, width) + ((channels,) if channels > 1 else ()))
+
+
+# ------------------------------------------------------------------------------
+# Renk dönüşümleri (PIL ile aynı sonuç)
+# ------------------------------------------------------------------------------
+def rgb_to_gray(rgb):
+    """
+    (H, W, 3) -> (H, W) uint8; PIL convert("L") ile birebir aynı.
+    """
+    height, width = rgb.shape[:2]
+    gray = np.empty((height, width), dtype=np.uint8)
+    step = max(1, _CONVERT_BLOCK // max(width, 1))
+    weights = np.array([19595, 38470, 7471], dtype=np.uint32)
+    for y in range(0, height, step):
+        block = rgb[y:y + step].astype(np.uint32)
+        gray[y:y + step] = (block @ weights + 0x8000) >> 16
+    return gray
+
+
+def gray_to_rgb(gray):
+    """
+    (H, W) -> (H, W, 3) salt okunur görünüm (kanallar kopyalanmaz).
+    """
+    return np.broadcast_to(gray[:, :, None], gray.shape + (3,))
+
+
+def _from_palette(indices, palette, mode):
+    if mode == "L":
+        lut = rgb_to_gray(palette[None])[0]
+        if np.array_equal(lut, np.arange(256, dtype=np.uint8)):
+            return indices  # gri palet: indeksler zaten piksel değeri
+        return lut[indices]
+    return palette[indices]
+
+
+def read_image(path, mode="RGB"):
+    """
+    path: resim dosyası
+    mode: "L" (gri) veya "RGB"
+    Return: (H, W) veya (H, W, 3) uint8 dizi; sıkıştırılmamış BMP / PGM / PPM
+    için mmap üzerinde salt okunur görünüm, diğer biçimlerde PIL ile okunur.
+    """
+    if mode not in ("L", "RGB"):
+        raise ValueError(f"Desteklenmeyen mod: {mode}")
+    data = map_file(path)
+    image = None
+    if data is not None:
+        if data[:2] == b"BM":
+            parsed = read_bmp(data)
+            if parsed is not None:
+                pixels, palette = parsed
+                if palette is not None:
+                    return _from_palette(pixels, palette, mode)
+                image = pixels
+        else:
+            image = read_pnm(data)
+
+    if image is None:
+        from PIL import Image
+
+        with Image.open(path) as img:
+            return np.asarray(img.convert(mode))
+
+    if mode == "L":
+        return image if image.ndim == 2 else rgb_to_gray(image)
+    return gray_to_rgb(image) if image.ndim == 2 else image
+
+
+# ------------------------------------------------------------------------------
+# Akış halinde yazıcı (BMP / PGM / PPM)
+# ------------------------------------------------------------------------------
+_WRITER_FORMATS = {".bmp": "bmp", ".pgm": "pgm", ".ppm": "ppm", ".pnm": "pnm"}
+_BMP_PPM = 2835  # 72 dpi (piksel / metre)
+
+
+class ImageWriter:
+    """
+    Resmi satır blokları (strip) halinde, üretildikçe diske yazar; tüm resim
+    hiçbir zaman bellekte tutulmaz.
+
+        with ImageWriter("cikti.bmp", width, height, channels=3) as out:
+            for strip in strips:          # yukarıdan aşağı, (k, W) veya (k, W, 3)
+                out.write_rows(strip)
+
+    BMP aşağıdan yukarı saklandığı için dosya önce tam boyuna genişletilir ve
+    her blok (satırları ters çevrilip BGR + 4 byte padding ile) kendi yerine
+    yazılır. Gri resim 8 bit gri paletli BMP / PGM, renkli 24 bit BMP / PPM olur.
+    """
+
+    def __init__(self, path, width, height, channels=3, format=None):
+        if channels not in (1, 3):
+            raise ValueError(f"Desteklenmeyen kanal sayısı: {channels}")
+        if width <= 0 or height <= 0:
+            raise ValueError("width/height pozitif olmalı!")
+        if format is None:
+            ext = path[path.rfind("."):].lower() if "." in path else ""
+            format = _WRITER_FORMATS.get(ext)
+            if format is None:
+                raise ValueError(f"Desteklenmeyen çıktı biçimi: {path} (bmp, pgm, ppm)")
+        if format == "pnm":
+            format = "pgm" if channels == 1 else "ppm"
+        if (format == "pgm" and channels != 1) or (format == "ppm" and channels != 3):
+            raise ValueError(f"{format.upper()} için kanal sayısı uygun değil: {channels}")
+
+        self.path = path
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.format = format
+        self.rows_written = 0
+        self._file = open(path, "wb")
+        try:
+            self._write_header()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def _write_header(self):
+        f = self._file
+        if self.format != "bmp":
+            magic = b"P5" if self.channels == 1 else b"P6"
+            f.write(magic + f"\n{self.width} {self.height}\n255\n".encode("ascii"))
+            return
+        bits = 8 * self.channels
+        self._stride = (self.width * bits + 31) // 32 * 4
+        palette = 256 * 4 if self.channels == 1 else 0
+        self._pixel_offset = _BMP_FILE_HEADER.size + _BMP_INFO_HEADER.size + palette
+        image_size = self._stride * self.height
+        f.write(_BMP_FILE_HEADER.pack(b"BM", self._pixel_offset + image_size, 0, 0, self._pixel_offset))
+        f.write(_BMP_INFO_HEADER.pack(_BMP_INFO_HEADER.size, self.width, self.height, 1, bits,
+                                      _BI_RGB, image_size, _BMP_PPM, _BMP_PPM,
+                                      256 if palette else 0, 256 if palette else 0))
+        if palette:
+            gray = np.arange(256, dtype=np.uint8)
+            f.write(np.stack([gray, gray, gray, np.zeros_like(gray)], axis=1).tobytes())
+        # satırlar sondan başa yazılacağı için dosyayı tam boyuna getir
+        f.truncate(self._pixel_offset + image_size)
+
+    def write_rows(self, rows):
+        """
+        rows: sıradaki satırlar, (k, W) / (k, W, C) ya da tek satır (W,) / (W, C)
+        """
+        rows = np.asarray(rows, dtype=np.uint8)
+        row_shape = (self.width,) + ((self.channels,) if self.channels > 1 else ())
+        if rows.shape == row_shape:
+            rows = rows[None]
+        if rows.shape[1:] != row_shape:
+            raise ValueError(f"Satır şekli uygun değil: {rows.shape}, beklenen: (k,) + {row_shape}")
+        count = rows.shape[0]
+        if self.rows_written + count > self.height:
+            raise ValueError("Resim yüksekliğinden fazla satır yazıldı!")
+        if count == 0:
+            return
+
+        if self.format == "bmp":
+            # blok dosyada ters sırada: son satırı en üstte
+            block = np.zeros((count, self._stride), dtype=np.uint8)
+            flipped = rows[::-1]
+            if self.channels == 3:
+                flipped = flipped[:, :, ::-1]  # RGB -> BGR
+            block[:, :self.width * self.channels] = flipped.reshape(count, -1)
+            first = self.height - self.rows_written - count  # dosyadaki ilk satır
+            self._file.seek(self._pixel_offset + first * self._stride)
+            self._file.write(block.data)
+        else:
+            self._file.write(np.ascontiguousarray(rows).data)
+        self.rows_written += count
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        if self.rows_written != self.height:
+            raise ValueError(f"Eksik satır: {self.rows_written} / {self.height} yazıldı!")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._file.close()  # asıl hatayı gizleme
+            return False
+        self.close()
+        return False
+
+
+def write_image(path, image, strip_rows=256):
+    """
+    (H, W) veya (H, W, 3) diziyi BMP / PGM / PPM olarak (uzantıya göre) yazar.
+    Dizi strip_rows satırlık bloklarla yazılır; ek tam kopya yapılmaz.
+    Diğer uzantılar için PIL kullanılır.
+    """
+    image = np.asarray(image, dtype=np.uint8)
+    ext = path[path.rfind("."):].lower() if "." in path else ""
+    if ext not in _WRITER_FORMATS:
+        from PIL import Image
+
+        Image.fromarray(image).save(path)
+        return
+    height, width = image.shape[:2]
+    with ImageWriter(path, width, height, 1 if image.ndim == 2 else image.shape[2]) as out:
+        for y in range(0, height, strip_rows):
+            out.write_rows(image[y:y + strip_rows])
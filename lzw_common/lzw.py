@@ -0,0 +1,929 @@
+# File: lzw.py
+"""
+Ortak LZW motoru (sabit ve değişken genişlikli kodlar).
+
+Sözlük string anahtarlar yerine tamsayılarla tutulur:
+  - encoder: (prefix_code << 8) | sonraki_sembol  ->  yeni kod
+  - decoder: her kod için prefix[code] ve suffix[code] tabloları
+Böylece sembol başına maliyet, cümle (phrase) uzunluğundan bağımsız O(1)
+olur ve sözlük girdisi başına birkaç byte yer tutar. Tek sembollük
+cümlelerin kodu sembolün kendisidir (0..255), sözlükte saklanmaz.
+
+table parametresi:
+  - "dict" : Python dict / list (varsayılan)
+  - "numpy": önceden ayrılmış NumPy dizileri (boyut sınırlı olmalı)
+
+Değişken genişlikli (GIF / compress tarzı) mod:
+  - kodlar 9 bit ile başlar, sözlük doldukça 1'er bit genişler
+  - genişlik max_width'e ulaşıp sözlük dolunca CLEAR kodu yazılır ve
+    sözlük 256 tek-byte girdiye sıfırlanır (bellek sınırlı kalır)
+  - akışın sonu EOI (end of information) koduyla işaretlenir
+Akış formatı: [tohum bayrağı 0x80 | politika id][0x80 | max_width]
+             [tohum sözlük id u32, yalnızca bayrak varsa][kodlar][EOI][0 padding]
+(İkinci byte'ın en yüksek biti, sabit moddaki codelength byte'ından
+ayırt etmek için kullanılır. Akış EOI ile bittiği için padding sayısı
+gerekmez; bu sayede çıktı, girdinin sonu beklenmeden yazılabilir.)
+
+Sözlük politikaları (sözlük 1 << max_width girdiye ulaşınca; id ilk byte'ta):
+  - "reset" (0): CLEAR ile sıfırla (varsayılan, eski akışlar; ilk byte 0)
+  - "ratio" (1): sözlük donar; check_block byte'lık blokların sıkıştırma oranı
+                 en iyi blok oranının ratio_threshold katının altına düşünce CLEAR
+  - "lru"   (2): en uzun süredir kullanılmayan yaprak girdi çıkarılır, kodu yeni
+                 girdiye verilir (decoder aynı seçimi yapar, CLEAR yok)
+Bellek bütçesi (byte) width_for_budget ile sözlük boyutuna (max_width) çevrilir.
+Tohum sözlük (lzw_common.seed) verilirse sözlük, sıfırlandığında da, 256 tek
+byte'tan sonra önceden eğitilmiş girdilerle (FIRST_CODE..) başlar.
+
+Çıktı boyu biliniyorsa (başlıktaki width x height x kanal) decode_fixed_into /
+decode_variable_into önceden ayrılmış bir uint8 tampona yazar: her sözlük
+girdisi çıktıda zaten yazılmış bir (offset, length) aralığıdır ve cümle bu
+aralıktan tek dilim kopyasıyla yazılır (sembol başına Python nesnesi yok).
+"""
+
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from .bitio import BitWriter, BitReader
+
+CLEAR_CODE = 256       # sözlüğü sıfırla
+EOI_CODE = 257         # veri sonu
+FIRST_CODE = 258       # ilk serbest sözlük kodu
+MIN_CODE_WIDTH = 9
+DEFAULT_MAX_CODE_WIDTH = 12
+MAX_CODE_WIDTH_LIMIT = 24
+VARIABLE_WIDTH_FLAG = 0x80
+SEED_FLAG = 0x80  # ilk byte: tohum sözlük kullanıldı, ardından 32 bit id
+
+POLICY_RESET = "reset"
+POLICY_RATIO = "ratio"
+POLICY_LRU = "lru"
+POLICIES = (POLICY_RESET, POLICY_RATIO, POLICY_LRU)  # akış başlığındaki id = sıra
+DEFAULT_RATIO_THRESHOLD = 0.9
+DEFAULT_CHECK_BLOCK = 1 << 10
+
+# sözlük girdisi başına yaklaşık encoder belleği (byte), width_for_budget için;
+# "lru" politikasının yaprak listesi / prefix tabloları girdi başına ek yer tutar
+TABLE_ENTRY_BYTES = {"dict": 104, "numpy": 4 << 8}
+LRU_ENTRY_BYTES = 192
+
+
+def check_max_code_width(max_width):
+    """
+    max_width değerini doğrular (9..24 bit).
+    """
+    if not MIN_CODE_WIDTH <= max_width <= MAX_CODE_WIDTH_LIMIT:
+        raise ValueError(
+            f"max_code_width {MIN_CODE_WIDTH}..{MAX_CODE_WIDTH_LIMIT} aralığında olmalı: {max_width}")
+    return max_width
+
+
+def check_policy(policy):
+    """
+    Sözlük politikası adını doğrular.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Bilinmeyen sözlük politikası: {policy} ({', '.join(POLICIES)})")
+    return policy
+
+
+def policy_name(policy_id):
+    """
+    Akış başlığındaki politika id'si -> politika adı.
+    """
+    if policy_id >= len(POLICIES):
+        raise ValueError(f"Bilinmeyen sözlük politikası id'si: {policy_id}")
+    return POLICIES[policy_id]
+
+
+def width_for_budget(memory_budget, table="dict", policy=POLICY_RESET):
+    """
+    Encoder sözlüğünün memory_budget byte'a sığdığı en büyük max_width
+    (sözlük girdi sayısı 1 << max_width, girdi başına TABLE_ENTRY_BYTES).
+    """
+    per_entry = TABLE_ENTRY_BYTES[table] + (LRU_ENTRY_BYTES if check_policy(policy) == POLICY_LRU else 0)
+    if (1 << MIN_CODE_WIDTH) * per_entry > memory_budget:
+        raise ValueError(f"memory_budget çok küçük! En az {(1 << MIN_CODE_WIDTH) * per_entry} byte gerekli.")
+    width = MIN_CODE_WIDTH
+    while width < MAX_CODE_WIDTH_LIMIT and (2 << width) * per_entry <= memory_budget:
+        width += 1
+    return width
+
+
+def dictionary_width(max_code_width, dict_policy=POLICY_RESET, memory_budget=None, seed=None):
+    """
+    Seviye / API seçeneklerini doğrular: memory_budget verilirse max_code_width
+    onun yerine width_for_budget ile seçilir; "reset" dışındaki politikalar ve
+    tohum sözlük, sözlüğü sınırlı değişken genişlikli modu gerektirir.
+    Return: kullanılacak max_code_width (None => sabit codelength)
+    """
+    check_policy(dict_policy)
+    if memory_budget is not None:
+        max_code_width = width_for_budget(memory_budget, policy=dict_policy)
+    if max_code_width is None and dict_policy != POLICY_RESET:
+        raise ValueError("Sözlük politikası yalnızca değişken genişlikte (max_code_width) kullanılabilir!")
+    if seed is not None:
+        if max_code_width is None:
+            raise ValueError("Tohum sözlük yalnızca değişken genişlikte (max_code_width) kullanılabilir!")
+        check_seed(load_seed(seed), max_code_width)
+    return max_code_width
+
+
+def load_seed(ref):
+    """
+    Tohum sözlüğü (SeedDictionary, artefakt yolu veya id) süreç önbelleğinden /
+    dosyadan yükler (lzw_common.seed.load_seed).
+    """
+    from .seed import load_seed  # seed modülü lzw'yi import ettiği için burada
+    return load_seed(ref)
+
+
+def check_seed(seed, max_width):
+    """
+    Tohum sözlük, sözlükte yeni girdilere de yer kalacak kadar küçük olmalı.
+    """
+    if seed.end_code >= 1 << max_width:
+        raise ValueError(f"Tohum sözlük ({len(seed)} girdi) max_code_width {max_width} için çok büyük!")
+    return seed
+
+
+def stream_header(data):
+    """
+    Değişken genişlikli akışın başlığını okur (tohum sözlük id'den yüklenir).
+    Return: (politika, max_width, tohum sözlük veya None, başlık boyu byte)
+    """
+    if not is_variable_stream(data):
+        raise ValueError("Değişken genişlikli LZW akışı değil!")
+    policy = policy_name(data[0] & ~SEED_FLAG)
+    max_width = check_max_code_width(data[1] & ~VARIABLE_WIDTH_FLAG)
+    if not data[0] & SEED_FLAG:
+        return policy, max_width, None, 2
+    if len(data) < 6:
+        raise ValueError("Akış başlığı eksik (tohum sözlük id'si)!")
+    seed = check_seed(load_seed(int.from_bytes(bytes(data[2:6]), "big")), max_width)
+    return policy, max_width, seed, 6
+
+
+def code_width(k, max_width):
+    """
+    CLEAR'dan sonraki k. kodun (0'dan başlayarak) bit genişliği.
+    k kod yazıldığında sözlükteki en büyük kod 257 + k olabilir;
+    encoder ve decoder aynı sayacı tuttuğu için genişlikler hep uyuşur.
+    """
+    return min(max_width, max(MIN_CODE_WIDTH, (257 + k).bit_length()))
+
+
+def is_variable_stream(data):
+    """
+    Verinin değişken genişlikli modda üretilip üretilmediğini söyler.
+    """
+    return len(data) >= 2 and bool(data[1] & VARIABLE_WIDTH_FLAG)
+
+
+def as_symbols(symbols):
+    """
+    Girdiyi (numpy dizisi, bytes, list ...) Python int üreten,
+    kopyasız gezilebilen bir byte görünümüne çevirir.
+    """
+    if isinstance(symbols, np.ndarray):
+        symbols = np.ascontiguousarray(symbols, dtype=np.uint8)
+    elif not isinstance(symbols, (bytes, bytearray, memoryview)):
+        symbols = bytes(symbols)
+    return memoryview(symbols).cast("B")
+
+
+# ------------------------------------------------------------------------------
+# Sözlük tabloları
+# ------------------------------------------------------------------------------
+def _encoder_table(table, max_size, seed_map=None):
+    """
+    Encoder sözlüğü için (get, set, delete, reset) dörtlüsü döndürür.
+    get(key) bulunamazsa 0/None (False) döner; geçerli kodlar hep >= 256.
+    seed_map: tohum sözlük girdileri ({key: kod}); sözlük her sıfırlamada bunlarla başlar
+    """
+    seed_map = seed_map or {}
+    if table == "dict":
+        children = dict(seed_map)
+
+        def reset():
+            children.clear()
+            children.update(seed_map)
+        return children.get, children.__setitem__, children.__delitem__, reset
+    if table == "numpy":
+        if max_size is None:
+            raise ValueError("numpy tablosu için sözlük boyutu sınırlı olmalı (max_code_width)")
+        children = np.zeros(max_size << 8, dtype=np.int32)
+        keys = np.fromiter(seed_map.keys(), dtype=np.int64, count=len(seed_map))
+        codes = np.fromiter(seed_map.values(), dtype=np.int32, count=len(seed_map))
+
+        def reset():
+            children.fill(0)
+            children[keys] = codes
+        reset()
+        return children.item, children.__setitem__, lambda key: children.__setitem__(key, 0), reset
+    raise ValueError(f"Bilinmeyen tablo tipi: {table}")
+
+
+def _decoder_tables(table, size):
+    """
+    Decoder için önceden ayrılmış prefix / suffix tabloları.
+    """
+    if table == "dict":
+        return [0] * size, [0] * size
+    if table == "numpy":
+        return np.zeros(size, dtype=np.int32), np.zeros(size, dtype=np.uint8)
+    raise ValueError(f"Bilinmeyen tablo tipi: {table}")
+
+
+def _write_phrase(out, code, prefix, suffix):
+    """
+    code'un karşılığı olan cümleyi prefix zincirini geriye doğru izleyerek
+    out'un sonuna ekler. Return: cümlenin ilk sembolü
+    """
+    start = len(out)
+    while code > 255:
+        out.append(suffix[code])
+        code = prefix[code]
+    out.append(code)
+    # zincir sondan başa okundu, eklenen kısmı ters çevir
+    out[start:] = out[start:][::-1]
+    return code
+
+
+# ------------------------------------------------------------------------------
+# Sabit genişlikli mod (sözlük sınırsız, codelength en sonda belirlenir)
+# ------------------------------------------------------------------------------
+def encode_fixed(symbols):
+    """
+    Sembolleri (0..255) LZW integer kod listesine dönüştürür.
+    Return: (kod listesi, son sözlük boyutu)
+    """
+    data = as_symbols(symbols)
+    if len(data) == 0:
+        return [], 256
+    get, put, _, _ = _encoder_table("dict", None)
+
+    next_code = 256
+    result = []
+    w = data[0]
+    for c in data[1:]:
+        key = (w << 8) | c
+        code = get(key)
+        if code:
+            w = code
+        else:
+            result.append(w)
+            put(key, next_code)
+            next_code += 1
+            w = c
+    result.append(w)
+    return result, next_code
+
+
+def decode_fixed(codes, table="dict"):
+    """
+    encode_fixed çıktısını çözer.
+    Return: çözülen semboller (bytearray)
+    """
+    out = bytearray()
+    if len(codes) == 0:
+        return out
+    codes = codes.tolist() if isinstance(codes, np.ndarray) else codes
+    prefix, suffix = _decoder_tables(table, 256 + len(codes))
+
+    next_code = 256
+    w = codes[0]
+    if w > 255:
+        raise ValueError(f"Geçersiz code: {w}")
+    out.append(w)
+    for code in codes[1:]:
+        if code < next_code:
+            first = _write_phrase(out, code, prefix, suffix)
+        elif code == next_code:
+            # özel durum (KwKwK): önceki cümle + kendi ilk sembolü
+            first = _write_phrase(out, w, prefix, suffix)
+            out.append(first)
+        else:
+            raise ValueError(f"Geçersiz code: {code}")
+        prefix[next_code] = w
+        suffix[next_code] = first
+        next_code += 1
+        w = code
+    return out
+
+
+# ------------------------------------------------------------------------------
+# Değişken genişlikli mod (artımlı / akış halinde)
+# ------------------------------------------------------------------------------
+class _LeafLRU:
+    """
+    "lru" politikası için yaprak (çocuğu olmayan) sözlük kodları, son kullanım
+    sırasına göre (baştaki en eski). Yalnızca yapraklar çıkarılabilir; böylece
+    hiçbir girdinin prefix'i geçersiz kalmaz. Encoder ve decoder aynı olayları
+    (kod kullanımı, girdi ekleme / çıkarma) aynı sırayla işlediği için aynı
+    kurbanı seçer. first'ten küçük kodlar (tohum sözlük) hiç çıkarılmaz.
+    """
+
+    def __init__(self, size, first=FIRST_CODE):
+        self.first = first
+        self.leaves = OrderedDict()
+        self.prefix = [0] * size
+        self.children = [0] * size
+
+    def touch(self, code):
+        if code in self.leaves:
+            self.leaves.move_to_end(code)
+
+    def add(self, code, prefix):
+        self.prefix[code] = prefix
+        if prefix >= self.first:
+            self.children[prefix] += 1
+            self.leaves.pop(prefix, None)
+        self.leaves[code] = None
+
+    def victim(self, keep):
+        """
+        En eski yaprak (yeni girdinin prefix'i keep hariç), yoksa None.
+        """
+        for code in self.leaves:
+            if code != keep:
+                return code
+        return None
+
+    def evict(self, code):
+        del self.leaves[code]
+        parent = self.prefix[code]
+        if parent >= self.first:
+            self.children[parent] -= 1
+            if self.children[parent] == 0:
+                self.leaves[parent] = None
+
+
+class LZWCompressor:
+    """
+    Değişken genişlikli LZW için artımlı encoder (zlib.compressobj benzeri).
+    feed(chunk) o ana kadar tamamlanan çıktı byte'larını, flush() akışın
+    kalanını (son kod + EOI + padding) döndürür. Bellek kullanımı girdinin
+    boyutundan bağımsızdır (sözlük en fazla 1 << max_width girdi).
+    policy: sözlük dolunca ne yapılacağı (POLICIES); ratio_threshold ve
+    check_block yalnızca "ratio" politikasında kullanılır.
+    seed: tohum sözlük (lzw_common.seed; SeedDictionary, yol veya id)
+    """
+
+    def __init__(self, max_width=DEFAULT_MAX_CODE_WIDTH, table="dict", policy=POLICY_RESET,
+                 ratio_threshold=DEFAULT_RATIO_THRESHOLD, check_block=DEFAULT_CHECK_BLOCK, seed=None):
+        self.max_width = check_max_code_width(max_width)
+        self.policy = check_policy(policy)
+        self.ratio_threshold = ratio_threshold
+        self.check_block = check_block
+        self.seed = None if seed is None else check_seed(load_seed(seed), max_width)
+        self._max_size = 1 << max_width
+        # sıfırlamadan sonraki ilk serbest kod ve genişliği (tohum sözlük girdileri sonrası)
+        self._first = FIRST_CODE if self.seed is None else self.seed.end_code
+        self._first_width = code_width(self._first - FIRST_CODE, max_width)
+        self._get, self._put, self._delete, self._reset = _encoder_table(
+            table, self._max_size, None if self.seed is None else self.seed.encoder_map())
+        if policy == POLICY_LRU:
+            self._lru = _LeafLRU(self._max_size, self._first)
+            self._keys = [0] * self._max_size  # kod -> sözlük anahtarı (çıkarmak için)
+        self._best_ratio = 0.0
+        # "ratio": yarım kalan bloğun girdi byte'ları ve çıktı bitleri
+        self._block_bytes = 0
+        self._block_bits = 0
+        self._writer = BitWriter()
+        self._writer.write(POLICIES.index(policy) | (0 if self.seed is None else SEED_FLAG), 8)
+        self._writer.write(VARIABLE_WIDTH_FLAG | max_width, 8)
+        if self.seed is not None:
+            self._writer.write(self.seed.id, 32)
+        self._next_code = self._first
+        # sıradaki kodun genişliği code_width(next_code - FIRST_CODE) ile aynıdır;
+        # next_code, 1 << width değerini geçince genişlik 1 bit artar
+        self._width = self._first_width
+        self._w = None  # eşleşen en uzun cümlenin kodu
+        self.finished = False
+        self.bytes_in = 0
+
+    def feed(self, chunk):
+        """
+        Yeni sembolleri (0..255) kodlar.
+        Return: hazır olan sıkıştırılmış byte'lar (boş olabilir)
+        """
+        if self.finished:
+            raise ValueError("flush() sonrası veri eklenemez!")
+        data = as_symbols(chunk)
+        if len(data) == 0:
+            return self._writer.take_bytes()
+        self.bytes_in += len(data)
+
+        if self.policy == POLICY_LRU:
+            self._feed_lru(data)
+        elif self.policy == POLICY_RATIO:
+            # oran check_block'luk bloklar halinde izlenir; bloklar feed()
+            # çağrılarına bölünebilir, çıktı girdinin nasıl parçalandığına bağlı değildir
+            start = 0
+            while start < len(data):
+                block = data[start:start + self.check_block - self._block_bytes]
+                bits = self._writer.bit_count()
+                self._feed(block)
+                self._block_bits += self._writer.bit_count() - bits
+                self._block_bytes += len(block)
+                start += len(block)
+                if self._block_bytes == self.check_block:
+                    self._check_ratio(self._block_bytes, self._block_bits)
+                    self._block_bytes = self._block_bits = 0
+        else:
+            self._feed(data)
+        return self._writer.take_bytes()
+
+    def _feed(self, data):
+        """
+        "reset" / "ratio" politikaları: sözlük dolunca CLEAR ("reset") ya da
+        sözlük donar, yeni girdi eklenmez ("ratio", CLEAR'ı _check_ratio yazar).
+        """
+        get, put, write = self._get, self._put, self._writer.write
+        max_size, max_width = self._max_size, self.max_width
+        reset_on_full = self.policy == POLICY_RESET
+        next_code, width = self._next_code, self._width
+        w = self._w
+        if w is None:
+            w = data[0]
+            data = data[1:]
+        for c in data:
+            key = (w << 8) | c
+            code = get(key)
+            if code:
+                w = code
+                continue
+            write(w, width)
+            w = c
+            if next_code == max_size:
+                continue  # sözlük dolu ve donmuş
+            put(key, next_code)
+            next_code += 1
+            if next_code == max_size:
+                # sözlük doldu -> CLEAR yaz ve baştan başla
+                if reset_on_full:
+                    write(CLEAR_CODE, width)
+                    self._reset()
+                    next_code = self._first
+                    width = self._first_width
+            elif next_code > (1 << width) and width < max_width:
+                width += 1
+        self._next_code, self._width, self._w = next_code, width, w
+
+    def _check_ratio(self, nbytes, nbits):
+        """
+        "ratio" politikası: sözlük doluyken bloğun sıkıştırma oranı, o ana
+        kadarki en iyi blok oranının ratio_threshold katının altına düşerse
+        bekleyen cümle ve CLEAR yazılır, sözlük sıfırlanır.
+        """
+        if self._next_code < self._max_size or nbits == 0:
+            return
+        ratio = 8 * nbytes / nbits
+        if ratio >= self.ratio_threshold * self._best_ratio:
+            self._best_ratio = max(self._best_ratio, ratio)
+            return
+        write = self._writer.write
+        if self._w is not None:
+            write(self._w, self._width)
+        write(CLEAR_CODE, self._width)
+        self._reset()
+        self._next_code = self._first
+        self._width = self._first_width
+        self._w = None
+        self._best_ratio = 0.0
+
+    def _feed_lru(self, data):
+        """
+        "lru" politikası: sözlük dolunca en uzun süredir kullanılmayan yaprak
+        girdi çıkarılır ve kodu yeni girdiye verilir (CLEAR yazılmaz).
+        """
+        get, put, delete, write = self._get, self._put, self._delete, self._writer.write
+        lru, keys = self._lru, self._keys
+        max_size, max_width = self._max_size, self.max_width
+        next_code, width = self._next_code, self._width
+        w = self._w
+        if w is None:
+            w = data[0]
+            data = data[1:]
+        for c in data:
+            key = (w << 8) | c
+            code = get(key)
+            if code:
+                w = code
+                continue
+            write(w, width)
+            lru.touch(w)
+            if next_code < max_size:
+                slot = next_code
+                next_code += 1
+                if next_code > (1 << width) and width < max_width:
+                    width += 1
+            else:
+                slot = lru.victim(w)
+                if slot is not None:
+                    delete(keys[slot])
+                    lru.evict(slot)
+            if slot is not None:
+                put(key, slot)
+                keys[slot] = key
+                lru.add(slot, w)
+            w = c
+        self._next_code, self._width, self._w = next_code, width, w
+
+    def flush(self):
+        """
+        Son cümleyi ve EOI kodunu yazar, akışı kapatır.
+        Return: kalan sıkıştırılmış byte'lar
+        """
+        if self.finished:
+            return b""
+        self.finished = True
+        width = self._width
+        if self._w is not None:
+            self._writer.write(self._w, width)
+            if self._next_code + 1 > (1 << width) and width < self.max_width:
+                width += 1
+        self._writer.write(EOI_CODE, width)
+        self._writer.flush()
+        return self._writer.take_bytes()
+
+
+class LZWDecompressor:
+    """
+    LZWCompressor çıktısını artımlı olarak çözen decoder.
+    feed(chunk) gelen kodlardan çözülebilen çıktıyı hemen döndürür.
+    EOI görülünce eof True olur, sonrasındaki byte'lar unused_data'da kalır.
+    Sözlük politikası akış başlığından okunur.
+    """
+
+    def __init__(self, table="dict"):
+        self._table = table
+        self._header = b""
+        self._reader = None
+        self.eof = False
+        self.unused_data = b""
+
+    def _start(self, header):
+        self.policy, self.max_width, self.seed, _ = stream_header(header)
+        self._max_size = 1 << self.max_width
+        self._prefix, self._suffix = _decoder_tables(self._table, self._max_size)
+        self._first = FIRST_CODE
+        if self.seed is not None:
+            self._first = self.seed.end_code
+            self._prefix[FIRST_CODE:self._first], self._suffix[FIRST_CODE:self._first] = self.seed.tables()
+        self._lru = _LeafLRU(self._max_size, self._first) if self.policy == POLICY_LRU else None
+        self._reader = BitReader()
+        self._next_code = self._first
+        # son CLEAR'dan beri okunan kod sayısı (+ tohum girdileri; genişlik buna bağlı)
+        self._k = self._first - FIRST_CODE
+        self._width = code_width(self._k, self.max_width)
+        self._w = None
+
+    def feed(self, chunk):
+        """
+        Sıkıştırılmış byte'ları ekler.
+        Return: bu çağrıda çözülen semboller (bytes)
+        """
+        if self.eof:
+            self.unused_data += bytes(chunk)
+            return b""
+        if self._reader is None:
+            # başlık: 2 byte, tohum sözlük varsa + 4 byte id
+            self._header += bytes(chunk)
+            size = 6 if self._header[:1] and self._header[0] & SEED_FLAG else 2
+            if len(self._header) < size:
+                return b""
+            chunk = self._header[size:]
+            self._start(self._header[:size])
+        reader = self._reader
+        reader.feed(chunk)
+
+        prefix, suffix, lru = self._prefix, self._suffix, self._lru
+        max_size, max_width = self._max_size, self.max_width
+        next_code, k, width, w = self._next_code, self._k, self._width, self._w
+        out = bytearray()
+        while True:
+            code = reader.read(width)
+            if code is None:
+                break  # daha fazla veri bekleniyor
+            k += 1
+            if 257 + k >= (1 << width) and width < max_width:
+                width += 1
+            if code == CLEAR_CODE:
+                next_code = self._first
+                k = self._first - FIRST_CODE
+                width = code_width(k, max_width)
+                w = None
+                if lru is not None:
+                    lru = self._lru = _LeafLRU(max_size, self._first)
+                continue
+            if code == EOI_CODE:
+                self.eof = True
+                self.unused_data = reader.unread_bytes()
+                break
+
+            if w is None:
+                # CLEAR'dan sonraki ilk kod tek sembol ya da tohum sözlük girdisi
+                if code > 255 and not FIRST_CODE <= code < self._first:
+                    raise ValueError(f"Geçersiz code: {code}")
+                _write_phrase(out, code, prefix, suffix)
+                if lru is not None:
+                    lru.touch(code)
+                w = code
+                continue
+
+            # yeni girdinin kodu: sözlük dolana kadar next_code, sonra
+            # "lru"de çıkarılacak yaprak, diğerlerinde yok (sözlük donmuş)
+            if next_code < max_size:
+                slot = next_code
+            else:
+                slot = lru.victim(w) if lru is not None else None
+            if code == slot:
+                # özel durum (KwKwK): önceki cümle + kendi ilk sembolü
+                first = _write_phrase(out, w, prefix, suffix)
+                out.append(first)
+            elif code < 256 or FIRST_CODE <= code < next_code:
+                first = _write_phrase(out, code, prefix, suffix)
+            else:
+                raise ValueError(f"Geçersiz code: {code}")
+
+            if slot is not None:
+                if next_code < max_size:
+                    next_code += 1
+                else:
+                    lru.evict(slot)
+                prefix[slot] = w
+                suffix[slot] = first
+                if lru is not None:
+                    lru.add(slot, w)
+            if lru is not None:
+                lru.touch(code)
+            w = code
+
+        self._next_code, self._k, self._width, self._w = next_code, k, width, w
+        return bytes(out)
+
+
+def encode_variable(symbols, max_width=DEFAULT_MAX_CODE_WIDTH, table="dict", policy=POLICY_RESET,
+                    seed=None):
+    """
+    0..255 aralığındaki sembolleri değişken genişlikli LZW ile kodlar.
+    symbols: bytes, numpy uint8 dizisi veya int listesi
+    policy: sözlük dolunca uygulanacak politika (POLICIES)
+    seed: tohum sözlük (lzw_common.seed), yoksa None
+    Return: akışın tamamı (bytes)
+    """
+    compressor = LZWCompressor(max_width, table, policy, seed=seed)
+    return compressor.feed(symbols) + compressor.flush()
+
+
+def decode_variable(data, table="dict"):
+    """
+    encode_variable çıktısını çözer.
+    Return: çözülen semboller (bytearray, her eleman 0..255)
+    """
+    decompressor = LZWDecompressor(table)
+    out = bytearray(decompressor.feed(data))
+    if not decompressor.eof:
+        raise ValueError("EOI kodu bulunamadı, akış eksik!")
+    return out
+
+
+# ------------------------------------------------------------------------------
+# Önceden ayrılmış tampona çözme (çıktı boyu başlıktan biliniyorsa)
+# ------------------------------------------------------------------------------
+def _copy_phrases(codes, out, max_size=None, seed=None):
+    """
+    Kodları out tamponuna çözer. Yeni sözlük girdisi "önceki cümle + bu
+    cümlenin ilk sembolü"dür ve çıktıda zaten ardışık durur; bu yüzden
+    girdi yalnızca (offset, length) olarak saklanır.
+    max_size: değişken modda sözlük sınırı (CLEAR ile sıfırlanır), None => sabit mod
+    seed: tohum sözlük; girdileri çıktıda olmadığı için kendi blob'undan kopyalanır
+    Return: yazılan byte sayısı
+    """
+    buf = memoryview(out).cast("B")
+    size = len(buf)
+    variable = max_size is not None
+    table_size = max_size if variable else 256 + len(codes)
+    first_code = FIRST_CODE if variable else 256
+    clear = CLEAR_CODE if variable else -1
+    seed_end = 0
+    if seed is not None:
+        blob, seed_start, seed_length = seed.phrases()
+        first_code = seed_end = seed.end_code
+    # tablolar sabit genişlikli diziler: girdi başına Python int nesnesi tutulmaz
+    start = array("q", bytes(8 * table_size))
+    length = array("q", bytes(8 * table_size))
+
+    next_code = first_code
+    pos = prev_pos = prev_len = 0   # prev_len == 0 => henüz cümle yok (başlangıç / CLEAR)
+    for code in codes:
+        if code < 256:
+            n = 1
+            if pos >= size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos] = code
+        elif code == clear:
+            next_code = first_code
+            prev_len = 0
+            continue
+        elif code < seed_end:
+            s, n = seed_start[code], seed_length[code]
+            if pos + n > size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos:pos + n] = blob[s:s + n]
+        elif prev_len == 0:
+            raise ValueError(f"Geçersiz code: {code}")
+        elif first_code <= code < next_code:
+            s, n = start[code], length[code]
+            if pos + n > size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos:pos + n] = buf[s:s + n]
+        elif code == next_code:
+            # özel durum (KwKwK): önceki cümle + kendi ilk sembolü
+            n = prev_len + 1
+            if pos + n > size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos:pos + prev_len] = buf[prev_pos:pos]
+            buf[pos + prev_len] = buf[prev_pos]
+        else:
+            raise ValueError(f"Geçersiz code: {code}")
+
+        if prev_len and next_code < table_size:
+            start[next_code] = prev_pos
+            length[next_code] = prev_len + 1
+            next_code += 1
+        prev_pos, prev_len = pos, n
+        pos += n
+    return pos
+
+
+def _copy_phrases_lru(codes, out, max_size, seed=None):
+    """
+    _copy_phrases'in "lru" politikası için hali: sözlük dolunca yeni girdi,
+    encoder'la aynı şekilde seçilen (en eski yaprak) girdinin yerine yazılır.
+    """
+    buf = memoryview(out).cast("B")
+    size = len(buf)
+    start = array("q", bytes(8 * max_size))
+    length = array("q", bytes(8 * max_size))
+    first_code = FIRST_CODE
+    seed_end = 0
+    if seed is not None:
+        blob, seed_start, seed_length = seed.phrases()
+        first_code = seed_end = seed.end_code
+    lru = _LeafLRU(max_size, first_code)
+
+    next_code = first_code
+    pos = prev_pos = prev_len = 0
+    prev = None
+    for code in codes:
+        if code == CLEAR_CODE:
+            next_code = first_code
+            lru = _LeafLRU(max_size, first_code)
+            prev = None
+            continue
+        if prev is None:
+            if code > 255 and code >= seed_end:
+                raise ValueError(f"Geçersiz code: {code}")
+            slot = None
+        elif next_code < max_size:
+            slot = next_code
+        else:
+            slot = lru.victim(prev)
+
+        if code < 256:
+            n = 1
+            if pos >= size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos] = code
+        elif code < seed_end:
+            s, n = seed_start[code], seed_length[code]
+            if pos + n > size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos:pos + n] = blob[s:s + n]
+        elif code == slot:
+            # özel durum (KwKwK): önceki cümle + kendi ilk sembolü
+            n = prev_len + 1
+            if pos + n > size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos:pos + prev_len] = buf[prev_pos:pos]
+            buf[pos + prev_len] = buf[prev_pos]
+        elif FIRST_CODE <= code < next_code:
+            s, n = start[code], length[code]
+            if pos + n > size:
+                raise ValueError(f"Çözülen veri çıktı tamponundan büyük! (tampon: {size} byte)")
+            buf[pos:pos + n] = buf[s:s + n]
+        else:
+            raise ValueError(f"Geçersiz code: {code}")
+
+        if slot is not None:
+            if next_code < max_size:
+                next_code += 1
+            else:
+                lru.evict(slot)
+            start[slot] = prev_pos
+            length[slot] = prev_len + 1
+            lru.add(slot, prev)
+        lru.touch(code)
+        prev, prev_pos, prev_len = code, pos, n
+        pos += n
+    return pos
+
+
+def decode_fixed_into(codes, out):
+    """
+    decode_fixed'in önceden ayrılmış tampona yazan hali.
+    out: yazılabilir uint8 tampon (ör. np.empty(size, np.uint8)), boyu beklenen çıktı boyu
+    Return: yazılan byte sayısı (eksik veride len(out)'tan küçük olur)
+    """
+    if isinstance(codes, np.ndarray):
+        # memoryview üzerinde gezinmek kopyasız (list'e çevirmeden)
+        codes = memoryview(np.ascontiguousarray(codes, dtype=np.int64))
+    return _copy_phrases(codes, out)
+
+
+def _read_codes_at(buf, bit, width, count):
+    """
+    buf'ta (sonu 4 sıfır byte ile doldurulmuş uint8) bit konumundan başlayan
+    count tane width bitlik (MSB-first) kodu vektörel okur.
+    """
+    positions = bit + width * np.arange(count, dtype=np.int64)
+    index = positions >> 3
+    words = ((buf[index].astype(np.uint32) << 24) | (buf[index + 1].astype(np.uint32) << 16)
+             | (buf[index + 2].astype(np.uint32) << 8) | buf[index + 3])
+    return (words >> (32 - width - (positions & 7)).astype(np.uint32)) & ((1 << width) - 1)
+
+
+def variable_codes(data):
+    """
+    Değişken genişlikli akışın kodlarını (EOI'ye kadar, CLEAR dahil) okur.
+    Kod genişliği yalnızca CLEAR'dan beri okunan kod sayısına bağlı olduğu
+    için (code_width) akış sabit genişlikli parçalar halinde vektörel okunur.
+    En büyük genişlikte parçalar "reset"in CLEAR aralığı kadardır ("reset"te
+    parça tam CLEAR'da biter; "ratio" / "lru"da CLEAR her yerde olabilir).
+    Return: (kodlar array("H" / "I"), max_width)
+    """
+    data = memoryview(data).cast("B")
+    _, max_width, seed, header_size = stream_header(data)
+    buf = np.frombuffer(bytes(data[header_size:]) + bytes(4), dtype=np.uint8)
+    total_bits = (len(data) - header_size) * 8
+    codes = array("H" if max_width <= 16 else "I")
+    dtype = np.uint16 if max_width <= 16 else np.uint32
+    # "reset"te CLEAR'lar arasındaki kod sayısı: (max_size - FIRST_CODE) veri kodu + CLEAR
+    segment = (1 << max_width) - FIRST_CODE + 1
+
+    bit = 0
+    k0 = 0 if seed is None else len(seed)  # tohum girdileri genişliği büyütür
+    k = k0  # son CLEAR'dan beri okunan kod sayısı (+ k0)
+    while True:
+        width = code_width(k, max_width)
+        # bu genişlikle okunacak kodlar: genişlik artana kadar (ya da bir parça)
+        count = (1 << width) - 257 - k if width < max_width else segment - k % segment
+        count = min(count, (total_bits - bit) // width)
+        if count <= 0:
+            raise ValueError("EOI kodu bulunamadı, akış eksik!")
+        run = _read_codes_at(buf, bit, width, count)
+        special = np.flatnonzero((run == CLEAR_CODE) | (run == EOI_CODE))
+        if len(special):
+            i = int(special[0])
+            if run[i] == EOI_CODE:
+                codes.frombytes(run[:i].astype(dtype).tobytes())
+                return codes, max_width
+            codes.frombytes(run[:i + 1].astype(dtype).tobytes())
+            bit += (i + 1) * width
+            k = k0
+            continue
+        codes.frombytes(run.astype(dtype).tobytes())
+        bit += count * width
+        k += count
+
+
+def decode_variable_into(data, out):
+    """
+    decode_variable'ın önceden ayrılmış tampona yazan hali.
+    out: yazılabilir uint8 tampon, boyu beklenen çıktı boyu
+    Return: yazılan byte sayısı
+    """
+    policy, max_width, seed, _ = stream_header(memoryview(data).cast("B"))
+    codes, _ = variable_codes(data)
+    return decode_codes_into(codes, out, policy, max_width, seed)
+
+
+def decode_codes_into(codes, out, policy=POLICY_RESET, max_width=None, seed=None):
+    """
+    Akıştan önceden okunmuş kodları (ör. lzw_common.entropy'den; değişken
+    modda CLEAR dahil, EOI hariç) out tamponuna çözer.
+    max_width: None => sabit mod, aksi halde akış başlığındaki değerler
+    (politika, max_width, tohum sözlük; stream_header)
+    Return: yazılan byte sayısı
+    """
+    if isinstance(codes, np.ndarray):
+        codes = memoryview(np.ascontiguousarray(codes, dtype=np.int64))
+    if max_width is None:
+        return _copy_phrases(codes, out)
+    if policy == POLICY_LRU:
+        return _copy_phrases_lru(codes, out, 1 << max_width, seed)
+    return _copy_phrases(codes, out, 1 << max_width, seed)
@@ -0,0 +1,313 @@
+# File: predictors.py
+"""
+Tahmin ediciler (predictor) ve artık (residual) dönüşümleri.
+
+Her piksel x için komşular: a = sol, b = üst, c = sol-üst (resim dışı => 0).
+Artık = (x - tahmin) % 256. Desteklenen tahmin ediciler:
+  none    : 0
+  left    : a                (Level 3/5'teki satır farkı)
+  up      : b
+  average : (a + b) // 2
+  paeth   : PNG Paeth
+  med     : LOCO-I / JPEG-LS median edge detector
+"adaptive" modunda her karo (tile; varsayılan: her satır) için en düşük
+tahmini entropiyi veren tahmin edici seçilir, seçimler başlıkta saklanır.
+zigzag=True ise artıklar 0, -1, 1, -2, 2 ... => 0, 1, 2, 3, 4 ... şeklinde
+yeniden numaralanır (küçük hatalar küçük değerlere düşer).
+
+Kodlama tamamen vektöreldir. Geri alma left/up için cumsum, diğerleri
+için anti-köşegen dalga cephesi (wavefront) ile yapılır: (r, j) pikseli
+yalnızca r + j'den küçük köşegenlerdeki piksellere bağlıdır.
+"""
+
+import struct
+
+import numpy as np
+
+from .scan import check_scan_order, scan_order_name, SCAN_ORDERS, SCAN_ROW_MAJOR
+
+PREDICTORS = {
+    "none": 0,
+    "left": 1,
+    "up": 2,
+    "average": 3,
+    "paeth": 4,
+    "med": 5,
+}
+PREDICTOR_NAMES = {pid: name for name, pid in PREDICTORS.items()}
+ADAPTIVE = "adaptive"
+ADAPTIVE_ID = 255
+
+# başlık: [0xFF][predictor id][flags][width u32][height u32]
+#         (+ adaptive ise [tile_rows u32][tile_cols u32][karo başına 1 byte seçim])
+# 0xFF işareti, başlıksız eski akışların ilk byte'ından (padding 0..7) ayırt eder.
+# flags: bit 0 zigzag, bit 1-3 tarama sırası id'si (lzw_common.scan; 0 => row-major)
+PREDICTOR_MARKER = 0xFF
+FLAG_ZIGZAG = 0x01
+FLAG_SCAN_SHIFT = 1
+FLAG_SCAN_MASK = 0x0E
+_HEADER = struct.Struct("<BBBII")
+_TILE = struct.Struct("<II")
+
+# entropi tahmini sırasında tek seferde işlenecek yaklaşık örnek sayısı
+CHUNK_SAMPLES = 1 << 22
+
+_ZIGZAG = np.array([(s << 1) ^ (s >> 7) for s in (v if v < 128 else v - 256 for v in range(256))],
+                   dtype=np.uint8)
+_UNZIGZAG = np.argsort(_ZIGZAG).astype(np.uint8)
+
+
+def predictor_id(predictor):
+    """
+    İsim -> id ('adaptive' => 255).
+    """
+    if predictor == ADAPTIVE:
+        return ADAPTIVE_ID
+    if predictor not in PREDICTORS:
+        raise ValueError(f"Bilinmeyen predictor: {predictor}")
+    return PREDICTORS[predictor]
+
+
+def is_legacy(predictor, zigzag):
+    """
+    Eski (başlıksız) Level 3/5 formatıyla aynı mı? (left, zigzag yok)
+    """
+    return predictor == "left" and not zigzag
+
+
+def zigzag_encode(residual):
+    return _ZIGZAG[residual]
+
+
+def zigzag_decode(mapped):
+    return _UNZIGZAG[mapped]
+
+
+def _predict(pid, a, b, c):
+    """
+    a, b, c: int16 diziler. Return: int16 tahmin
+    """
+    if pid == 0:
+        return np.zeros_like(a)
+    if pid == 1:
+        return a
+    if pid == 2:
+        return b
+    if pid == 3:
+        return (a + b) >> 1
+    if pid == 4:
+        p = a + b - c
+        pa = np.abs(p - a)
+        pb = np.abs(p - b)
+        pc = np.abs(p - c)
+        return np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+    if pid == 5:
+        mn = np.minimum(a, b)
+        mx = np.maximum(a, b)
+        return np.where(c >= mx, mn, np.where(c <= mn, mx, a + b - c))
+    raise ValueError(f"Bilinmeyen predictor id: {pid}")
+
+
+def _neighbours(image):
+    """
+    (H, W[, C]) uint8 -> a, b, c (int16, resim dışı 0)
+    """
+    x = image.astype(np.int16)
+    a = np.zeros_like(x)
+    b = np.zeros_like(x)
+    c = np.zeros_like(x)
+    a[:, 1:] = x[:, :-1]
+    b[1:] = x[:-1]
+    c[1:, 1:] = x[:-1, :-1]
+    return x, a, b, c
+
+
+def _tile_shape(tile, height, width):
+    rows, cols = tile
+    return (rows or height), (cols or width)
+
+
+def expand_selection(selection, tile, height, width):
+    """
+    Karo başına seçimi piksel başına (H, W) haritaya genişletir.
+    """
+    rows, cols = _tile_shape(tile, height, width)
+    return np.repeat(np.repeat(selection, rows, axis=0), cols, axis=1)[:height, :width]
+
+
+def choose_predictors(image, tile=(1, 0), candidates=None):
+    """
+    Her karo için, artıkların histogram entropisi (bit) en düşük olan
+    tahmin ediciyi seçer. Renkli resimde kanalların toplamı kullanılır.
+    Return: (karo_satır, karo_sütun) uint8 id haritası
+    """
+    candidates = list(PREDICTORS.values()) if candidates is None else candidates
+    height, width = image.shape[:2]
+    rows, cols = _tile_shape(tile, height, width)
+    tiles_y = -(-height // rows)
+    tiles_x = -(-width // cols)
+    # her sütunun karo indeksi
+    col_tile = (np.arange(width) // cols).astype(np.int64)
+
+    # bellek sınırlı kalsın diye, karo sınırlarına hizalı satır blokları
+    per_row = width * (image.size // (height * width))
+    band = max(rows, (CHUNK_SAMPLES // max(per_row, 1)) // rows * rows)
+    costs = np.zeros((len(candidates), tiles_y, tiles_x))
+    x, a, b, c = _neighbours(image)
+    for start in range(0, height, band):
+        stop = min(height, start + band)
+        row_tile = (np.arange(start, stop) // rows - start // rows).astype(np.int64)
+        tile_index = row_tile[:, None] * tiles_x + col_tile[None, :]
+        if x.ndim == 3:
+            tile_index = np.repeat(tile_index[:, :, None], x.shape[2], axis=2)
+        n_tiles = (-(-stop // rows) - start // rows) * tiles_x
+        for i, pid in enumerate(candidates):
+            pred = _predict(pid, a[start:stop], b[start:stop], c[start:stop])
+            residual = (x[start:stop] - pred) & 0xFF
+            hist = np.bincount((tile_index * 256 + residual).ravel(),
+                               minlength=n_tiles * 256).reshape(n_tiles, 256)
+            totals = hist.sum(axis=1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                bits = -np.nansum(hist * np.log2(hist / totals), axis=1)
+            costs[i, start // rows:start // rows + n_tiles // tiles_x] += bits.reshape(-1, tiles_x)
+    best = np.argmin(costs, axis=0)
+    return np.asarray(candidates, dtype=np.uint8)[best]
+
+
+def encode_residuals(image, predictor="left", zigzag=False, tile=(1, 0)):
+    """
+    image: (H, W) veya (H, W, C) uint8
+    Return: (artık dizisi uint8 aynı şekil, adaptive ise seçim haritası yoksa None)
+    """
+    image = np.asarray(image, dtype=np.uint8)
+    x, a, b, c = _neighbours(image)
+    selection = None
+    if predictor == ADAPTIVE:
+        selection = choose_predictors(image, tile)
+        pixel_map = expand_selection(selection, tile, *image.shape[:2])
+        if image.ndim == 3:
+            pixel_map = pixel_map[:, :, None]
+        pred = np.zeros_like(x)
+        for pid in np.unique(selection):
+            pred = np.where(pixel_map == pid, _predict(int(pid), a, b, c), pred)
+    else:
+        pred = _predict(predictor_id(predictor), a, b, c)
+    residual = ((x - pred) & 0xFF).astype(np.uint8)
+    if zigzag:
+        residual = zigzag_encode(residual)
+    return residual, selection
+
+
+def decode_residuals(residual, predictor="left", zigzag=False, tile=(1, 0), selection=None):
+    """
+    encode_residuals'ın tersi. Return: orijinal resim (uint8, aynı şekil)
+    """
+    residual = np.asarray(residual, dtype=np.uint8)
+    if zigzag:
+        residual = zigzag_decode(residual)
+    if predictor == "none":
+        return residual.copy()
+    if predictor == "left":
+        return np.cumsum(residual, axis=1, dtype=np.uint8)
+    if predictor == "up":
+        return np.cumsum(residual, axis=0, dtype=np.uint8)
+
+    height, width = residual.shape[:2]
+    if predictor == ADAPTIVE:
+        pixel_map = expand_selection(selection, tile, height, width)
+        used = [int(pid) for pid in np.unique(selection)]
+    else:
+        pixel_map = None
+        used = [predictor_id(predictor)]
+    return _wavefront(residual, pixel_map, used)
+
+
+def _wavefront(residual, pixel_map, used):
+    """
+    Anti-köşegenler boyunca geri alma. (H+1, W+1) sıfır dolgulu dizide
+    bir köşegenin pikselleri W adımlı düz bir dilimdir; bu yüzden her
+    köşegen fancy indexing olmadan tek seferde işlenir.
+    """
+    height, width = residual.shape[:2]
+    extra = residual.shape[2:]
+    stride = width + 1
+    out = np.zeros(((height + 1) * stride,) + extra, dtype=np.int16)
+    res = residual.reshape((height * width,) + extra).astype(np.int16)
+    ids = None if pixel_map is None else pixel_map.reshape(-1)
+    step = max(width - 1, 1)
+
+    for d in range(height + width - 1):
+        r0 = max(0, d - width + 1)
+        r1 = min(height - 1, d)
+        n = r1 - r0 + 1
+        # (r, d - r) pikselinin dolgulu dizideki yeri: (r + 1) * stride + d - r + 1
+        pos = (r0 + 1) * stride + d - r0 + 1
+        cur = slice(pos, pos + (n - 1) * width + 1, width)
+        a = out[pos - 1:pos - 1 + (n - 1) * width + 1:width]
+        b = out[pos - stride:pos - stride + (n - 1) * width + 1:width]
+        c = out[pos - stride - 1:pos - stride - 1 + (n - 1) * width + 1:width]
+        src = r0 * width + d - r0
+        r = res[src:src + (n - 1) * step + 1:step] if n > 1 else res[src:src + 1]
+
+        if ids is None:
+            pred = _predict(used[0], a, b, c)
+        else:
+            sel = ids[src:src + (n - 1) * step + 1:step] if n > 1 else ids[src:src + 1]
+            if extra:
+                sel = sel[:, None]
+            pred = np.zeros_like(a)
+            for pid in used:
+                pred = np.where(sel == pid, _predict(pid, a, b, c), pred)
+        out[cur] = (r + pred) & 0xFF
+
+    out = out.reshape((height + 1, width + 1) + extra)
+    return out[1:, 1:].astype(np.uint8)
+
+
+# ------------------------------------------------------------------------------
+# Başlık (akışta tahmin edici seçiminin saklanması)
+# ------------------------------------------------------------------------------
+def pack_header(width, height, predictor, zigzag, tile=(1, 0), selection=None, scan=SCAN_ROW_MAJOR):
+    """
+    Return: başlık byte'ları
+    """
+    flags = FLAG_ZIGZAG if zigzag else 0
+    flags |= SCAN_ORDERS.index(check_scan_order(scan)) << FLAG_SCAN_SHIFT
+    header = _HEADER.pack(PREDICTOR_MARKER, predictor_id(predictor), flags, width, height)
+    if predictor == ADAPTIVE:
+        header += _TILE.pack(*tile) + np.ascontiguousarray(selection, dtype=np.uint8).tobytes()
+    return header
+
+
+def has_header(data, offset=0):
+    return len(data) > offset and data[offset] == PREDICTOR_MARKER
+
+
+def unpack_header(data, offset=0):
+    """
+    Return: (alanlar dict'i, başlıktan sonraki offset)
+    alanlar: width, height, predictor, zigzag, scan, tile, selection
+    """
+    marker, pid, flags, width, height = _HEADER.unpack_from(data, offset)
+    if marker != PREDICTOR_MARKER:
+        raise ValueError("Predictor başlığı bulunamadı!")
+    offset += _HEADER.size
+    fields = {
+        "width": width,
+        "height": height,
+        "predictor": ADAPTIVE if pid == ADAPTIVE_ID else PREDICTOR_NAMES[pid],
+        "zigzag": bool(flags & FLAG_ZIGZAG),
+        "scan": scan_order_name((flags & FLAG_SCAN_MASK) >> FLAG_SCAN_SHIFT),
+        "tile": (1, 0),
+        "selection": None,
+    }
+    if pid == ADAPTIVE_ID:
+        tile = _TILE.unpack_from(data, offset)
+        offset += _TILE.size
+        rows, cols = _tile_shape(tile, height, width)
+        count = (-(-height // rows)) * (-(-width // cols))
+        selection = np.frombuffer(bytes(data[offset:offset + count]), dtype=np.uint8)
+        offset += count
+        fields["tile"] = tile
+        fields["selection"] = selection.reshape(-(-height // rows), -(-width // cols))
+    return fields, offset
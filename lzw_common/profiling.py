@@ -0,0 +1,196 @@
+# File: profiling.py
+"""
+Aşama bazlı ölçüm: sıkıştırma/açma adımlarının (oku, tahmin, LZW, paketle,
+yaz ...) süresi, giren/çıkan byte sayısı ve isteğe bağlı tepe bellek kullanımı.
+
+Kullanım:
+    prof = Profiler(trace_memory=True)
+    with prof.stage("read") as st:
+        data = f.read()
+        st["bytes_out"] = len(data)
+    prof.report()          # {"stages": [...], "seconds": ..., ...}
+
+Her aşama bir dict'tir: {"stage", "seconds", "bytes_in", "bytes_out", "peak_bytes"}.
+peak_bytes yalnızca trace_memory=True iken (tracemalloc) ölçülür, aksi halde None.
+cprofile=True ise profiler açıkken (with prof: ...) cProfile çalışır,
+print_stats() en pahalı fonksiyonları yazdırır.
+Birden çok çalıştırmanın (ör. batch) raporları aggregate() ile toplanır.
+Ölçüm istenmeyen yerlerde NullProfiler aynı arayüzü hiçbir şey kaydetmeden sunar.
+"""
+
+import io
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Profiler:
+    """
+    Aşama kayıtlarını toplayan ölçüm nesnesi.
+    callback: her aşama bittiğinde aşama dict'i ile çağrılır
+    """
+
+    def __init__(self, trace_memory=False, cprofile=False, callback=None):
+        self.trace_memory = trace_memory
+        self.callback = callback
+        self.stages = []
+        self.profile = cProfile.Profile() if cprofile else None
+        self._stack = []          # iç içe aşamalar: [başlangıç belleği, görülen tepe]
+        self._started_tracing = False
+        self._active = 0
+
+    # --------------------------------------------------------------------------
+    # with prof: ...  => tracemalloc / cProfile açık
+    # --------------------------------------------------------------------------
+    def __enter__(self):
+        if self._active == 0:
+            self._start_tracing()
+            if self.profile is not None:
+                self.profile.enable()
+        self._active += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._active -= 1
+        if self._active == 0:
+            if self.profile is not None:
+                self.profile.disable()
+            self._stop_tracing()
+        return False
+
+    def _start_tracing(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def _stop_tracing(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name, bytes_in=None):
+        """
+        Bir aşamayı ölçer; yield edilen dict'e bytes_in / bytes_out yazılabilir.
+        """
+        record = {"stage": name, "seconds": 0.0, "bytes_in": bytes_in,
+                  "bytes_out": None, "peak_bytes": None}
+        with self:
+            tracing = self.trace_memory and tracemalloc.is_tracing()
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                if self._stack:
+                    # dış aşamanın o ana kadarki tepesini kaybetmemek için
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                tracemalloc.reset_peak()
+                self._stack.append([current, current])
+            start = time.perf_counter()
+            try:
+                yield record
+            finally:
+                record["seconds"] = time.perf_counter() - start
+                if tracing:
+                    base, seen = self._stack.pop()
+                    peak = max(seen, tracemalloc.get_traced_memory()[1])
+                    record["peak_bytes"] = peak - base
+                    if self._stack:
+                        self._stack[-1][1] = max(self._stack[-1][1], peak)
+                self.stages.append(record)
+                if self.callback is not None:
+                    self.callback(record)
+
+    def report(self):
+        """
+        Return: {"stages": [...], "seconds": toplam süre, "peak_bytes": en büyük tepe}
+        """
+        peaks = [s["peak_bytes"] for s in self.stages if s["peak_bytes"] is not None]
+        return {
+            "stages": [dict(s) for s in self.stages],
+            "seconds": sum(s["seconds"] for s in self.stages),
+            "peak_bytes": max(peaks) if peaks else None,
+        }
+
+    def reset(self):
+        self.stages = []
+        if self.profile is not None:
+            self.profile = cProfile.Profile()
+
+    def print_stats(self, limit=20, sort="cumulative", file=None):
+        """
+        cProfile sonuçlarından en pahalı limit fonksiyonu yazdırır.
+        """
+        if self.profile is None:
+            raise ValueError("cProfile kapalı! Profiler(cprofile=True) kullanın.")
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats(sort).print_stats(limit)
+        print(out.getvalue(), file=file)
+
+
+class NullProfiler:
+    """
+    Profiler ile aynı arayüz, ama hiçbir şey ölçmez / saklamaz
+    (profiler verilmeyen uzun ömürlü nesnelerde kayıtlar birikmesin diye).
+    """
+
+    stages = ()
+    profile = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @contextmanager
+    def stage(self, name, bytes_in=None):
+        yield {"stage": name, "seconds": 0.0, "bytes_in": bytes_in,
+               "bytes_out": None, "peak_bytes": None}
+
+    def report(self):
+        return {"stages": [], "seconds": 0.0, "peak_bytes": None}
+
+    def reset(self):
+        pass
+
+    def print_stats(self, limit=20, sort="cumulative", file=None):
+        raise ValueError("cProfile kapalı! Profiler(cprofile=True) kullanın.")
+
+
+def aggregate(reports):
+    """
+    Birden çok report()'u (veya aşama listesini) aşama adına göre toplar.
+    Return: {aşama: {"count", "seconds", "bytes_in", "bytes_out", "peak_bytes"}}
+    (süre ve byte'lar toplam, peak_bytes en büyük değer; sıra ilk görülme sırası)
+    """
+    totals = {}
+    for report in reports:
+        stages = report["stages"] if isinstance(report, dict) else report
+        for s in stages:
+            total = totals.setdefault(s["stage"], {"count": 0, "seconds": 0.0, "bytes_in": 0,
+                                                   "bytes_out": 0, "peak_bytes": None})
+            total["count"] += 1
+            total["seconds"] += s["seconds"]
+            total["bytes_in"] += s["bytes_in"] or 0
+            total["bytes_out"] += s["bytes_out"] or 0
+            if s["peak_bytes"] is not None:
+                total["peak_bytes"] = max(total["peak_bytes"] or 0, s["peak_bytes"])
+    return totals
+
+
+def format_stages(stages):
+    """
+    Aşama listesi (veya aggregate() çıktısı) için okunabilir tablo.
+    Return: str
+    """
+    if isinstance(stages, dict):
+        stages = [dict(v, stage=k) for k, v in stages.items()]
+    total = sum(s["seconds"] for s in stages) or 1.0
+    lines = [f"{'aşama':14} {'süre (s)':>10} {'%':>6} {'girdi':>12} {'çıktı':>12} {'tepe bellek':>12}"]
+    for s in stages:
+        def num(v):
+            return "-" if v is None else f"{v:,d}"
+        lines.append(f"{s['stage']:14} {s['seconds']:10.4f} {100 * s['seconds'] / total:6.1f} "
+                     f"{num(s['bytes_in']):>12} {num(s['bytes_out']):>12} {num(s['peak_bytes']):>12}")
+    return "\n".join(lines)
@@ -0,0 +1,194 @@
+# File: scan.py
+"""
+Tarama sırası: (tahmin artıkları dahil) piksellerin LZW'ye hangi sırayla
+verildiği.
+
+LZW yalnızca art arda gelen sembollerde tekrar eden öbekleri (phrase) görür;
+satır satır taramada bir pikselin üst komşusu bir satır genişliği kadar
+uzakta kalır. 2D yakınlığı koruyan sıralar benzer bölgeleri yan yana
+getirir, sözlükteki öbekler daha sık tekrar eder:
+
+    "row-major"    : satır satır (varsayılan, eski format); renkli
+                     resimde kanallar ardışık (planar): R..., G..., B...
+    "column-major" : sütun sütun
+    "tile-raster"  : SCAN_TILE x SCAN_TILE karolar satır satır, karo içinde satır satır
+    "hilbert"      : Hilbert eğrisi; resim 2'nin kuvveti kenarlı (en kısa
+                     kenara sığan en büyük) karelere bölünür, kareler satır
+                     satır, her kare içinde Hilbert sırası (resim dışı
+                     noktalar atlanır)
+    "interleaved"  : piksel piksel kanallar iç içe: R G B R G B ...
+
+interleaved dışındaki sıralar her kanala ayrı uygulanır (kanallar planar
+kalır). column-major ve interleaved yalnızca eksen değiştirme olduğu için
+reshape / transpose ile yapılır, indeks dizisi kurulmaz. tile-raster ve
+hilbert için tek bir (yükseklik, genişlik) düzleminin permütasyonu NumPy ile
+vektörel hesaplanır ve her kanala uygulanır; permütasyonlar toplamı
+CACHE_BYTES'ı aşmayacak şekilde önbellekte tutulur (aynı boyuttaki karolar /
+şeritler tekrar hesaplamaz, daha büyükleri her seferinde hesaplanır).
+Seçim blok başlığında (lzw_common.predictors) ve konteyner başlığında saklanır.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+SCAN_ROW_MAJOR = "row-major"
+SCAN_COLUMN_MAJOR = "column-major"
+SCAN_TILE_RASTER = "tile-raster"
+SCAN_HILBERT = "hilbert"
+SCAN_INTERLEAVED = "interleaved"
+
+# id = sıra (başlıklara yazılır)
+SCAN_ORDERS = (SCAN_ROW_MAJOR, SCAN_COLUMN_MAJOR, SCAN_TILE_RASTER, SCAN_HILBERT, SCAN_INTERLEAVED)
+
+# tile-raster karo kenarı (piksel; formatın parçası, değiştirilemez)
+SCAN_TILE = 16
+
+# önbellekteki permütasyonların toplam boyu (byte); bundan büyük permütasyon önbelleğe girmez
+CACHE_BYTES = 64 << 20
+
+_cache = OrderedDict()     # (yükseklik, genişlik, sıra) -> permütasyon, en eski başta
+_cache_lock = threading.Lock()
+
+
+def check_scan_order(order):
+    """
+    Return: order (geçerliyse)
+    """
+    if order not in SCAN_ORDERS:
+        raise ValueError(f"Bilinmeyen tarama sırası: {order!r} (seçenekler: {', '.join(SCAN_ORDERS)})")
+    return order
+
+
+def scan_order_name(order_id):
+    """
+    Başlıktaki id -> isim.
+    """
+    if order_id >= len(SCAN_ORDERS):
+        raise ValueError(f"Bilinmeyen tarama sırası id'si: {order_id}")
+    return SCAN_ORDERS[order_id]
+
+
+def _hilbert_index(x, y, side):
+    """
+    x, y: kare içi koordinatlar (int64 diziler), side: 2'nin kuvveti
+    Return: Hilbert eğrisi üzerindeki sıra (int64 dizi)
+    """
+    x, y = x.copy(), y.copy()
+    d = np.zeros_like(x)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # alt çeyreği standart yöne döndür
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return d
+
+
+def _order_2d(height, width, order):
+    """
+    Return: (height * width) düzleminin tarama sırası (int64 indeksler;
+    yalnızca tile-raster ve hilbert)
+    """
+    y, x = np.divmod(np.arange(height * width, dtype=np.int64), width)
+    if order == SCAN_TILE_RASTER:
+        side = SCAN_TILE
+        key = (y // side * -(-width // side) + x // side) * side * side + (y % side) * side + x % side
+    else:
+        side = 1 << (min(height, width).bit_length() - 1)
+        key = (y // side * -(-width // side) + x // side) * side * side \
+            + _hilbert_index(x % side, y % side, side)
+    # anahtarlar tekil: sıralama permütasyonu verir
+    return np.argsort(key)
+
+
+def _split_shape(shape):
+    """
+    Return: (kanal, yükseklik, genişlik)
+    """
+    shape = tuple(int(n) for n in shape)
+    if len(shape) == 2:
+        return (1,) + shape
+    return shape
+
+
+def scan_permutation(shape, order):
+    """
+    shape: (h, w) veya (C, h, w) planar sembol dizisinin şekli
+    Return: tek bir (h, w) düzleminin permütasyonu (salt okunur, intp) -
+    taranan_kanal[i] = kanal.ravel()[perm[i]]; eksen değiştirmeyle yapılan
+    sıralar (row-major, column-major, interleaved) ve boş düzlemler için None
+    """
+    check_scan_order(order)
+    _, height, width = _split_shape(shape)
+    if order not in (SCAN_TILE_RASTER, SCAN_HILBERT) or height * width == 0:
+        return None
+    key = (height, width, order)
+    with _cache_lock:
+        perm = _cache.get(key)
+        if perm is not None:
+            _cache.move_to_end(key)
+            return perm
+    perm = _order_2d(height, width, order).astype(np.intp, copy=False)
+    perm.flags.writeable = False
+    if perm.nbytes <= CACHE_BYTES:
+        with _cache_lock:
+            _cache[key] = perm
+            total = sum(p.nbytes for p in _cache.values())
+            while total > CACHE_BYTES:
+                total -= _cache.popitem(last=False)[1].nbytes
+    return perm
+
+
+def clear_scan_cache():
+    """
+    Önbellekteki permütasyonları bırakır.
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+def scan_symbols(symbols, shape, order):
+    """
+    symbols: planar sembol dizisi (boyu prod(shape), ör. blocks.block_symbols)
+    Return: tarama sırasında 1D uint8 dizi (row-major => kopyasız görünüm)
+    """
+    flat = np.asarray(symbols, dtype=np.uint8).reshape(-1)
+    channels, height, width = _split_shape(shape)
+    if order == SCAN_COLUMN_MAJOR:
+        return flat.reshape(channels, height, width).transpose(0, 2, 1).ravel()
+    if order == SCAN_INTERLEAVED:
+        return flat.reshape(channels, height * width).T.ravel()
+    perm = scan_permutation((height, width), order)
+    if perm is None:
+        return flat
+    if channels == 1:
+        return flat[perm]
+    # kanal kanal: permütasyon tek düzlem boyunda kalır
+    return np.concatenate([plane[perm] for plane in flat.reshape(channels, -1)])
+
+
+def unscan_symbols(data, shape, order):
+    """
+    scan_symbols'un tersi.
+    Return: planar sırada 1D uint8 dizi
+    """
+    data = np.asarray(data, dtype=np.uint8).reshape(-1)
+    channels, height, width = _split_shape(shape)
+    if order == SCAN_COLUMN_MAJOR:
+        return data.reshape(channels, width, height).transpose(0, 2, 1).ravel()
+    if order == SCAN_INTERLEAVED:
+        return data.reshape(height * width, channels).T.ravel()
+    perm = scan_permutation((height, width), order)
+    if perm is None:
+        return data
+    out = np.empty_like(data)
+    for src, dst in zip(data.reshape(channels, -1), out.reshape(channels, -1)):
+        dst[perm] = src
+    return out
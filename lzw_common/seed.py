@@ -0,0 +1,321 @@
+# File: seed.py
+"""
+Önceden eğitilmiş (tohum) sözlükler: çok sayıda küçük ve birbirine benzeyen
+resim (küçük resimler, ikonlar ...) için LZW sözlüğü yalnızca 256 tek byte'lık
+girdiyle değil, örnek bir derlemden öğrenilmiş cümlelerle başlar. Küçük bir
+dosyanın büyük kısmı böylece literal kodlar yerine uzun cümlelerle kodlanır.
+
+Tohum sözlük FIRST_CODE'dan başlayan (prefix kodu, son sembol) girdileridir;
+her girdinin prefix'i ya tek byte ya da kendinden önceki bir girdidir. Kimliği
+(id) içeriğinin crc32'sidir ve değişken genişlikli akış başlığında saklanır
+(lzw modülü); açarken aynı id'li sözlük bulunmalıdır.
+
+Artefakt dosyası (<id 8 hex>.lzws, little-endian):
+    [b"LZWS"][version u8][count u32][id u32][prefix u32 * count][suffix u8 * count]
+
+Sözlükler süreç başına bir kez yüklenir (load_seed önbelleği). id ile arama
+önce önbelleğe, sonra LZW_SEED_PATH ortam değişkenindeki klasörlere bakar.
+Süreç havuzuna giden işlerde dosyadan yüklenmiş bir sözlüğün yalnızca yolu
+pickle'lanır, işçi süreç de onu bir kez yükler.
+
+Komut satırı (depo kök dizininden):
+    python -m lzw_common.seed train -l 3 -n 4096 -o seeds/ ikonlar/ "küçük/**/*.bmp"
+    python -m lzw_common.seed info seeds/1a2b3c4d.lzws
+"""
+
+import os
+import sys
+import zlib
+import struct
+import argparse
+from array import array
+
+import numpy as np
+
+from .lzw import FIRST_CODE, as_symbols
+from .blocks import block_symbols
+from .scan import SCAN_ORDERS, SCAN_ROW_MAJOR
+from .container import LEVELS
+from .imageio import read_image
+from .batch import collect_jobs
+
+SEED_MAGIC = b"LZWS"
+SEED_VERSION = 1
+SEED_SUFFIX = ".lzws"
+SEED_PATH_ENV = "LZW_SEED_PATH"
+DEFAULT_SEED_SIZE = 2048
+DEFAULT_MAX_NODES = 1 << 18
+
+_HEADER = struct.Struct("<4sBII")  # magic, version, girdi sayısı, id
+
+_CACHE = {}  # id -> sözlük, mutlak dosya yolu -> sözlük
+
+
+class SeedDictionary:
+    """
+    prefix: girdilerin prefix kodları (< 256 tek byte, aksi halde önceki bir girdi)
+    suffix: girdilerin son sembolleri
+    i. girdinin kodu FIRST_CODE + i'dir; ilk serbest kod end_code.
+    """
+
+    def __init__(self, prefix, suffix, path=None):
+        self.prefix = np.ascontiguousarray(prefix, dtype=np.uint32)
+        self.suffix = np.ascontiguousarray(suffix, dtype=np.uint8)
+        if self.prefix.ndim != 1 or len(self.prefix) != len(self.suffix):
+            raise ValueError("prefix ve suffix aynı uzunlukta tek boyutlu diziler olmalı!")
+        codes = FIRST_CODE + np.arange(len(self.prefix))
+        if np.any((self.prefix >= 256) & ((self.prefix < FIRST_CODE) | (self.prefix >= codes))):
+            raise ValueError("Geçersiz tohum sözlük: prefix tek byte ya da önceki bir girdi olmalı!")
+        self.id = zlib.crc32(self.prefix.astype("<u4").tobytes() + self.suffix.tobytes())
+        self.path = path
+        self._encoder_map = None
+        self._tables = None
+        self._phrases = None
+
+    def __len__(self):
+        return len(self.prefix)
+
+    def __repr__(self):
+        return f"SeedDictionary(id={self.id:08x}, girdi={len(self)})"
+
+    @property
+    def end_code(self):
+        return FIRST_CODE + len(self.prefix)
+
+    def __reduce__(self):
+        # süreç havuzu: dosyadan geldiyse yalnızca yol gönderilir (load_seed önbelleği)
+        if self.path is not None:
+            return load_seed, (self.path,)
+        return SeedDictionary.from_bytes, (self.to_bytes(),)
+
+    # --------------------------------------------------------------------------
+    # encoder / decoder tabloları (ilk kullanımda bir kez hesaplanır)
+    # --------------------------------------------------------------------------
+    def encoder_map(self):
+        """
+        Return: {(prefix << 8) | sembol: kod}
+        """
+        if self._encoder_map is None:
+            keys = (self.prefix.astype(np.int64) << 8) | self.suffix
+            self._encoder_map = dict(zip(keys.tolist(), range(FIRST_CODE, self.end_code)))
+        return self._encoder_map
+
+    def tables(self):
+        """
+        Return: (prefix listesi, suffix listesi), decoder tablolarının FIRST_CODE'dan itibaren kısmı
+        """
+        if self._tables is None:
+            self._tables = (self.prefix.tolist(), self.suffix.tolist())
+        return self._tables
+
+    def phrases(self):
+        """
+        Girdilerin açılmış halleri (decode_variable_into için).
+        Return: (blob, start, length); kod c'nin cümlesi blob[start[c]:start[c] + length[c]]
+        """
+        if self._phrases is None:
+            start = array("q", bytes(8 * self.end_code))
+            length = array("q", bytes(8 * self.end_code))
+            blob = bytearray()
+            for code, (prefix, symbol) in enumerate(zip(*self.tables()), FIRST_CODE):
+                head = blob[start[prefix]:start[prefix] + length[prefix]] if prefix >= 256 else bytes((prefix,))
+                start[code] = len(blob)
+                length[code] = len(head) + 1
+                blob += head
+                blob.append(symbol)
+            self._phrases = (bytes(blob), start, length)
+        return self._phrases
+
+    # --------------------------------------------------------------------------
+    # artefakt dosyası
+    # --------------------------------------------------------------------------
+    def to_bytes(self):
+        return (_HEADER.pack(SEED_MAGIC, SEED_VERSION, len(self), self.id)
+                + self.prefix.astype("<u4").tobytes() + self.suffix.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data, path=None):
+        data = memoryview(data).cast("B")
+        if len(data) < _HEADER.size:
+            raise ValueError("Tohum sözlük dosyası eksik!")
+        magic, version, count, seed_id = _HEADER.unpack_from(data)
+        if magic != SEED_MAGIC:
+            raise ValueError("Tohum sözlük dosyası değil!")
+        if version != SEED_VERSION:
+            raise ValueError(f"Desteklenmeyen tohum sözlük sürümü: {version}")
+        if len(data) != _HEADER.size + 5 * count:
+            raise ValueError("Tohum sözlük dosyası eksik!")
+        prefix = np.frombuffer(data, dtype="<u4", count=count, offset=_HEADER.size)
+        suffix = np.frombuffer(data, dtype=np.uint8, count=count, offset=_HEADER.size + 4 * count)
+        seed = cls(prefix, suffix, path)
+        if seed.id != seed_id:
+            raise ValueError("Tohum sözlük bozuk (id uyuşmuyor)!")
+        return seed
+
+    def save(self, path):
+        """
+        path bir klasörse (veya .lzws ile bitmiyorsa klasör olarak oluşturulur)
+        dosya adı <id>.lzws olur. Sözlük önbelleğe de eklenir.
+        Return: yazılan dosyanın yolu
+        """
+        if os.path.isdir(path) or not path.endswith(SEED_SUFFIX):
+            os.makedirs(path, exist_ok=True)
+            path = os.path.join(path, seed_file_name(self.id))
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        self.path = path
+        register_seed(self)
+        return path
+
+
+def seed_file_name(seed_id):
+    return f"{seed_id:08x}{SEED_SUFFIX}"
+
+
+def register_seed(seed):
+    """
+    Sözlüğü süreç önbelleğine ekler (sonraki load_seed / açma çağrıları onu kullanır).
+    """
+    _CACHE[seed.id] = seed
+    if seed.path is not None:
+        _CACHE[os.path.abspath(seed.path)] = seed
+    return seed
+
+
+def find_seed_file(seed_id):
+    """
+    LZW_SEED_PATH klasörlerinde <id>.lzws dosyasını arar.
+    """
+    for folder in os.environ.get(SEED_PATH_ENV, "").split(os.pathsep):
+        path = os.path.join(folder, seed_file_name(seed_id))
+        if folder and os.path.isfile(path):
+            return path
+    raise ValueError(f"Tohum sözlük bulunamadı: {seed_id:08x} "
+                     f"(load_seed ile yükleyin ya da klasörünü {SEED_PATH_ENV}'e ekleyin)")
+
+
+def load_seed(ref):
+    """
+    ref: SeedDictionary, artefakt dosyasının yolu veya id (int)
+    Her sözlük süreç başına bir kez okunur, sonraki çağrılar önbellekten döner.
+    Return: SeedDictionary
+    """
+    if isinstance(ref, SeedDictionary):
+        return _CACHE.setdefault(ref.id, ref)
+    key = ref if isinstance(ref, int) else os.path.abspath(ref)
+    seed = _CACHE.get(key)
+    if seed is not None:
+        return seed
+    path = find_seed_file(ref) if isinstance(ref, int) else ref
+    with open(path, "rb") as f:
+        seed = SeedDictionary.from_bytes(f.read(), path)
+    if isinstance(ref, int) and seed.id != ref:
+        raise ValueError(f"Tohum sözlük id'si uyuşmuyor: {path}")
+    return register_seed(seed)
+
+
+# ------------------------------------------------------------------------------
+# Eğitim
+# ------------------------------------------------------------------------------
+def train_seed(samples, size=DEFAULT_SEED_SIZE, max_nodes=DEFAULT_MAX_NODES):
+    """
+    samples: sembol dizileri (bytes / uint8 dizi ...). Hepsi ortak, büyüyen bir
+    LZW sözlüğüyle ayrıştırılır (her örnek kendi başından) ve her cümleden kaç
+    kez geçildiği sayılır; en çok kullanılan size cümle seçilir. Bir cümleden
+    en az çocukları kadar geçildiği için seçim prefix'leri de içerir.
+    max_nodes: eğitim sözlüğünün en büyük boyutu (bellek sınırı)
+    Return: SeedDictionary
+    """
+    children = {}
+    parents = []
+    symbols = []
+    hits = []
+    for sample in samples:
+        data = as_symbols(sample)
+        if len(data) == 0:
+            continue
+        w = data[0]
+        for c in data[1:]:
+            key = (w << 8) | c
+            code = children.get(key)
+            if code:
+                hits[code - FIRST_CODE] += 1
+                w = code
+                continue
+            if len(parents) < max_nodes:
+                children[key] = FIRST_CODE + len(parents)
+                parents.append(w)
+                symbols.append(c)
+                hits.append(0)
+            w = c
+
+    # en çok kullanılanlar (eşitlikte önce oluşan, yani prefix önce gelir)
+    ranked = sorted((i for i in range(len(hits)) if hits[i]), key=lambda i: (-hits[i], i))
+    chosen = sorted(ranked[:size])
+    new_code = {FIRST_CODE + i: FIRST_CODE + j for j, i in enumerate(chosen)}
+    prefix = [parents[i] if parents[i] < 256 else new_code[parents[i]] for i in chosen]
+    return SeedDictionary(np.array(prefix, dtype=np.uint32), np.array([symbols[i] for i in chosen], dtype=np.uint8))
+
+
+def iter_image_symbols(paths, level, predictor=None, zigzag=False, scan=SCAN_ROW_MAJOR):
+    """
+    Resimleri seviyenin LZW'ye verdiği sembollere çevirir (blocks.encode_block ile aynı).
+    """
+    channels, default_predictor = LEVELS[level]
+    predictor = default_predictor if predictor is None else predictor
+    for path in paths:
+        image = read_image(path, "L" if channels == 1 else "RGB")
+        yield block_symbols(image, predictor, zigzag, scan=scan)[0]
+
+
+def train_images(paths, level, size=DEFAULT_SEED_SIZE, predictor=None, zigzag=False,
+                 max_nodes=DEFAULT_MAX_NODES, scan=SCAN_ROW_MAJOR):
+    """
+    Level 2-5 için resim derleminden tohum sözlük eğitir.
+    Sözlük, sıkıştırırken kullanılacak predictor / zigzag / scan ile eğitilmelidir.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Geçersiz seviye: {level} (2-5 olmalı)")
+    return train_seed(iter_image_symbols(paths, level, predictor, zigzag, scan), size, max_nodes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LZW tohum sözlüğü eğit / incele")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="resim derleminden tohum sözlük eğit")
+    train.add_argument("inputs", nargs="+", help="klasörler, glob desenleri veya dosyalar")
+    train.add_argument("-l", "--level", type=int, required=True, choices=sorted(LEVELS), help="seviye (2-5)")
+    train.add_argument("-o", "--output", default=".", help="çıktı klasörü veya dosyası")
+    train.add_argument("-n", "--size", type=int, default=DEFAULT_SEED_SIZE, help="girdi sayısı")
+    train.add_argument("-p", "--pattern", default=None, help="klasörlerde aranacak desen (varsayılan *.bmp)")
+    train.add_argument("--predictor", default=None, help="tahmin edici (sıkıştırmadakiyle aynı olmalı)")
+    train.add_argument("--zigzag", action="store_true", help="artıkları zigzag ile numarala")
+    train.add_argument("--scan", choices=SCAN_ORDERS, default=SCAN_ROW_MAJOR,
+                       help="tarama sırası (sıkıştırmadakiyle aynı olmalı)")
+    info = commands.add_parser("info", help="tohum sözlük dosyasını özetle")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        seed = load_seed(args.path)
+        lengths = seed.phrases()[2][FIRST_CODE:]
+        print(f"id     : {seed.id:08x}")
+        print(f"girdi  : {len(seed)} (kod {FIRST_CODE}..{seed.end_code - 1})")
+        print(f"cümle  : ortalama {sum(lengths) / max(1, len(lengths)):.2f}, en uzun {max(lengths, default=0)} byte")
+        return 0
+
+    pairs = collect_jobs(args.inputs, None, args.level, args.pattern, unique_outputs=False)
+    paths = [src for src, _ in pairs]
+    if not paths:
+        print("Girdi dosyası bulunamadı!")
+        return 1
+    seed = train_images(paths, args.level, args.size, args.predictor, args.zigzag, scan=args.scan)
+    path = seed.save(args.output)
+    print(f"{len(paths)} resimden {len(seed)} girdilik tohum sözlük: {path} (id {seed.id:08x})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
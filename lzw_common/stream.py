@@ -0,0 +1,130 @@
+# File: stream.py
+"""
+Dosya / pipe üzerinden sabit bellekle LZW sıkıştırma ve açma.
+
+LZWCompressor / LZWDecompressor nesnelerini parça parça (chunk) besleyen
+yardımcılar. Girdinin tamamı hiçbir zaman belleğe alınmaz; çok büyük log
+dosyaları veya ham piksel akışları da işlenebilir.
+
+Komut satırı (stdin -> stdout):
+    python -m lzw_common.stream [-w MAX_WIDTH] [-p POLICY] [--seed SÖZLÜK] < girdi > girdi.lzw
+    python -m lzw_common.stream -d < girdi.lzw > girdi
+"""
+
+import sys
+import argparse
+
+import numpy as np
+
+from .lzw import LZWCompressor, LZWDecompressor, load_seed, DEFAULT_MAX_CODE_WIDTH, POLICY_RESET, POLICIES
+
+CHUNK_SIZE = 1 << 20  # 1 MB
+
+
+def iter_file_chunks(src, chunk_size=CHUNK_SIZE):
+    """
+    Binary bir dosya nesnesini chunk_size byte'lık parçalar halinde okur.
+    """
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_array_chunks(array, chunk_size=CHUNK_SIZE):
+    """
+    Bir numpy dizisini (uint8) kopyalamadan parça parça verir.
+    """
+    data = memoryview(np.ascontiguousarray(array, dtype=np.uint8)).cast("B")
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def iter_compress(chunks, max_width=DEFAULT_MAX_CODE_WIDTH, table="dict", policy=POLICY_RESET, seed=None):
+    """
+    Girdi parçalarını sıkıştırır, hazır oldukça çıktı parçaları üretir.
+    policy: sözlük politikası (lzw.POLICIES)
+    seed: tohum sözlük (lzw_common.seed)
+    """
+    compressor = LZWCompressor(max_width, table, policy, seed=seed)
+    for chunk in chunks:
+        out = compressor.feed(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def iter_decompress(chunks, table="dict"):
+    """
+    Sıkıştırılmış parçaları çözer, kodlar geldikçe çıktı parçaları üretir.
+    """
+    decompressor = LZWDecompressor(table)
+    for chunk in chunks:
+        out = decompressor.feed(chunk)
+        if out:
+            yield out
+        if decompressor.eof:
+            break
+    if not decompressor.eof:
+        raise ValueError("EOI kodu bulunamadı, akış eksik!")
+
+
+def write_chunks(chunks, dst):
+    """
+    Parçaları dst dosyasına yazar. Return: yazılan byte sayısı
+    """
+    written = 0
+    for chunk in chunks:
+        dst.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def compress_stream(src, dst, max_width=DEFAULT_MAX_CODE_WIDTH, chunk_size=CHUNK_SIZE, policy=POLICY_RESET,
+                    seed=None):
+    """
+    src dosyasını okuyup sıkıştırılmış halini dst'ye yazar.
+    Return: (okunan byte sayısı, yazılan byte sayısı)
+    """
+    read = 0
+
+    def counted(chunks):
+        nonlocal read
+        for chunk in chunks:
+            read += len(chunk)
+            yield chunk
+
+    chunks = counted(iter_file_chunks(src, chunk_size))
+    written = write_chunks(iter_compress(chunks, max_width, policy=policy, seed=seed), dst)
+    return read, written
+
+
+def decompress_stream(src, dst, chunk_size=CHUNK_SIZE):
+    """
+    src'deki sıkıştırılmış akışı çözüp dst'ye yazar.
+    Return: yazılan byte sayısı
+    """
+    return write_chunks(iter_decompress(iter_file_chunks(src, chunk_size)), dst)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="stdin -> stdout LZW sıkıştırma / açma")
+    parser.add_argument("-d", "--decompress", action="store_true", help="sıkıştırılmış akışı aç")
+    parser.add_argument("-w", "--max-width", type=int, default=DEFAULT_MAX_CODE_WIDTH,
+                        help="en büyük kod genişliği (bit)")
+    parser.add_argument("-p", "--dict-policy", choices=POLICIES, default=POLICY_RESET,
+                        help="sözlük dolunca uygulanacak politika")
+    parser.add_argument("--seed", default=None, help="tohum sözlük dosyası (lzw_common.seed)")
+    args = parser.parse_args(argv)
+    seed = None if args.seed is None else load_seed(args.seed)
+
+    if args.decompress:
+        decompress_stream(sys.stdin.buffer, sys.stdout.buffer)
+    else:
+        compress_stream(sys.stdin.buffer, sys.stdout.buffer, args.max_width, policy=args.dict_policy, seed=seed)
+    sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
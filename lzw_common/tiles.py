@@ -0,0 +1,260 @@
+# File: tiles.py
+"""
+Karolu (tiled) konteyner: resim sabit boyutlu karolara bölünür, her karo
+kendi sözlüğüyle bağımsız bir LZW akışı olarak kodlanır. Karolar birbirinden
+bağımsız olduğu için hem sıkıştırma hem açma ProcessPoolExecutor ile tüm
+çekirdeklere dağıtılır.
+
+Dosya düzeni (little-endian):
+    [b"LZWT"][version u8][channels u8][width u32][height u32]
+    [tile_width u32][tile_height u32][tile_count u32]
+    tile_count x [offset u64][length u32]      <- karo tablosu (dosya başına göre)
+    karo verileri (satır satır, soldan sağa)
+
+Sürüm 2 (iter_compress_strips, out-of-core şerit kodlama): karolar tam
+genişlikte yatay şeritlerdir ve karo tablosu başta değil en sonda, verinin
+son tile_count x 12 byte'ındadır; böylece şeritler kodlandıkça yazılabilir.
+
+Her karo bir lzw_common.blocks bloğudur: [predictor başlığı][LZW akışı].
+Renkli resimde karonun kanalları ardışık (planar) kodlanır. Tahmin karo
+içinde yapılır (karo dışı komşular 0), böylece her karo tek başına çözülebilir.
+"""
+
+import struct
+
+import numpy as np
+
+from .lzw import DEFAULT_MAX_CODE_WIDTH, POLICY_RESET
+from .entropy import ENTROPY_NONE
+from .color import forward_color, COLOR_NONE
+from .scan import SCAN_ROW_MAJOR
+from .blocks import run_jobs, iter_jobs, encode_block_job, decode_block_job
+
+TILE_MAGIC = b"LZWT"
+TILE_VERSION = 1
+TILE_VERSION_STRIPS = 2
+DEFAULT_TILE_SIZE = 256
+DEFAULT_STRIP_ROWS = 64
+
+_HEADER = struct.Struct("<4sBBIIIII")
+_ENTRY = struct.Struct("<QI")
+
+
+def is_tiled(data):
+    return bytes(data[:len(TILE_MAGIC)]) == TILE_MAGIC
+
+
+def tile_grid(width, height, tile_width, tile_height):
+    """
+    Return: satır satır (x, y, w, h) karo dikdörtgenleri
+    """
+    return [(x, y, min(tile_width, width - x), min(tile_height, height - y))
+            for y in range(0, height, tile_height)
+            for x in range(0, width, tile_width)]
+
+
+def compress_tiled(image, tile_size=DEFAULT_TILE_SIZE, max_code_width=DEFAULT_MAX_CODE_WIDTH,
+                   predictor="none", zigzag=False, workers=None, dict_policy=POLICY_RESET, seed=None,
+                   entropy=ENTROPY_NONE, scan=SCAN_ROW_MAJOR):
+    """
+    image: (H, W) veya (H, W, C) uint8
+    tile_size: karo kenarı (piksel)
+    max_code_width: None => karo başına sabit codelength, aksi halde değişken genişlik
+    workers: süreç sayısı (None => os.cpu_count(), 1 => paralel değil)
+    Return: konteynerin tamamı (bytes)
+    """
+    image = np.asarray(image, dtype=np.uint8)
+    if image.ndim not in (2, 3):
+        raise ValueError("Resim (H, W) veya (H, W, C) olmalı!")
+    if tile_size <= 0:
+        raise ValueError("tile_size pozitif olmalı!")
+    height, width = image.shape[:2]
+    channels = 1 if image.ndim == 2 else image.shape[2]
+
+    rects = tile_grid(width, height, tile_size, tile_size)
+    jobs = [(image[y:y + h, x:x + w], predictor, zigzag, max_code_width, (1, 0), dict_policy, seed, entropy,
+             scan)
+            for x, y, w, h in rects]
+    payloads = run_jobs(encode_block_job, jobs, workers)
+
+    header = _HEADER.pack(TILE_MAGIC, TILE_VERSION, channels, width, height,
+                          tile_size, tile_size, len(payloads))
+    offset = len(header) + _ENTRY.size * len(payloads)
+    table = bytearray()
+    for payload in payloads:
+        table += _ENTRY.pack(offset, len(payload))
+        offset += len(payload)
+    return b"".join([header, table] + payloads)
+
+
+def iter_compress_strips(image, strip_rows=DEFAULT_STRIP_ROWS, max_code_width=DEFAULT_MAX_CODE_WIDTH,
+                         predictor="none", zigzag=False, workers=None, dict_policy=POLICY_RESET,
+                         seed=None, entropy=ENTROPY_NONE, color_transform=COLOR_NONE, scan=SCAN_ROW_MAJOR):
+    """
+    Out-of-core karolu kodlama: resim strip_rows satırlık, tam genişlikte
+    şeritlere bölünür ve şeritler sırayla kodlanıp yield edilir (karo tablosu
+    en sonda, sürüm 2). image bir mmap görünümü (imageio.read_image) olabilir;
+    bellekte aynı anda yalnızca birkaç şerit ve kodlanmış hali bulunur.
+    "left" gibi yalnızca aynı satıra bakan tahmin edicilerde artıklar tüm
+    resimdekiyle aynıdır. color_transform (lzw_common.color) şerit okunurken
+    uygulanır.
+    Return: byte parçaları üreteci (write_container'a chunks olarak verilir)
+    """
+    if image.ndim not in (2, 3):
+        raise ValueError("Resim (H, W) veya (H, W, C) olmalı!")
+    if strip_rows <= 0:
+        raise ValueError("strip_rows pozitif olmalı!")
+    height, width = image.shape[:2]
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    count = -(-height // strip_rows)
+
+    header = _HEADER.pack(TILE_MAGIC, TILE_VERSION_STRIPS, channels, width, height,
+                          width, strip_rows, count)
+    yield header
+    jobs = ((forward_color(np.asarray(image[y:y + strip_rows], dtype=np.uint8), color_transform),
+             predictor, zigzag, max_code_width, (1, 0), dict_policy, seed, entropy, scan)
+            for y in range(0, height, strip_rows))
+    offset = len(header)
+    table = bytearray()
+    for payload in iter_jobs(encode_block_job, jobs, workers):
+        table += _ENTRY.pack(offset, len(payload))
+        offset += len(payload)
+        yield payload
+    yield bytes(table)
+
+
+def read_tile_info(data, base=0):
+    """
+    Yalnızca konteyner başlığını okur (karo tablosuna dokunmaz).
+    base: karolu konteynerin data içindeki başlangıcı
+    Return: bilgi dict'i
+    """
+    if len(data) < base + _HEADER.size:
+        raise ValueError("Karolu konteyner çok kısa!")
+    magic, version, channels, width, height, tile_width, tile_height, count = \
+        _HEADER.unpack_from(data, base)
+    if magic != TILE_MAGIC:
+        raise ValueError("Karolu konteyner değil!")
+    if version not in (TILE_VERSION, TILE_VERSION_STRIPS):
+        raise ValueError(f"Desteklenmeyen konteyner sürümü: {version}")
+    table_offset = _HEADER.size
+    if version == TILE_VERSION_STRIPS:
+        # tablo en sonda: data karolu konteynerin sonunda bitmeli
+        table_offset = len(data) - base - _ENTRY.size * count
+        if table_offset < _HEADER.size:
+            raise ValueError("Karo tablosu eksik!")
+    info = {
+        "channels": channels,
+        "width": width,
+        "height": height,
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "tiles_x": -(-width // tile_width),
+        "tiles_y": -(-height // tile_height),
+        "tile_count": count,
+        "index_size": _HEADER.size + _ENTRY.size * count,
+        "table_offset": table_offset,
+    }
+    if info["tiles_x"] * info["tiles_y"] != count:
+        raise ValueError("Karo tablosu resim boyutuyla uyuşmuyor!")
+    return info
+
+
+def read_tile_entry(data, index, base=0, table_offset=_HEADER.size):
+    """
+    table_offset: karo tablosunun base'e göre yeri (read_tile_info()["table_offset"])
+    Return: index numaralı karonun (offset, length) çifti (offset data içinde)
+    """
+    offset, length = _ENTRY.unpack_from(data, base + table_offset + index * _ENTRY.size)
+    return base + offset, length
+
+
+def read_tile_index(data, base=0):
+    """
+    Konteyner başlığını ve karo tablosunu okur.
+    data: en azından başlık + tabloyu içeren bytes / memoryview
+    Return: (bilgi dict'i, [(offset, length), ...])
+    """
+    info = read_tile_info(data, base)
+    return info, [read_tile_entry(data, i, base, info["table_offset"]) for i in range(info["tile_count"])]
+
+
+def decompress_tiled(data, workers=None):
+    """
+    compress_tiled çıktısını (karolar paralel) çözer.
+    Return: (H, W) veya (H, W, C) uint8 dizi
+    """
+    data = memoryview(data).cast("B")
+    info, entries = read_tile_index(data)
+    channels = info["channels"]
+    jobs = [(bytes(data[offset:offset + length]), channels) for offset, length in entries]
+    tiles = run_jobs(decode_block_job, jobs, workers)
+
+    shape = (info["height"], info["width"]) + ((channels,) if channels > 1 else ())
+    image = np.empty(shape, dtype=np.uint8)
+    rects = tile_grid(info["width"], info["height"], info["tile_width"], info["tile_height"])
+    for (x, y, w, h), tile in zip(rects, tiles):
+        image[y:y + h, x:x + w] = tile
+    return image
+
+
+def iter_tiled_strips(data, workers=None, base=0):
+    """
+    Karolu konteyneri karo satırı karo satırı çözer; bellekte aynı anda
+    yalnızca birkaç karo satırı (tile_height x width) bulunur.
+    Return: (y, strip) üreteci, strip (h, W) veya (h, W, C) uint8
+    """
+    info = read_tile_info(data, base)
+    channels = info["channels"]
+    tiles_x = info["tiles_x"]
+    tile_w, tile_h = info["tile_width"], info["tile_height"]
+
+    def jobs():
+        for index in range(info["tile_count"]):
+            offset, length = read_tile_entry(data, index, base, info["table_offset"])
+            yield bytes(data[offset:offset + length]), channels
+
+    tiles = iter_jobs(decode_block_job, jobs(), workers)
+    for ty in range(info["tiles_y"]):
+        y = ty * tile_h
+        height = min(tile_h, info["height"] - y)
+        strip = np.empty((height, info["width"]) + ((channels,) if channels > 1 else ()), dtype=np.uint8)
+        for tx in range(tiles_x):
+            tile = next(tiles)
+            strip[:, tx * tile_w:tx * tile_w + tile.shape[1]] = tile
+        yield y, strip
+
+
+def decode_tiled_region(data, x, y, width, height, workers=1, base=0):
+    """
+    Karolu konteynerden yalnızca (x, y, width, height) dikdörtgenini çözer.
+    data: bytes veya mmap; sadece başlık, gereken tablo girdileri ve
+    dikdörtgenle kesişen karoların verisi okunur (kopyalanır) ve çözülür.
+    Return: (height, width) veya (height, width, C) uint8 dizi
+    """
+    info = read_tile_info(data, base)
+    if width <= 0 or height <= 0:
+        raise ValueError("Bölge boyutu pozitif olmalı!")
+    if x < 0 or y < 0 or x + width > info["width"] or y + height > info["height"]:
+        raise ValueError(f"Bölge resmin dışında! Resim: {info['width']} x {info['height']}")
+
+    tile_w, tile_h = info["tile_width"], info["tile_height"]
+    tx0, tx1 = x // tile_w, (x + width - 1) // tile_w
+    ty0, ty1 = y // tile_h, (y + height - 1) // tile_h
+    indices = [(tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)]
+    jobs = []
+    for tx, ty in indices:
+        offset, length = read_tile_entry(data, ty * info["tiles_x"] + tx, base, info["table_offset"])
+        jobs.append((bytes(data[offset:offset + length]), info["channels"]))
+
+    tiles = run_jobs(decode_block_job, jobs, workers)
+    channels = info["channels"]
+    region = np.empty((height, width) + ((channels,) if channels > 1 else ()), dtype=np.uint8)
+    for (tx, ty), tile in zip(indices, tiles):
+        # karonun bölgeyle kesişimi (resim koordinatlarında)
+        left, top = max(x, tx * tile_w), max(y, ty * tile_h)
+        right = min(x + width, tx * tile_w + tile.shape[1])
+        bottom = min(y + height, ty * tile_h + tile.shape[0])
+        region[top - y:bottom - y, left - x:right - x] = \
+            tile[top - ty * tile_h:bottom - ty * tile_h, left - tx * tile_w:right - tx * tile_w]
+    return region
@@ -0,0 +1,34 @@
+# File: transform.py
+"""
+Satır bazlı fark (difference) dönüşümü ve tersi, tamamen NumPy ile.
+
+Level 3 ve Level 5'te kullanılan tahmin: her satırın ilk pikseli kendisi,
+diğer pikseller (piksel - soldaki piksel) % 256. uint8 aritmetiği zaten
+256'ya göre sarmaladığı (wrap-around) için mod işlemi ayrıca yapılmaz.
+
+Fonksiyonlar 2D (H, W) ve 3D (H, W, C) dizilerle çalışır; renkli resimde
+tüm kanallar tek seferde işlenir.
+"""
+
+import numpy as np
+
+
+def row_difference(image):
+    """
+    image: (H, W) veya (H, W, C) uint8 dizi
+    Return: aynı şekilde fark dizisi (uint8)
+    """
+    image = np.asarray(image, dtype=np.uint8)
+    diff = np.empty_like(image)
+    diff[:, 0] = image[:, 0]
+    np.subtract(image[:, 1:], image[:, :-1], out=diff[:, 1:])
+    return diff
+
+
+def row_reconstruct(diff):
+    """
+    row_difference'ın tersi: satır boyunca kümülatif toplam (mod 256).
+    Return: orijinal dizi (uint8)
+    """
+    diff = np.asarray(diff, dtype=np.uint8)
+    return np.cumsum(diff, axis=1, dtype=np.uint8)
@@ -0,0 +1,12 @@
+# File: conftest.py
+"""
+Testler depo kök dizininden çalışır; lzw_common paket olarak kurulmadığı
+için kök dizin sys.path'e eklenir.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
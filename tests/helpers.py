@@ -0,0 +1,73 @@
+# File: helpers.py
+"""
+Testlerin ortak girdileri: sentetik resimler, konteyner yerleşimleri ve
+seviye sınıflarını kendi klasörlerinde çalıştıran yardımcı.
+"""
+
+import os
+import sys
+import subprocess
+
+import numpy as np
+
+from lzw_common.container import LEVELS
+from lzw_common.lzw import POLICIES, POLICY_RESET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# seviye -> (klasör, modül, sınıf)
+LEVEL_CLASSES = {
+    2: ("level2_gray_image", "LZW_gray", "LZWGrayCoding"),
+    3: ("level3_gray_differences", "LZW_gray_diff", "LZWGrayDiffCoding"),
+    4: ("level4_color_image", "LZW_color", "LZWColorCoding"),
+    5: ("level5_color_differences", "LZW_color_diff", "LZWColorDiffCoding"),
+}
+
+# yerleşim adı -> compress_array seçenekleri
+LAYOUTS = {
+    "single": {},
+    "tiled": {"tile_size": 16},
+    "strips": {"strip_rows": 10},
+    "channels": {"channel_streams": True},
+}
+
+# (max_code_width, dict_policy): sabit genişlik + her politika değişken genişlikte
+CODECS = [(None, POLICY_RESET)] + [(9, policy) for policy in POLICIES]
+
+
+def make_image(level, height=37, width=45, seed=0):
+    """
+    Yumuşak gradyan + gürültü: tahmin edicilere yapı, 9 bitlik sözlüğe dolma fırsatı.
+    Return: Level 2/3 için (H, W), Level 4/5 için (H, W, 3) uint8
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[:height, :width]
+    base = x * 3 + y * 2 + (40 * np.sin(x / 5.0)).astype(np.int64)
+    channels = LEVELS[level][0]
+    planes = [base + 17 * c + rng.integers(0, 6, base.shape) for c in range(channels)]
+    image = (np.stack(planes, axis=-1) % 256).astype(np.uint8)
+    return image[..., 0] if channels == 1 else image
+
+
+def level_layouts(levels=None):
+    """
+    Return: geçerli (seviye, yerleşim) çiftleri (channels yalnızca renkli seviyelerde)
+    """
+    return [(level, layout) for level in sorted(levels or LEVELS) for layout in LAYOUTS
+            if layout != "channels" or LEVELS[level][0] > 1]
+
+
+def run_level_script(level, body):
+    """
+    body'yi seviye klasöründe ayrı bir süreçte çalıştırır: her seviyenin kendi
+    basic_image_ops modülü olduğu için sınıflar aynı süreçte yüklenemez.
+    body'de Coder (seviye sınıfı), np ve make_image hazırdır; sonunda "ok" yazmalı.
+    """
+    folder, module, cls = LEVEL_CLASSES[level]
+    script = (f"import sys\nsys.path[:0] = [{ROOT!r}, {os.path.join(ROOT, 'tests')!r}]\n"
+              f"import numpy as np\nfrom helpers import make_image\nfrom {module} import {cls} as Coder\n"
+              + body)
+    result = subprocess.run([sys.executable, "-c", script], cwd=os.path.join(ROOT, folder),
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1:] == ["ok"], result.stdout
@@ -0,0 +1,85 @@
+# File: test_batch.py
+"""
+lzw_common.batch: girdi -> çıktı eşlemesi ve dosya sıkıştırma seçenekleri.
+"""
+
+import os
+
+import pytest
+
+from lzw_common.batch import collect_jobs, glob_root, compress_file
+from lzw_common.container import decode_file
+from lzw_common.imageio import write_image
+
+from helpers import make_image
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+def test_glob_root():
+    assert glob_root(os.path.join("a", "b", "**", "*.bmp")) == os.path.join("a", "b")
+    assert glob_root(os.path.join("a", "b*", "c", "*.bmp")) == "a"
+    assert glob_root("*.bmp") == "."
+
+
+def test_glob_inputs_keep_relative_paths(tmp_path):
+    for sub in ("a", "b"):
+        _touch(str(tmp_path / "in" / sub / "x.bmp"))
+    out = str(tmp_path / "out")
+    pairs = collect_jobs([str(tmp_path / "in" / "**" / "*.bmp")], out, 5)
+    assert sorted(dst for _, dst in pairs) == [os.path.join(out, "a", "x_color_diff.bin"),
+                                               os.path.join(out, "b", "x_color_diff.bin")]
+
+
+def test_directory_inputs_keep_relative_paths(tmp_path):
+    _touch(str(tmp_path / "in" / "sub" / "y.bmp"))
+    pairs = collect_jobs([str(tmp_path / "in")], str(tmp_path / "out"), 3)
+    assert pairs == [(str(tmp_path / "in" / "sub" / "y.bmp"), str(tmp_path / "out" / "sub" / "y_diff.bin"))]
+
+
+def test_duplicate_outputs_are_rejected(tmp_path):
+    _touch(str(tmp_path / "a" / "x.bmp"))
+    _touch(str(tmp_path / "b" / "x.bmp"))
+    inputs = [str(tmp_path / "a" / "x.bmp"), str(tmp_path / "b" / "x.bmp")]
+    with pytest.raises(ValueError):
+        collect_jobs(inputs, str(tmp_path / "out"), 5)
+    # tohum eğitimi gibi çıktı yazmayan kullanımlar için kontrol kapatılabilir
+    assert len(collect_jobs(inputs, str(tmp_path / "out"), 5, unique_outputs=False)) == 2
+
+
+@pytest.mark.parametrize("options", [
+    {"tile_size": 16},
+    {"channel_streams": True},
+    {"tile_size": 16, "channel_streams": True},
+])
+def test_strip_rows_excludes_other_layouts(tmp_path, options):
+    src = str(tmp_path / "a.bmp")
+    write_image(src, make_image(5))
+    dst = str(tmp_path / "a_color_diff.bin")
+    # bellek içi yol ile aynı hata; çıktı yazılmaz
+    with pytest.raises(ValueError, match="birlikte kullanılamaz"):
+        compress_file(src, dst, 5, strip_rows=10, **options)
+    assert not os.path.exists(dst) and not os.path.exists(dst + ".tmp")
+    if len(options) > 1:
+        with pytest.raises(ValueError, match="birlikte kullanılamaz"):
+            compress_file(src, dst, 5, **options)
+
+
+def test_strip_rows_rejects_unknown_options(tmp_path):
+    src = str(tmp_path / "a.bmp")
+    write_image(src, make_image(3))
+    with pytest.raises(TypeError):
+        compress_file(src, str(tmp_path / "a.bin"), 3, strip_rows=10, tile=(2, 2))
+
+
+def test_strip_rows_round_trip(tmp_path):
+    image = make_image(5)
+    src = str(tmp_path / "a.bmp")
+    write_image(src, image)
+    dst = str(tmp_path / "a_color_diff.bin")
+    size_in, size_out = compress_file(src, dst, 5, strip_rows=10, color_transform="rct")
+    assert size_in == image.size and size_out == os.path.getsize(dst)
+    assert (decode_file(dst, workers=1) == image).all()
@@ -0,0 +1,63 @@
+# File: test_bitio.py
+"""
+lzw_common.bitio: paketlenmiş bit yazıcı / okuyucu ve .bin kod formatı.
+"""
+
+import numpy as np
+import pytest
+
+from lzw_common.bitio import BitWriter, BitReader, codes_to_bytes, bytes_to_codes
+
+
+def _bitstring(codes, width):
+    # eski format: '0'/'1' karakterleri, MSB-first, sıfırla 8'e tamamlanmış
+    bits = "".join(format(int(c), f"0{width}b") for c in codes)
+    bits += "0" * (-len(bits) % 8)
+    return bytes(int(bits[i:i + 8], 2) for i in range(0, len(bits), 8))
+
+
+@pytest.mark.parametrize("width", [8, 9, 12, 16])
+def test_write_codes_matches_bitstring_format(width):
+    codes = np.random.default_rng(width).integers(0, 1 << width, 1001)
+    writer = BitWriter()
+    writer.write_codes(codes, width)
+    writer.flush()
+    assert writer.getvalue() == _bitstring(codes, width)
+
+
+def test_scalar_and_vector_writes_mix():
+    writer = BitWriter()
+    writer.write(5, 3)
+    writer.write_codes([300, 1, 511], 9)
+    writer.write_codes([1, 2, 3], [2, 10, 12])
+    assert writer.bit_count() == 3 + 27 + 24
+    writer.flush()
+    reader = BitReader(writer.getvalue())
+    assert [reader.read(w) for w in (3, 9, 9, 9, 2, 10, 12)] == [5, 300, 1, 511, 1, 2, 3]
+
+
+def test_reader_feed_and_read_codes():
+    codes = np.arange(0, 4096, 7)
+    writer = BitWriter()
+    writer.write_codes(codes, 12)
+    writer.flush()
+    data = writer.getvalue()
+    reader = BitReader()
+    reader.feed(data[:100])
+    first = reader.read_codes(12)
+    reader.feed(data[100:])
+    rest = reader.read_codes(12)
+    np.testing.assert_array_equal(np.concatenate([first, rest]), codes)
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 1000])
+def test_codes_to_bytes_round_trip(count):
+    codes = np.random.default_rng(count).integers(0, 1 << 11, count)
+    decoded, codelength = bytes_to_codes(codes_to_bytes(codes, 11))
+    assert codelength == 11
+    np.testing.assert_array_equal(decoded, codes)
+
+
+def test_bytes_to_codes_rejects_short_data():
+    with pytest.raises(ValueError):
+        bytes_to_codes(b"\x00")
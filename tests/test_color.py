@@ -0,0 +1,65 @@
+# File: test_color.py
+"""
+lzw_common.color: tersinir renk dönüşümleri ve Level 4/5 konteynerleri.
+"""
+
+import numpy as np
+import pytest
+
+from lzw_common import color
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.color import forward_color, inverse_color, COLOR_TRANSFORMS, COLOR_NONE
+from lzw_common.container import read_container_header
+
+from helpers import LAYOUTS, make_image
+
+
+def _all_pixels():
+    # 256^3 rengin hepsi: (4096, 4096, 3)
+    values = np.arange(1 << 24, dtype=np.uint32)
+    rgb = np.stack([values >> 16, (values >> 8) & 0xFF, values & 0xFF], axis=-1)
+    return rgb.astype(np.uint8).reshape(4096, 4096, 3)
+
+
+@pytest.mark.parametrize("transform", COLOR_TRANSFORMS[1:])
+def test_transform_is_lossless_for_every_colour(transform):
+    rgb = _all_pixels()
+    np.testing.assert_array_equal(inverse_color(forward_color(rgb, transform), transform), rgb)
+
+
+@pytest.mark.parametrize("transform", COLOR_TRANSFORMS[1:])
+def test_in_place_and_chunked(transform, monkeypatch):
+    monkeypatch.setattr(color, "CHUNK_PIXELS", 100)
+    rgb = make_image(5, 37, 45)
+    expected = forward_color(rgb, transform)
+    work = rgb.copy()
+    assert forward_color(work, transform, out=work) is work
+    np.testing.assert_array_equal(work, expected)
+    np.testing.assert_array_equal(inverse_color(work, transform, out=work), rgb)
+
+
+def test_none_returns_input():
+    rgb = make_image(4)
+    assert forward_color(rgb, COLOR_NONE) is rgb
+    assert inverse_color(rgb, COLOR_NONE) is rgb
+
+
+def test_bad_arguments_are_rejected():
+    with pytest.raises(ValueError, match="renk dönüşümü"):
+        forward_color(make_image(4), "yuv")
+    with pytest.raises(ValueError, match=r"\(H, W, 3\)"):
+        forward_color(make_image(2), "rct")
+    with pytest.raises(ValueError, match="renkli seviyelerde"):
+        compress_array(make_image(3), 3, color_transform="rct")
+
+
+@pytest.mark.parametrize("transform", COLOR_TRANSFORMS)
+@pytest.mark.parametrize("layout", list(LAYOUTS))
+@pytest.mark.parametrize("level", [4, 5])
+def test_container_round_trip(level, layout, transform):
+    image = make_image(level, seed=1)
+    # |R - B| > 127 olan pikseller mod 256'da sarmalanır, yine kayıpsız olmalı
+    image[::7, ::5] = [255, 0, 0]
+    data = compress_array(image, level, 12, color_transform=transform, workers=1, **LAYOUTS[layout])
+    assert read_container_header(data)["color_transform"] == transform
+    np.testing.assert_array_equal(decompress_to_array(data, workers=1), image)
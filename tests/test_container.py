@@ -0,0 +1,85 @@
+# File: test_container.py
+"""
+lzw_common.container: her seviye ve yerleşim için gidiş-dönüş, başlık
+alanları ve bozuk / eksik dosyaların reddi.
+"""
+
+import numpy as np
+import pytest
+
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.container import (
+    read_container_header,
+    HEADER_SIZE,
+    LAYOUT_SINGLE,
+    LAYOUT_TILED,
+    LAYOUT_CHANNELS
+)
+
+from helpers import LAYOUTS, make_image, level_layouts
+
+HEADER_LAYOUTS = {"single": LAYOUT_SINGLE, "tiled": LAYOUT_TILED, "strips": LAYOUT_TILED,
+                  "channels": LAYOUT_CHANNELS}
+
+
+@pytest.mark.parametrize("max_code_width", [None, 9, 12])
+@pytest.mark.parametrize("level,layout", level_layouts())
+def test_round_trip(level, layout, max_code_width):
+    image = make_image(level)
+    data = compress_array(image, level, max_code_width, workers=1, **LAYOUTS[layout])
+    fields = read_container_header(data)
+    assert fields["level"] == level
+    assert fields["layout"] == HEADER_LAYOUTS[layout]
+    assert (fields["height"], fields["width"]) == image.shape[:2]
+    assert fields["channels"] == (1 if image.ndim == 2 else 3)
+    assert fields["max_code_width"] == max_code_width
+    assert fields["payload_length"] == len(data) - HEADER_SIZE
+    np.testing.assert_array_equal(decompress_to_array(data, workers=1), image)
+
+
+@pytest.mark.parametrize("level", [2, 5])
+def test_wrong_shape_is_rejected(level):
+    image = make_image(7 - level)
+    with pytest.raises(ValueError, match="şekli"):
+        compress_array(image, level)
+
+
+def test_exclusive_layouts_are_rejected():
+    with pytest.raises(ValueError, match="birlikte"):
+        compress_array(make_image(5), 5, tile_size=16, strip_rows=8)
+
+
+# ------------------------------------------------------------------------------
+# Bozuk / eksik dosyalar
+# ------------------------------------------------------------------------------
+@pytest.fixture(params=["single", "tiled", "strips", "channels"])
+def container(request):
+    return bytearray(compress_array(make_image(5), 5, 12, workers=1, **LAYOUTS[request.param]))
+
+
+def test_corrupt_payload_is_rejected(container):
+    container[HEADER_SIZE + (len(container) - HEADER_SIZE) // 2] ^= 0x40
+    with pytest.raises(ValueError, match="Checksum"):
+        decompress_to_array(container, workers=1)
+
+
+def test_truncated_payload_is_rejected(container):
+    with pytest.raises(ValueError, match="verisi eksik"):
+        decompress_to_array(container[:-1], workers=1)
+
+
+def test_truncated_header_is_rejected(container):
+    with pytest.raises(ValueError, match="başlığı eksik"):
+        read_container_header(container[:HEADER_SIZE - 1])
+
+
+def test_bad_magic_is_rejected(container):
+    container[:4] = b"LZWX"
+    with pytest.raises(ValueError, match="konteyneri değil"):
+        read_container_header(container)
+
+
+def test_unsupported_version_is_rejected(container):
+    container[4] += 1
+    with pytest.raises(ValueError, match="sürümü"):
+        decompress_to_array(container, workers=1)
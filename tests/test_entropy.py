@@ -0,0 +1,116 @@
+# File: test_entropy.py
+"""
+lzw_common.entropy: kanonik Huffman, ham akışa geri dönüş, 0x40 işaretiyle
+biçim seçimi ve konteynerlerde entropi kodlayıcı.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.bitio import codes_to_bytes, bytes_to_codes
+from lzw_common.container import read_container_header
+from lzw_common.entropy import (
+    entropy_encode,
+    decode_stream_into,
+    is_entropy_stream,
+    huffman_encode,
+    huffman_decode,
+    code_symbols,
+    symbol_codes,
+    ENTROPY_CODERS,
+    ENTROPY_HUFFMAN,
+    ENTROPY_MARKER
+)
+from lzw_common.lzw import encode_fixed, encode_variable, POLICIES
+
+from helpers import LAYOUTS, make_image, level_layouts
+
+HUFFMAN_MARKER = ENTROPY_MARKER | ENTROPY_CODERS.index(ENTROPY_HUFFMAN)
+
+
+def _fixed_stream(symbols):
+    codes, dict_size = encode_fixed(symbols)
+    return codes_to_bytes(codes, max(8, math.ceil(math.log2(max(dict_size, 2)))))
+
+
+def _decode(stream, size):
+    out = np.empty(size, dtype=np.uint8)
+    assert decode_stream_into(stream, out) == size
+    return out
+
+
+@pytest.mark.parametrize("codes", [
+    np.arange(0, 1 << 20, 37),
+    np.random.default_rng(0).integers(0, 1 << 16, 5000),
+    np.array([0, 255, 256, 511, 512, (1 << 31) - 1]),
+])
+def test_code_symbols_invert(codes):
+    symbols, extra, values = code_symbols(codes)
+    np.testing.assert_array_equal(symbol_codes(symbols, values), codes)
+
+
+@pytest.mark.parametrize("codes", [
+    np.random.default_rng(1).integers(0, 4096, 20000),
+    np.full(1000, 7),
+    np.zeros(0, dtype=np.int64),
+], ids=["uniform", "single-symbol", "empty"])
+def test_huffman_round_trip(codes):
+    np.testing.assert_array_equal(huffman_decode(huffman_encode(codes), len(codes)), codes)
+
+
+def test_incompressible_codes_stay_raw():
+    # düzgün dağılımlı 12 bitlik kodlar: Huffman küçültemez, akış aynen kalır
+    stream = codes_to_bytes(np.random.default_rng(2).integers(0, 4096, 20000), 12)
+    encoded = entropy_encode(stream)
+    assert encoded is stream
+    assert not is_entropy_stream(encoded)
+    np.testing.assert_array_equal(bytes_to_codes(encoded)[0], bytes_to_codes(stream)[0])
+
+
+@pytest.mark.parametrize("variable", [False, True])
+def test_empty_input_stays_raw(variable):
+    empty = np.zeros(0, dtype=np.uint8)
+    stream = encode_variable(empty, 12) if variable else _fixed_stream(empty)
+    encoded = entropy_encode(stream)
+    assert encoded == stream
+    assert encoded[0] & 0xF0 != ENTROPY_MARKER
+    assert len(_decode(encoded, 0)) == 0
+
+
+def test_repeated_symbol_is_entropy_coded():
+    # tek sembolün koşusu: sabit genişlikte kodlar sözlükle büyür, dağılım çarpık
+    symbols = np.full(100000, 9, dtype=np.uint8)
+    stream = _fixed_stream(symbols)
+    encoded = entropy_encode(stream)
+    assert len(encoded) < len(stream)
+    assert encoded[0] == HUFFMAN_MARKER
+    np.testing.assert_array_equal(_decode(encoded, len(symbols)), symbols)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_variable_stream_keeps_its_header(policy):
+    symbols = make_image(3, 64, 64).ravel()
+    stream = encode_variable(symbols, 10, policy=policy)
+    encoded = entropy_encode(stream)
+    assert encoded[0] == HUFFMAN_MARKER
+    # iç başlık: değişken akışın başlığı aynen saklanır
+    assert bytes(encoded[2:2 + encoded[1]]) == stream[:encoded[1]]
+    np.testing.assert_array_equal(_decode(encoded, len(symbols)), symbols)
+
+
+def test_unknown_entropy_coder_is_rejected():
+    with pytest.raises(ValueError, match="entropi"):
+        entropy_encode(_fixed_stream(np.arange(10, dtype=np.uint8)), "zstd")
+
+
+@pytest.mark.parametrize("max_code_width", [None, 9, 12])
+@pytest.mark.parametrize("level,layout", level_layouts())
+def test_container_round_trip(level, layout, max_code_width):
+    image = make_image(level)
+    data = compress_array(image, level, max_code_width, entropy=ENTROPY_HUFFMAN, workers=1,
+                          **LAYOUTS[layout])
+    assert read_container_header(data)["entropy"] == ENTROPY_HUFFMAN
+    np.testing.assert_array_equal(decompress_to_array(data, workers=1), image)
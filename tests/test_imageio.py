@@ -0,0 +1,227 @@
+# File: test_imageio.py
+"""
+lzw_common.imageio okuyucuları: BMP (aşağıdan yukarı / yukarıdan aşağı,
+satır padding'i, 8 bit palet, 24 / 32 bit) ve yorumlu PGM / PPM başlıkları;
+desteklenmeyen dosyalarda PIL'e geri dönüş. Beklenen sonuç her zaman PIL'in
+aynı dosyayı convert("L") / convert("RGB") ile okumasıdır.
+
+ImageWriter: şerit şerit yazılan BMP / PGM / PPM, PIL'in yazdığı dosyayla
+byte byte aynı; decode_to_file her layout'ta bellekteki çözümle aynı resmi yazar.
+"""
+
+import struct
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.container import decode_to_file
+from lzw_common.imageio import read_image, read_bmp, read_pnm, map_file, ImageWriter, write_image
+
+from helpers import LAYOUTS, make_image, level_layouts
+
+
+def _rgb(height, width, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _bmp(path, pixels, bits, top_down=False, palette=None):
+    """
+    BI_RGB BMP'yi elle yazar. pixels: 8 bitte (H, W) indeks, aksi halde (H, W, 3) RGB
+    (32 bitte dördüncü byte 0xAA ile doldurulur).
+    """
+    height, width = pixels.shape[:2]
+    stride = (width * bits + 31) // 32 * 4
+    rows = np.zeros((height, stride), dtype=np.uint8)
+    if bits == 8:
+        rows[:, :width] = pixels
+    else:
+        bgr = pixels[:, :, ::-1]
+        if bits == 32:
+            bgr = np.concatenate([bgr, np.full((height, width, 1), 0xAA, np.uint8)], axis=2)
+        rows[:, :width * bits // 8] = bgr.reshape(height, -1)
+    # padding byte'ları sıfır olmak zorunda değil: okuyucu onları atlamalı
+    rows[:, width * bits // 8:] = 0x55
+    table = b""
+    if palette is not None:
+        table = np.concatenate([palette[:, ::-1], np.zeros((len(palette), 1), np.uint8)], axis=1).tobytes()
+    offset = 14 + 40 + len(table)
+    info = struct.pack("<IiiHHIIiiII", 40, width, -height if top_down else height, 1, bits, 0,
+                       stride * height, 2835, 2835, len(palette) if palette is not None else 0, 0)
+    body = (rows if top_down else rows[::-1]).tobytes()
+    with open(path, "wb") as f:
+        f.write(struct.pack("<2sIHHI", b"BM", offset + len(body), 0, 0, offset) + info + table + body)
+    return path
+
+
+def _pil(path, mode):
+    with Image.open(path) as img:
+        return np.asarray(img.convert(mode))
+
+
+def _check(path, modes=("L", "RGB")):
+    for mode in modes:
+        image = read_image(str(path), mode)
+        expected = _pil(path, mode)
+        assert image.shape == expected.shape, mode
+        assert (image == expected).all(), mode
+
+
+@pytest.mark.parametrize("bits", [24, 32])
+@pytest.mark.parametrize("top_down", [False, True])
+@pytest.mark.parametrize("width", [8, 5, 7])   # 5 ve 7: satır 4 byte'ın katı değil
+def test_bmp_rgb(tmp_path, bits, top_down, width):
+    pixels = _rgb(6, width)
+    path = _bmp(tmp_path / "a.bmp", pixels, bits, top_down)
+    parsed, palette = read_bmp(map_file(str(path)))
+    assert palette is None
+    assert (parsed == pixels).all()
+    _check(path)
+
+
+@pytest.mark.parametrize("top_down", [False, True])
+@pytest.mark.parametrize("width", [8, 5])
+@pytest.mark.parametrize("gray_palette", [False, True])
+def test_bmp_palette(tmp_path, top_down, width, gray_palette):
+    rng = np.random.default_rng(1)
+    if gray_palette:
+        palette = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+    else:
+        palette = rng.integers(0, 256, (200, 3), dtype=np.uint8)
+    indices = rng.integers(0, len(palette), (6, width), dtype=np.uint8)
+    path = _bmp(tmp_path / "p.bmp", indices, 8, top_down, palette)
+    parsed, full = read_bmp(map_file(str(path)))
+    assert (parsed == indices).all()
+    assert (full[:len(palette)] == palette).all() and not full[len(palette):].any()
+    _check(path)
+
+
+def test_bmp_views_are_read_only(tmp_path):
+    path = _bmp(tmp_path / "a.bmp", _rgb(4, 5), 24)
+    image = read_image(str(path))
+    assert not image.flags.writeable
+
+
+@pytest.mark.parametrize("magic, channels, ext", [(b"P5", 1, "pgm"), (b"P6", 3, "ppm")])
+def test_pnm_with_comments(tmp_path, magic, channels, ext):
+    pixels = _rgb(5, 7)[..., :channels].squeeze()
+    # yorum satırları, satır içi yorum ve farklı boşluklar
+    header = magic + b"\n# comment\n7 # inline\n\t5\r\n# another comment\n255\n"
+    path = tmp_path / f"a.{ext}"
+    path.write_bytes(header + pixels.tobytes())
+    assert (read_pnm(map_file(str(path))) == pixels).all()
+    _check(path)
+
+
+def test_pnm_errors(tmp_path):
+    assert read_pnm(b"P3\n1 1\n255\n0 0 0\n") is None      # ASCII PNM: PIL
+    assert read_pnm(b"P5\n1 1\n65535\n\x00\x00") is None    # 16 bit: PIL
+    with pytest.raises(ValueError, match="başlığı hatalı"):
+        read_pnm(b"P5\n1 x\n255\n\x00")
+    with pytest.raises(ValueError, match="verisi eksik"):
+        read_pnm(b"P5\n2 2\n255\n\x00")
+
+
+@pytest.mark.parametrize("name, save", [
+    ("a.png", lambda img, path: img.save(path)),
+    ("bits1.bmp", lambda img, path: img.convert("1").save(path)),
+    ("a.pgm", lambda img, path: Image.fromarray(
+        np.asarray(img.convert("L")).astype(np.uint16) * 257).save(path)),      # 16 bit PGM
+])
+def test_pil_fallback(tmp_path, name, save):
+    path = str(tmp_path / name)
+    save(Image.fromarray(_rgb(9, 11, seed=2)), path)
+    _check(path)
+
+
+def test_unsupported_bmp_is_not_parsed(tmp_path):
+    path = _bmp(tmp_path / "a.bmp", _rgb(4, 5), 24)
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<H", data, 28, 16)       # 16 bit
+    assert read_bmp(bytes(data)) is None
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<I", data, 30, 1)        # BI_RLE8
+    assert read_bmp(bytes(data)) is None
+    assert read_bmp(path.read_bytes()[:-1]) is None   # piksel verisi eksik
+
+
+def test_bad_mode(tmp_path):
+    with pytest.raises(ValueError, match="mod"):
+        read_image(str(_bmp(tmp_path / "a.bmp", _rgb(2, 2), 24)), "RGBA")
+
+
+# ------------------------------------------------------------------------------
+# ImageWriter
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize("ext", ["bmp", "pgm", "ppm"])
+@pytest.mark.parametrize("width", [8, 7, 5])   # 7 ve 5: BMP satır padding'i
+@pytest.mark.parametrize("strip_rows", [1, 3, 100])
+def test_writer_matches_pil(tmp_path, ext, width, strip_rows):
+    for channels in (1, 3):
+        if (ext == "pgm" and channels == 3) or (ext == "ppm" and channels == 1):
+            continue
+        image = _rgb(9, width)
+        if channels == 1:
+            image = image[..., 0]
+        path = str(tmp_path / f"w.{ext}")
+        with ImageWriter(path, width, 9, channels) as out:
+            for y in range(0, 9, strip_rows):
+                out.write_rows(image[y:y + strip_rows])
+        expected = tmp_path / f"pil.{ext}"
+        Image.fromarray(image).save(expected, dpi=(72, 72))
+        assert open(path, "rb").read() == expected.read_bytes(), channels
+        assert (read_image(path, "L" if channels == 1 else "RGB") == image).all()
+
+
+def test_writer_single_rows_and_write_image(tmp_path):
+    image = _rgb(4, 5)
+    with ImageWriter(str(tmp_path / "rows.bmp"), 5, 4) as out:
+        for row in image:
+            out.write_rows(row)      # (W, C) tek satır
+    write_image(str(tmp_path / "all.bmp"), image, strip_rows=3)
+    assert (tmp_path / "rows.bmp").read_bytes() == (tmp_path / "all.bmp").read_bytes()
+
+
+def test_writer_row_count_errors(tmp_path):
+    image = _rgb(4, 5)
+    out = ImageWriter(str(tmp_path / "a.ppm"), 5, 4)
+    out.write_rows(image[:3])
+    with pytest.raises(ValueError, match="Eksik satır: 3 / 4"):
+        out.close()
+
+    with ImageWriter(str(tmp_path / "b.bmp"), 5, 4) as out:
+        out.write_rows(image[:3])
+        with pytest.raises(ValueError, match="fazla satır"):
+            out.write_rows(image[:2])
+        out.write_rows(image[3:])
+
+    with ImageWriter(str(tmp_path / "c.bmp"), 5, 4) as out:
+        with pytest.raises(ValueError, match="Satır şekli"):
+            out.write_rows(image[:, :4])
+        out.write_rows(image)
+
+
+def test_writer_bad_arguments(tmp_path):
+    with pytest.raises(ValueError, match="biçimi"):
+        ImageWriter(str(tmp_path / "a.png"), 5, 4)
+    with pytest.raises(ValueError, match="PGM"):
+        ImageWriter(str(tmp_path / "a.pgm"), 5, 4, channels=3)
+    with pytest.raises(ValueError, match="kanal"):
+        ImageWriter(str(tmp_path / "a.bmp"), 5, 4, channels=4)
+    with pytest.raises(ValueError, match="pozitif"):
+        ImageWriter(str(tmp_path / "a.bmp"), 0, 4)
+
+
+@pytest.mark.parametrize("level, layout", level_layouts())
+@pytest.mark.parametrize("ext", ["bmp", "pnm", "png"])
+def test_decode_to_file(tmp_path, level, layout, ext):
+    image = make_image(level, seed=5)
+    data = compress_array(image, level, 12, workers=1, **LAYOUTS[layout])
+    path = str(tmp_path / f"out.{ext}")
+    assert decode_to_file(data, path, workers=1) == (image.shape[1], image.shape[0])
+    mode = "L" if image.ndim == 2 else "RGB"
+    decoded = read_image(path, mode)
+    assert (decoded == decompress_to_array(data, workers=1)).all()
+    assert (decoded == image).all()
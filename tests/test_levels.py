@@ -0,0 +1,59 @@
+# File: test_levels.py
+"""
+Level 2-5 sınıfları: çıktıları api.compress_array ile byte byte aynı,
+kendi decoder'ları ile gidiş-dönüş; codelength kodlayıcının kullandığı genişlik.
+
+Her seviye klasörünün kendi basic_image_ops modülü olduğu için her seviye
+ayrı bir süreçte (kendi klasöründen) çalıştırılır.
+"""
+
+import pytest
+
+from helpers import LEVEL_CLASSES, run_level_script
+
+# seviye -> sınıfa (ve aynen compress_array'e) verilen seçenekler
+OPTIONS = {
+    2: [{}, {"tile_size": 16}, {"scan": "hilbert", "entropy": "huffman"}],
+    3: [{}, {"predictor": "med", "zigzag": True}, {"predictor": "adaptive", "tile_size": 16},
+        {"scan": "column-major", "dict_policy": "lru"}],
+    4: [{}, {"channel_streams": True}, {"tile_size": 16, "color_transform": "rct"},
+        {"scan": "interleaved", "entropy": "huffman"}],
+    5: [{}, {"strip_rows": 10}, {"channel_streams": True, "predictor": "med"},
+        {"color_transform": "ycocg-r", "scan": "tile-raster", "dict_policy": "ratio"}],
+}
+
+SCRIPT = """
+from lzw_common.api import compress_array
+from lzw_common.container import read_container
+from lzw_common.predictors import unpack_header
+
+level, options = Coder.LEVEL, {options!r}
+image = make_image(level)
+
+for opts in options:
+    # sözlük politikaları yalnızca değişken genişlikte
+    for width in (9,) if "dict_policy" in opts else (None, 9):
+        coder = Coder(max_code_width=width, workers=1, **opts)
+        data = coder.compress_array(image)
+        assert data == compress_array(image, level, width, workers=1, **opts), (opts, width)
+        assert (coder.decompress_to_array(data) == image).all(), (opts, width)
+        blocks = {{"tile_size", "strip_rows", "channel_streams"}} & set(opts)
+        if width is not None:
+            assert coder.codelength == width, (opts, coder.codelength)
+        elif blocks:
+            # sabit genişlik blok başına seçilir
+            assert coder.codelength is None, (opts, coder.codelength)
+        else:
+            payload = read_container(data)[1]
+            stream = payload[unpack_header(payload)[1]:]
+            if "entropy" not in opts:
+                assert stream[1] == coder.codelength, (opts, coder.codelength)
+            assert coder.codelength >= 8, (opts, coder.codelength)
+
+print("ok")
+"""
+
+
+@pytest.mark.parametrize("level", sorted(LEVEL_CLASSES))
+def test_level_class_matches_api(level):
+    run_level_script(level, SCRIPT.format(options=OPTIONS[level]))
@@ -0,0 +1,92 @@
+# File: test_lzw.py
+"""
+lzw_common.lzw / stream: değişken genişlikli akışın girdinin nasıl
+parçalandığından bağımsız olması, sözlük politikaları ve bellek bütçesi.
+"""
+
+import numpy as np
+import pytest
+
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.lzw import (
+    encode_variable,
+    decode_variable,
+    decode_variable_into,
+    stream_header,
+    width_for_budget,
+    dictionary_width,
+    POLICIES,
+    POLICY_LRU
+)
+from lzw_common.stream import iter_compress
+
+from helpers import LAYOUTS, make_image, level_layouts
+
+
+def _symbols(n, seed=0):
+    # tekrar eden bölgeler + gürültü: sözlük dolar, "ratio" sıfırlamaları tetiklenir
+    rng = np.random.default_rng(seed)
+    pattern = rng.integers(0, 256, 97, dtype=np.uint8)
+    data = np.resize(pattern, n)
+    noise = rng.random(n) < 0.3
+    data[noise] = rng.integers(0, 256, int(noise.sum()), dtype=np.uint8)
+    return data
+
+
+def _split(data, sizes):
+    pos = 0
+    for size in sizes:
+        if pos >= len(data):
+            return
+        yield data[pos:pos + size]
+        pos += size
+    if pos < len(data):
+        yield data[pos:]
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+@pytest.mark.parametrize("max_width", [9, 12])
+def test_iter_compress_matches_encode_variable_for_any_chunking(policy, max_width):
+    data = _symbols(40000)
+    expected = encode_variable(data, max_width, policy=policy)
+    rng = np.random.default_rng(max_width)
+    chunkings = [[1] * 3000, [1023, 1025, 1], [4096], rng.integers(1, 3000, 100).tolist(),
+                 [len(data)]]
+    for sizes in chunkings:
+        out = b"".join(iter_compress(_split(data, sizes), max_width, policy=policy))
+        assert out == expected, (policy, max_width, sizes[:5])
+    assert bytes(decode_variable(expected)) == data.tobytes()
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+@pytest.mark.parametrize("max_width", [9, 10, 16])
+def test_policy_round_trip(policy, max_width):
+    data = _symbols(30000, seed=max_width)
+    encoded = encode_variable(data, max_width, policy=policy)
+    assert stream_header(encoded)[:2] == (policy, max_width)
+    assert bytes(decode_variable(encoded)) == data.tobytes()
+    out = np.empty(len(data), dtype=np.uint8)
+    assert decode_variable_into(encoded, out) == len(data)
+    np.testing.assert_array_equal(out, data)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+@pytest.mark.parametrize("level,layout", level_layouts())
+def test_policy_container_round_trip(level, layout, policy):
+    image = make_image(level)
+    data = compress_array(image, level, 9, dict_policy=policy, workers=1, **LAYOUTS[layout])
+    np.testing.assert_array_equal(decompress_to_array(data, workers=1), image)
+
+
+def test_memory_budget():
+    width = width_for_budget(1 << 20)
+    assert dictionary_width(None, memory_budget=1 << 20) == width
+    # lru girdileri daha büyük: aynı bütçeye daha küçük sözlük sığar
+    assert width_for_budget(1 << 20, policy=POLICY_LRU) <= width
+    with pytest.raises(ValueError, match="çok küçük"):
+        width_for_budget(16)
+
+
+def test_policy_needs_variable_width():
+    with pytest.raises(ValueError, match="değişken genişlikte"):
+        dictionary_width(None, POLICY_LRU)
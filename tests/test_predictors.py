@@ -0,0 +1,71 @@
+# File: test_predictors.py
+"""
+lzw_common.predictors: artık dönüşümlerinin tersi, blok başlığı ve
+Level 3/5 konteynerlerinde tahmin edici seçenekleri.
+"""
+
+import numpy as np
+import pytest
+
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.predictors import (
+    encode_residuals,
+    decode_residuals,
+    pack_header,
+    unpack_header,
+    PREDICTORS,
+    ADAPTIVE
+)
+
+from helpers import LAYOUTS, make_image
+
+NAMES = list(PREDICTORS) + [ADAPTIVE]
+
+
+@pytest.mark.parametrize("zigzag", [False, True])
+@pytest.mark.parametrize("predictor", NAMES)
+@pytest.mark.parametrize("level", [3, 5])
+def test_residuals_invert(level, predictor, zigzag):
+    image = make_image(level, 23, 29, seed=3)
+    residual, selection = encode_residuals(image, predictor, zigzag, (4, 8))
+    assert residual.shape == image.shape
+    assert (selection is None) == (predictor != ADAPTIVE)
+    restored = decode_residuals(residual, predictor, zigzag, (4, 8), selection)
+    np.testing.assert_array_equal(restored, image)
+
+
+def test_left_matches_row_difference():
+    image = make_image(3, 9, 11)
+    residual, _ = encode_residuals(image, "left")
+    expected = image.astype(np.int16)
+    expected[:, 1:] -= image[:, :-1]
+    np.testing.assert_array_equal(residual, (expected & 0xFF).astype(np.uint8))
+
+
+def test_header_round_trip():
+    selection = np.array([[1, 5], [4, 0]], dtype=np.uint8)
+    header = pack_header(30, 20, ADAPTIVE, True, (10, 16), selection, "hilbert")
+    fields, offset = unpack_header(b"\x00" + header + b"rest", 1)
+    assert offset == 1 + len(header)
+    assert (fields["width"], fields["height"]) == (30, 20)
+    assert (fields["predictor"], fields["zigzag"], fields["scan"]) == (ADAPTIVE, True, "hilbert")
+    assert fields["tile"] == (10, 16)
+    np.testing.assert_array_equal(fields["selection"], selection)
+
+
+def test_unknown_predictor_is_rejected():
+    with pytest.raises(ValueError, match="predictor"):
+        encode_residuals(make_image(3), "gradient")
+
+
+@pytest.mark.parametrize("options", [
+    {"predictor": "med"},
+    {"predictor": "paeth", "zigzag": True},
+    {"predictor": "adaptive", "tile": (8, 16)},
+])
+@pytest.mark.parametrize("layout", ["single", "tiled", "strips"])
+@pytest.mark.parametrize("level", [3, 5])
+def test_container_round_trip(level, layout, options):
+    image = make_image(level, seed=2)
+    data = compress_array(image, level, 12, workers=1, **LAYOUTS[layout], **options)
+    np.testing.assert_array_equal(decompress_to_array(data, workers=1), image)
@@ -0,0 +1,123 @@
+# File: test_profiling.py
+"""
+lzw_common.profiling: aşama kayıtları, tepe bellek, aggregate, cProfile ve
+NullProfiler; kodlayıcının aşama adları ve seviye sınıflarında kayıt birikmemesi.
+"""
+
+import io
+
+import pytest
+
+from lzw_common.container import write_image_container
+from lzw_common.profiling import Profiler, NullProfiler, aggregate, format_stages
+
+from helpers import LEVEL_CLASSES, make_image, run_level_script
+
+
+def _work(prof, name, size):
+    with prof.stage(name, size) as st:
+        st["bytes_out"] = len(bytearray(size))
+
+
+def test_stage_records():
+    seen = []
+    prof = Profiler(callback=seen.append)
+    _work(prof, "read", 1000)
+    _work(prof, "write", 10)
+    assert [s["stage"] for s in prof.stages] == ["read", "write"]
+    assert seen == prof.stages
+    assert prof.stages[0]["bytes_in"] == prof.stages[0]["bytes_out"] == 1000
+    report = prof.report()
+    assert report["seconds"] == pytest.approx(sum(s["seconds"] for s in prof.stages))
+    prof.reset()
+    assert prof.stages == [] and report["stages"]
+
+
+def test_peaks_only_with_trace_memory():
+    prof = Profiler()
+    _work(prof, "alloc", 1 << 20)
+    assert prof.stages[0]["peak_bytes"] is None
+    assert prof.report()["peak_bytes"] is None
+
+    prof = Profiler(trace_memory=True)
+    with prof.stage("outer"):
+        _work(prof, "alloc", 1 << 20)
+    inner, outer = prof.stages
+    assert inner["peak_bytes"] >= 1 << 20
+    # iç aşamanın tepesi dış aşamaya da yansır
+    assert outer["peak_bytes"] >= inner["peak_bytes"]
+    assert prof.report()["peak_bytes"] == outer["peak_bytes"]
+
+
+def test_aggregate_sums_per_stage():
+    reports = []
+    for size in (100, 200, 300):
+        prof = Profiler()
+        _work(prof, "read", size)
+        _work(prof, "write", 1)
+        reports.append(prof.report())
+    totals = aggregate(reports[:2] + [reports[2]["stages"]])
+    assert list(totals) == ["read", "write"]
+    assert totals["read"]["count"] == totals["write"]["count"] == 3
+    assert totals["read"]["bytes_in"] == totals["read"]["bytes_out"] == 600
+    assert totals["read"]["seconds"] == pytest.approx(
+        sum(s["seconds"] for r in reports for s in r["stages"] if s["stage"] == "read"))
+    assert totals["read"]["peak_bytes"] is None
+    assert "read" in format_stages(totals)
+
+
+def test_cprofile_toggle():
+    with pytest.raises(ValueError, match="cProfile"):
+        Profiler().print_stats()
+
+    prof = Profiler(cprofile=True)
+    with prof:
+        _work(prof, "work", 100)
+    out = io.StringIO()
+    prof.print_stats(limit=5, file=out)
+    assert "_work" in out.getvalue()
+
+
+def test_null_profiler_keeps_nothing():
+    prof = NullProfiler()
+    with prof:
+        _work(prof, "read", 100)
+    assert len(prof.stages) == 0
+    assert prof.report() == {"stages": [], "seconds": 0.0, "peak_bytes": None}
+    with pytest.raises(ValueError, match="cProfile"):
+        prof.print_stats()
+
+
+@pytest.mark.parametrize("level, options, width, stages", [
+    (3, {}, None, ["predict", "lzw", "write"]),
+    (3, {}, 12, ["predict", "lzw+write"]),
+    (3, {"tile_size": 16}, 12, ["encode", "write"]),
+    (5, {"channel_streams": True}, None, ["encode", "write"]),
+    (5, {"strip_rows": 10}, 12, ["encode+write"]),
+    (5, {"color_transform": "rct"}, 12, ["color", "predict", "lzw+write"]),
+])
+def test_encoder_stages(level, options, width, stages):
+    prof = Profiler()
+    out = io.BytesIO()
+    size, _ = write_image_container(out, make_image(level), level, width, workers=1,
+                                    profiler=prof, **options)
+    assert [s["stage"] for s in prof.stages] == stages
+    assert prof.stages[-1]["bytes_out"] == size == len(out.getvalue())
+
+
+@pytest.mark.parametrize("level", sorted(LEVEL_CLASSES))
+def test_level_class_does_not_accumulate(level):
+    run_level_script(level, """
+from lzw_common.profiling import Profiler
+
+image = make_image(Coder.LEVEL)
+coder = Coder(max_code_width=12)
+for _ in range(50):
+    coder.decompress_to_array(coder.compress_array(image))
+assert len(coder.profiler.report()["stages"]) == 0
+
+profiler = Profiler()
+Coder(max_code_width=12, profiler=profiler).compress_array(image)
+assert [s["stage"] for s in profiler.stages] == ["predict", "lzw+write"], profiler.stages
+print("ok")
+""")
@@ -0,0 +1,85 @@
+# File: test_region.py
+"""
+Bölge çözme (container.decode_region / tiles.decode_tiled_region): karo
+kenarlarına hizalı ve kenarları kesen dikdörtgenler, tam çözümün aynı
+dilimiyle aynı; resim dışı, boş ve karosuz bölgelerde ValueError.
+"""
+
+import pytest
+
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.container import decode_region
+from lzw_common.tiles import compress_tiled, decode_tiled_region
+
+from helpers import make_image
+
+# make_image: 37 x 45; karolar 16 x 16, şeritler 10 satır
+TILED = {"tiled": {"tile_size": 16}, "strips": {"strip_rows": 10}}
+
+REGIONS = [
+    (0, 0, 45, 37),     # tüm resim
+    (16, 16, 16, 16),   # tek karo, kenarlara hizalı
+    (0, 10, 45, 10),    # tek şerit
+    (32, 32, 13, 5),    # sağ alt köşedeki eksik karo
+    (5, 7, 20, 25),     # birden çok karo / şerit kesen
+    (15, 9, 2, 2),      # dört karonun köşesi
+    (44, 36, 1, 1),     # tek piksel
+]
+
+
+@pytest.fixture(params=[(level, layout) for level in (2, 5) for layout in TILED],
+                ids=lambda p: f"level{p[0]}-{p[1]}")
+def tiled_file(request, tmp_path):
+    level, layout = request.param
+    # renk dönüşümü de bölge çözümünde geri alınmalı
+    options = dict(TILED[layout], color_transform="rct") if level == 5 else TILED[layout]
+    data = compress_array(make_image(level, seed=6), level, 12, workers=1, **options)
+    path = tmp_path / "tiled.bin"
+    path.write_bytes(data)
+    return str(path), decompress_to_array(data, workers=1)
+
+
+@pytest.mark.parametrize("x, y, width, height", REGIONS)
+def test_region_matches_full_decode(tiled_file, x, y, width, height):
+    path, full = tiled_file
+    region = decode_region(path, x, y, width, height)
+    assert (region == full[y:y + height, x:x + width]).all()
+
+
+def test_region_in_parallel(tiled_file):
+    path, full = tiled_file
+    assert (decode_region(path, 3, 4, 40, 30, workers=2) == full[4:34, 3:43]).all()
+
+
+@pytest.mark.parametrize("x, y, width, height", REGIONS)
+def test_raw_tiled_payload(x, y, width, height):
+    # konteyner başlığı olmayan karolu veri (tiles modülünün kendi biçimi)
+    image = make_image(3)
+    data = compress_tiled(image, 16, 12, predictor="left", workers=1)
+    assert (decode_tiled_region(data, x, y, width, height) == image[y:y + height, x:x + width]).all()
+
+
+@pytest.mark.parametrize("x, y, width, height", [
+    (-1, 0, 5, 5), (0, -1, 5, 5), (41, 0, 5, 5), (0, 33, 5, 5), (0, 0, 46, 37),
+])
+def test_region_out_of_bounds(tiled_file, x, y, width, height):
+    with pytest.raises(ValueError, match="dışında"):
+        decode_region(tiled_file[0], x, y, width, height)
+
+
+@pytest.mark.parametrize("width, height", [(0, 5), (5, 0), (-3, 5)])
+def test_empty_region(tiled_file, width, height):
+    with pytest.raises(ValueError, match="pozitif"):
+        decode_region(tiled_file[0], 0, 0, width, height)
+
+
+@pytest.mark.parametrize("level, options", [(3, {}), (5, {}), (5, {"channel_streams": True})])
+def test_not_tiled(tmp_path, level, options):
+    path = tmp_path / "single.bin"
+    path.write_bytes(compress_array(make_image(level), level, 12, workers=1, **options))
+    with pytest.raises(ValueError, match="karolu"):
+        decode_region(str(path), 0, 0, 5, 5)
+    # konteyner de karolu veri de olmayan dosya
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError, match="karolu"):
+        decode_region(str(path), 0, 0, 5, 5)
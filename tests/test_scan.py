@@ -0,0 +1,63 @@
+# File: test_scan.py
+"""
+lzw_common.scan: tarama sıralarının tersi, permütasyon önbelleğinin sınırı
+ve konteynerlerde tarama sırası.
+"""
+
+import numpy as np
+import pytest
+
+from lzw_common import scan
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.container import read_container_header
+from lzw_common.scan import scan_symbols, unscan_symbols, scan_permutation, SCAN_ORDERS
+
+from helpers import LAYOUTS, make_image, level_layouts
+
+
+@pytest.mark.parametrize("order", SCAN_ORDERS)
+@pytest.mark.parametrize("shape", [(7, 5), (1, 16, 33), (3, 17, 40), (3, 1, 9), (2, 64, 64), (3, 0, 4)])
+def test_unscan_inverts_scan(shape, order):
+    data = np.random.default_rng(0).integers(0, 256, int(np.prod(shape)), dtype=np.uint8)
+    scanned = scan_symbols(data, shape, order)
+    assert sorted(scanned.tolist()) == sorted(data.tolist())
+    np.testing.assert_array_equal(unscan_symbols(scanned, shape, order), data)
+
+
+def test_axis_swap_orders():
+    planar = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+    np.testing.assert_array_equal(scan_symbols(planar, planar.shape, "column-major"),
+                                  planar.transpose(0, 2, 1).ravel())
+    np.testing.assert_array_equal(scan_symbols(planar, planar.shape, "interleaved"),
+                                  planar.reshape(2, -1).T.ravel())
+    for order in ("row-major", "column-major", "interleaved"):
+        assert scan_permutation(planar.shape, order) is None
+
+
+def test_permutation_is_per_plane():
+    perm = scan_permutation((3, 20, 24), "hilbert")
+    assert perm.shape == (20 * 24,)
+    assert not perm.flags.writeable
+    assert scan_permutation((20, 24), "hilbert") is perm
+
+
+def test_cache_is_bounded_by_bytes(monkeypatch):
+    monkeypatch.setattr(scan, "CACHE_BYTES", 40000)
+    scan.clear_scan_cache()
+    for side in (50, 60, 70):
+        scan_permutation((side, side), "tile-raster")
+    assert sum(p.nbytes for p in scan._cache.values()) <= 40000
+    assert (70, 70, "tile-raster") in scan._cache
+    # bütçeden büyük permütasyon önbelleğe girmez
+    scan_permutation((80, 80), "tile-raster")
+    assert (80, 80, "tile-raster") not in scan._cache
+    scan.clear_scan_cache()
+
+
+@pytest.mark.parametrize("order", SCAN_ORDERS)
+@pytest.mark.parametrize("level,layout", level_layouts())
+def test_container_round_trip(level, layout, order):
+    image = make_image(level)
+    data = compress_array(image, level, 12, scan=order, workers=1, **LAYOUTS[layout])
+    assert read_container_header(data)["scan"] == order
+    np.testing.assert_array_equal(decompress_to_array(data, workers=1), image)
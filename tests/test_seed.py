@@ -0,0 +1,161 @@
+# File: test_seed.py
+"""
+lzw_common.seed: eğitilen tohum sözlüklerin prefix-kapalı olması, artefakt
+dosyası gidiş-dönüşü, LZW_SEED_PATH'te id ile arama ve hatalar; tohumlu
+kodlamanın her sözlük politikasında gidiş-dönüşü.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import lzw_common.seed as seed_module
+from lzw_common.api import compress_array, decompress_to_array
+from lzw_common.lzw import (
+    encode_variable,
+    decode_variable,
+    decode_variable_into,
+    stream_header,
+    check_seed,
+    dictionary_width,
+    FIRST_CODE,
+    POLICIES,
+)
+from lzw_common.seed import SeedDictionary, train_seed, load_seed, SEED_PATH_ENV
+
+from helpers import make_image
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    # her test boş süreç önbelleği ve boş LZW_SEED_PATH ile başlar
+    monkeypatch.setattr(seed_module, "_CACHE", {})
+    monkeypatch.delenv(SEED_PATH_ENV, raising=False)
+
+
+def _samples(count=20, n=3000):
+    # ortak motifler + her örnekte farklı gürültü: benzer küçük dosyalar
+    rng = np.random.default_rng(0)
+    motifs = [rng.integers(0, 256, 40, dtype=np.uint8) for _ in range(4)]
+    samples = []
+    for i in range(count):
+        data = np.concatenate([motifs[j % 4] for j in range(i, i + n // 40)])
+        noise = rng.random(len(data)) < 0.05
+        data[noise] = rng.integers(0, 256, int(noise.sum()), dtype=np.uint8)
+        samples.append(data)
+    return samples
+
+
+@pytest.fixture
+def seed():
+    return train_seed(_samples(), size=200)
+
+
+def test_trained_seed_is_prefix_closed(seed):
+    assert len(seed) == 200
+    assert seed.end_code == FIRST_CODE + 200
+    # her girdinin prefix'i ya tek byte ya da kendinden önceki bir girdi
+    for i, prefix in enumerate(seed.prefix.tolist()):
+        assert prefix < 256 or FIRST_CODE <= prefix < FIRST_CODE + i, (i, prefix)
+    # açılmış cümleler prefix'in cümlesi + son sembol
+    blob, start, length = seed.phrases()
+    for code in range(FIRST_CODE, seed.end_code):
+        prefix = int(seed.prefix[code - FIRST_CODE])
+        phrase = blob[start[code]:start[code] + length[code]]
+        head = blob[start[prefix]:start[prefix] + length[prefix]] if prefix >= 256 else bytes((prefix,))
+        assert phrase == head + bytes((seed.suffix[code - FIRST_CODE],))
+
+
+def test_invalid_prefix_rejected():
+    with pytest.raises(ValueError, match="prefix"):
+        SeedDictionary([FIRST_CODE], [1])
+    with pytest.raises(ValueError, match="aynı uzunlukta"):
+        SeedDictionary([1, 2], [1])
+
+
+def test_save_load_round_trip(seed, tmp_path):
+    path = seed.save(str(tmp_path / "seeds"))
+    assert path.endswith(f"{seed.id:08x}.lzws")
+    seed_module._CACHE.clear()
+    loaded = load_seed(path)
+    assert loaded.id == seed.id and loaded.path == path
+    assert (loaded.prefix == seed.prefix).all() and (loaded.suffix == seed.suffix).all()
+    # süreç başına bir kez okunur
+    assert load_seed(path) is loaded and load_seed(seed.id) is loaded
+
+
+@pytest.mark.parametrize("damage, message", [
+    (lambda data: data[:8], "eksik"),
+    (lambda data: b"XXXX" + data[4:], "değil"),
+    (lambda data: data[:4] + b"\x09" + data[5:], "sürümü"),
+    (lambda data: data[:-1] + bytes((data[-1] ^ 1,)), "id uyuşmuyor"),
+])
+def test_corrupt_artefact(seed, damage, message):
+    with pytest.raises(ValueError, match=message):
+        SeedDictionary.from_bytes(damage(seed.to_bytes()))
+
+
+def test_found_by_id_on_seed_path(seed, tmp_path, monkeypatch):
+    folder = tmp_path / "seeds"
+    seed.save(str(folder))
+    data = encode_variable(np.concatenate(_samples(2)), 12, seed=seed)
+    seed_module._CACHE.clear()
+
+    monkeypatch.setenv(SEED_PATH_ENV, f"{tmp_path / 'yok'}{os.pathsep}{folder}")
+    assert stream_header(data)[2].id == seed.id
+    assert load_seed(seed.id).path == str(folder / f"{seed.id:08x}.lzws")
+
+
+def test_missing_seed_id(seed, tmp_path, monkeypatch):
+    data = encode_variable(np.concatenate(_samples(2)), 12, seed=seed)
+    seed_module._CACHE.clear()
+    with pytest.raises(ValueError, match=f"bulunamadı: {seed.id:08x}"):
+        decode_variable(data)
+
+    monkeypatch.setenv(SEED_PATH_ENV, str(tmp_path))
+    with pytest.raises(ValueError, match="bulunamadı"):
+        load_seed(0x12345678)
+    # dosya adı id'yi tutar ama içerik başka bir sözlük
+    (tmp_path / "12345678.lzws").write_bytes(seed.to_bytes())
+    with pytest.raises(ValueError, match="id'si uyuşmuyor"):
+        load_seed(0x12345678)
+
+
+def test_check_seed_width(seed):
+    big = train_seed(_samples(), size=300)
+    assert big.end_code > 1 << 9
+    with pytest.raises(ValueError, match="çok büyük"):
+        check_seed(big, 9)
+    with pytest.raises(ValueError, match="çok büyük"):
+        dictionary_width(9, seed=big)
+    with pytest.raises(ValueError, match="çok büyük"):
+        encode_variable(b"abc", 9, seed=big)
+    assert check_seed(seed, 9) is seed
+    with pytest.raises(ValueError, match="değişken genişlik"):
+        dictionary_width(None, seed=seed)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+@pytest.mark.parametrize("max_width", [9, 12])
+def test_seeded_round_trip(seed, policy, max_width):
+    data = np.concatenate(_samples(6))
+    encoded = encode_variable(data, max_width, policy=policy, seed=seed)
+    assert stream_header(encoded)[:3] == (policy, max_width, seed)
+    assert decode_variable(encoded) == data.tobytes()
+    out = np.empty(len(data), dtype=np.uint8)
+    assert decode_variable_into(encoded, out) == len(data)
+    assert (out == data).all()
+    if max_width == 12:
+        # motifleri zaten bilen sözlük daha kısa akış üretir (9 bitte sözlüğün çoğu tohum)
+        assert len(encoded) < len(encode_variable(data, max_width, policy=policy))
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_seeded_container_round_trip(policy, tmp_path):
+    image = make_image(3, seed=4)
+    seed = train_seed([make_image(3, seed=i).tobytes() for i in range(3)], size=100)
+    path = seed.save(str(tmp_path))
+    for options in ({}, {"tile_size": 16}, {"strip_rows": 10}):
+        data = compress_array(image, 3, 12, workers=1, dict_policy=policy, seed=path, **options)
+        assert (decompress_to_array(data, workers=1) == image).all(), options
@@ -0,0 +1,69 @@
+# File: test_strips.py
+"""
+Out-of-core şeritler (container.write_strips / iter_decode_strips): BMP'den
+şerit şerit kodlanan Level 5 dosyası decode_to_file ile bellekteki çözümle
+aynı resme açılır; 1 satırlık ve resimden büyük şeritler dahil.
+"""
+
+import pytest
+
+from lzw_common.api import compress_array
+from lzw_common.container import (
+    write_strips,
+    decode_file,
+    decode_to_file,
+    iter_decode_strips,
+    read_container_header,
+    LAYOUT_TILED,
+)
+from lzw_common.imageio import read_image, write_image
+
+from helpers import make_image
+
+# make_image yüksekliği 37: 1 satır, eşit bölünmeyen, tam boy ve resimden büyük şeritler
+STRIP_ROWS = [1, 10, 37, 100]
+
+
+@pytest.mark.parametrize("strip_rows", STRIP_ROWS)
+@pytest.mark.parametrize("max_code_width", [None, 12])
+@pytest.mark.parametrize("ext", ["bmp", "ppm"])
+def test_level5_strips_decode_to_file(tmp_path, strip_rows, max_code_width, ext):
+    image = make_image(5, seed=7)
+    src = str(tmp_path / "in.bmp")
+    write_image(src, image)
+    # girdi mmap görünümü olarak okunur, şeritler kodlandıkça dosyaya yazılır
+    path = str(tmp_path / "in_color_diff.bin")
+    with open(path, "wb") as f:
+        size = write_strips(f, read_image(src), 5, strip_rows, max_code_width, color_transform="rct")
+    data = open(path, "rb").read()
+    assert size == len(data)
+    assert data == compress_array(image, 5, max_code_width, workers=1, strip_rows=strip_rows,
+                                  color_transform="rct")
+    assert read_container_header(data)["layout"] == LAYOUT_TILED
+
+    fields, strips = iter_decode_strips(data, workers=1)
+    rows = [(y, strip.shape[0]) for y, strip in strips]
+    expected = [(y, min(strip_rows, 37 - y)) for y in range(0, 37, strip_rows)]
+    assert rows == expected
+
+    out = str(tmp_path / f"out.{ext}")
+    assert decode_to_file(data, out, workers=1) == (45, 37)
+    in_memory = decode_file(path, workers=1)
+    assert (read_image(out) == in_memory).all()
+    assert (in_memory == image).all()
+
+
+@pytest.mark.parametrize("strip_rows", STRIP_ROWS)
+@pytest.mark.parametrize("level", [2, 3, 4])
+def test_other_levels(strip_rows, level, tmp_path):
+    image = make_image(level, seed=8)
+    data = compress_array(image, level, 9, workers=1, strip_rows=strip_rows, dict_policy="lru")
+    out = str(tmp_path / "out.bmp")
+    decode_to_file(data, out, workers=2)
+    assert (read_image(out, "L" if level < 4 else "RGB") == image).all()
+
+
+@pytest.mark.parametrize("strip_rows", [0, -1])
+def test_bad_strip_rows(strip_rows):
+    with pytest.raises(ValueError, match="pozitif"):
+        compress_array(make_image(5), 5, 12, workers=1, strip_rows=strip_rows)
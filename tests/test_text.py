@@ -0,0 +1,52 @@
+# File: test_text.py
+"""
+Level 1 (level1_text_compression/LZW.py): compress_text_file /
+decompress_text_file gidiş-dönüşü byte byte aynı; Latin-1 dışı UTF-8,
+satır sonu boşlukları / boş satırlar ve son satır sonu olmayan dosyalar dahil.
+"""
+
+import os
+import importlib.util
+
+import pytest
+
+from helpers import ROOT
+
+LEVEL1_DIR = os.path.join(ROOT, "level1_text_compression")
+
+TEXTS = {
+    "turkish": "Çağrı ığdır'da şu öğleden sonra Ölçü ŞİŞLİ ğüşıöç\nİstanbul İzmir\n",
+    "cjk": "圧縮アルゴリズム 字典 压缩 사전 압축\n中文测试，全角标点。\n" * 20,
+    "trailing_whitespace": "satır sonu boşlukları   \n\t \n\n\n  son satır  \n\n",
+    "no_trailing_newline": "son satır sonu yok: 文字 ğ",
+    "crlf": "windows\r\nsatırları\r\n\r\n",
+    "empty": "",
+}
+
+
+@pytest.fixture(scope="module")
+def coder_class():
+    spec = importlib.util.spec_from_file_location("level1_LZW", os.path.join(LEVEL1_DIR, "LZW.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.LZWCoding
+
+
+@pytest.mark.parametrize("name", sorted(TEXTS))
+@pytest.mark.parametrize("max_code_width", [None, 9, 12])
+def test_text_file_round_trip(coder_class, tmp_path, capsys, name, max_code_width):
+    original = TEXTS[name].encode("utf-8") * 3
+    (tmp_path / f"{name}.txt").write_bytes(original)
+    # sınıf yolları kendi klasörüne göre kurar: dosya adı oradan göreli verilir
+    filename = os.path.relpath(str(tmp_path / name), LEVEL1_DIR)
+
+    coder = coder_class(filename, max_code_width=max_code_width)
+    compressed = coder.compress_text_file()
+    assert os.path.samefile(compressed, tmp_path / f"{name}.bin")
+    decompressed = coder_class(filename).decompress_text_file()
+    assert os.path.samefile(decompressed, tmp_path / f"{name}_decompressed.txt")
+    assert (tmp_path / f"{name}_decompressed.txt").read_bytes() == original
+    # dosya ve bellek içi yol aynı .bin içeriğini üretir
+    assert (tmp_path / f"{name}.bin").read_bytes() == coder_class(
+        max_code_width=max_code_width).compress_bytes(original)
+    assert "is compressed into" in capsys.readouterr().out